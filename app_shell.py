@@ -0,0 +1,421 @@
+# app_shell.py
+# Cửa sổ chính duy nhất chứa tất cả màn hình trong một QStackedWidget.
+# Mỗi màn hình chỉ được dựng (setupUi) ở lần dùng đầu tiên, sau đó được giữ lại
+# cho các lần chuyển sau. Các màn hình có khả năng được mở tiếp theo sẽ được dựng
+# trước khi ứng dụng rảnh, và màn hình ít dùng bị giải phóng khi vượt ngân sách.
+import sys
+import time
+import uuid
+import importlib
+from collections import OrderedDict
+
+from qt_compat import QtCore, QtGui, QtWidgets
+
+import auth
+import cart_service
+import combos
+import database
+import kitchen
+import lan_api
+import orders
+import payment_qr
+import receipts
+import reconcile
+import sign_in_view
+import tables
+import theme
+
+# Tên màn hình -> module do pyuic5 sinh ra (mỗi module có class Ui_Dialog)
+SCREENS = {
+    "man_hinh_chinh": "man_hinh_chinh",
+    "menu": "menu_view",
+    "page_1": "page_1",
+    "page_2": "page_2",
+    "page_3": "page_3",
+    "page_4": "page_4",
+    "best_seller": "best_seller",
+    "gio_hang": "gio_hang",
+    "chuyen_khoan": "chuyen_khoan",
+    "bep": "kitchen_view",
+}
+
+# Nút bấm -> màn hình đích (chỉ nối những nút có trên màn hình đó)
+NAV_BUTTONS = {
+    "mon_an": "menu",
+    "gio_hang": "gio_hang",
+    "page1": "page_1",
+    "page2": "page_2",
+    "page3": "page_3",
+    "page4": "page_4",
+    "best_seller": "best_seller",
+}
+
+# Màn hình hay được mở tiếp theo, dùng để dựng trước khi rảnh
+LIKELY_NEXT = {
+    "man_hinh_chinh": ["menu", "gio_hang"],
+    "menu": ["gio_hang", "best_seller"],
+    "page_1": ["page_2", "gio_hang", "best_seller"],
+    "page_2": ["page_3", "page_1", "gio_hang"],
+    "page_3": ["page_4", "page_2", "gio_hang"],
+    "page_4": ["page_3", "gio_hang"],
+    "best_seller": ["menu", "gio_hang"],
+    "gio_hang": ["chuyen_khoan", "menu"],
+    "chuyen_khoan": ["gio_hang", "man_hinh_chinh"],
+    "bep": [],
+}
+
+# Màn hình chỉ mở được với phiên còn hạn của tài khoản quản lý (auth.authorize_admin)
+ADMIN_SCREENS = {"bep"}
+
+# Ngân sách bộ nhớ tính theo tổng số widget con đang sống của các màn hình cache
+DEFAULT_WIDGET_BUDGET = 250
+# Ngưỡng thời gian chuyển màn hình (1 khung hình ở 60 Hz)
+SWITCH_BUDGET_MS = 16.0
+# Phím tắt mở màn hình bếp (kitchen_view.py)
+KITCHEN_SHORTCUT = "Ctrl+K"
+# QShortcut ở QtGui trên PyQt6, ở QtWidgets trên PyQt5
+QShortcut = getattr(QtGui, "QShortcut", None) or QtWidgets.QShortcut
+
+
+class _UiSignals(QtCore.QObject):
+    # Chuyển kết quả từ các luồng phụ về luồng giao diện.
+    # Ảnh QR vẽ xong cho màn hình chuyen_khoan
+    ready = QtCore.pyqtSignal(object, object)
+    # order_id được đối soát chuyển khoản xác nhận đã thanh toán
+    paid = QtCore.pyqtSignal(int)
+    # auth.Session (hoặc None) khi đăng nhập trên luồng phụ xong
+    signed_in = QtCore.pyqtSignal(object)
+    # (giỏ hàng, ui gio_hang, số món) khi giỏ đổi, từ bất kỳ luồng nào đang sửa giỏ
+    cart_changed = QtCore.pyqtSignal(object, object, int)
+
+
+class AppShell(QtWidgets.QMainWindow):
+    def __init__(self, start_screen="man_hinh_chinh", widget_budget=DEFAULT_WIDGET_BUDGET):
+        """ Khởi tạo cửa sổ chính với QStackedWidget rỗng, màn hình được dựng khi cần """
+        super().__init__()
+        # Một stylesheet cấp ứng dụng cho mọi màn hình (xem theme.py)
+        theme.apply(QtWidgets.QApplication.instance())
+        self.setWindowTitle("Chicky")
+        self.resize(1220, 801)
+
+        self.stack = QtWidgets.QStackedWidget(self)
+        self.setCentralWidget(self.stack)
+
+        self.widget_budget = widget_budget
+        # name -> (widget, ui, cost); thứ tự = thứ tự dùng gần nhất (LRU)
+        self._cache = OrderedDict()
+        self._warm_queue = []
+        self.current = None
+        self.user_id = None
+        self.session_token = None
+        self._cart_listener = None  # (cart, listener) đang cập nhật nhãn tổng tiền
+        self.payment_method = "tien_mat"
+        self.pending_payment = None  # (order_id, amount) đang chờ chuyển khoản
+        # Khóa của lần xác nhận hiện tại; giữ nguyên đến khi giỏ đổi để bấm lại không tạo đơn trùng
+        self._order_key = None
+        self._sign_in_dialog = None  # sign_in_view.SignInDialog, dựng ở lần đăng nhập đầu tiên
+        self._after_sign_in = None  # thao tác đang chờ đăng nhập xong
+        self._signals = _UiSignals(self)
+        self._signals.ready.connect(self._set_qr_image)
+        self._signals.paid.connect(self._order_paid)
+        self._signals.signed_in.connect(self._signed_in)
+        self._signals.cart_changed.connect(self._show_cart_total)
+        reconciler = reconcile.get_reconciler()
+        reconciler.attach(orders.get_service())
+        reconciler.subscribe(self._signals.paid.emit)
+        # Hóa đơn được dựng và in trên luồng nền khi đơn được xác nhận
+        receipts.get_spooler().attach(orders.get_service(), reconciler)
+        # Đơn mới thành phiếu bếp ngay khi đặt, kể cả khi chưa ai mở màn hình bếp
+        kitchen.get_service()
+        self._kitchen_shortcut = QShortcut(QtGui.QKeySequence(KITCHEN_SHORTCUT), self)
+        self._kitchen_shortcut.activated.connect(lambda: self.show_screen("bep"))
+        self.last_switch_ms = 0.0
+
+        # Dựng trước từng màn hình một khi vòng lặp sự kiện rảnh
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(0)
+        self._idle_timer.timeout.connect(self._warm_one)
+
+        self.show_screen(start_screen)
+
+    def screen(self, name):
+        """ Trả về (widget, ui) của màn hình, dựng mới nếu chưa có trong cache """
+        entry = self._cache.get(name)
+        if entry is None:
+            entry = self._build(name)
+            self._cache[name] = entry
+            self._evict(exclude=name)
+        self._cache.move_to_end(name)
+        return entry[0], entry[1]
+
+    def show_screen(self, name):
+        """ Chuyển sang màn hình name và lên lịch dựng trước các màn hình kế tiếp """
+        if name in ADMIN_SCREENS and not self._require_session(lambda n=name: self.show_screen(n), admin=True):
+            return
+        start = time.perf_counter()
+        if name == "gio_hang" and self.user_id is not None:
+            # Màn hình giỏ hàng đọc từ gio_hang nên ghi các thay đổi đang chờ trước
+            cart_service.get_cart(self.user_id).flush()
+        widget, ui = self.screen(name)
+        if name == "gio_hang":
+            self._bind_cart_total(ui)
+        elif name == "chuyen_khoan":
+            self._show_payment_qr(ui)
+        self.stack.setCurrentWidget(widget)
+        self.current = name
+        self.last_switch_ms = (time.perf_counter() - start) * 1000
+        if self.last_switch_ms > SWITCH_BUDGET_MS:
+            print(f"Chuyển sang {name} mất {self.last_switch_ms:.1f} ms")
+
+        self._warm_queue = [n for n in LIKELY_NEXT.get(name, []) if n not in self._cache]
+        if self._warm_queue:
+            self._idle_timer.start()
+
+    def _build(self, name):
+        """ Dựng một màn hình từ module pyuic5 tương ứng và nối các nút điều hướng """
+        module = importlib.import_module(SCREENS[name])
+        widget = QtWidgets.QWidget()
+        ui = module.Ui_Dialog()
+        ui.setupUi(widget)
+        for button_name, target in NAV_BUTTONS.items():
+            button = getattr(ui, button_name, None)
+            if isinstance(button, QtWidgets.QPushButton):
+                button.clicked.connect(lambda checked=False, t=target: self.show_screen(t))
+        if name == "chuyen_khoan":
+            ui.xac_nhan_thanh_toan.clicked.connect(self.confirm_payment_manually)
+        if name == "gio_hang":
+            ui.tien_mat.clicked.connect(lambda: setattr(self, "payment_method", "tien_mat"))
+            ui.chuyen_khoan.clicked.connect(lambda: setattr(self, "payment_method", "chuyen_khoan"))
+            ui.xac_nhan.clicked.connect(lambda checked=False, u=ui: self.confirm_order(u))
+            # chon_ban chỉ hiện bàn trống và tự cập nhật khi bàn đổi trạng thái
+            ui.table_binder = tables.TableComboBinder(ui.chon_ban, tables.get_table_map())
+        menu_view = getattr(ui, "menu_view", None)
+        if menu_view is not None:
+            menu_view.menu_delegate.add_clicked.connect(self.add_to_cart)
+        self.stack.addWidget(widget)
+        cost = len(widget.findChildren(QtWidgets.QWidget))
+        return widget, ui, cost
+
+    def sign_in(self, username, password):
+        """ Đăng nhập trên luồng phụ; kết quả về qua _signed_in trên luồng giao diện """
+        client = lan_api.get_client()
+        # Máy trạm mỏng đăng nhập trên máy chủ: client giữ token để gọi các API ghi dữ liệu
+        future = auth.login_async(username, password, client.login if client is not None else None)
+        future.add_done_callback(lambda f: self._signals.signed_in.emit(
+            f.result() if f.exception() is None else None))
+
+    def _signed_in(self, session):
+        if session is None:
+            if self._after_sign_in is not None:
+                # Còn thao tác đang chờ: mở lại hộp đăng nhập để nhập lại
+                self._open_sign_in("Sai tên đăng nhập hoặc mật khẩu.")
+            else:
+                QtWidgets.QMessageBox.warning(self, "Đăng nhập", "Sai tên đăng nhập hoặc mật khẩu.")
+            return
+        self.user_id = session.user_id
+        self.session_token = session.token
+        self._order_key = None
+        if self.current == "gio_hang":
+            self._bind_cart_total(self.screen("gio_hang")[1])
+        action, self._after_sign_in = self._after_sign_in, None
+        if action is not None:
+            action()
+
+    def _require_session(self, action, admin=False):
+        """
+        True nếu phiên đăng nhập hiện tại còn hạn (auth.authorize, không truy vấn database)
+        và, với admin=True, thuộc tài khoản quản lý.
+        Nếu phiên hết hạn, mở hộp đăng nhập và chạy action sau khi đăng nhập thành công.
+        """
+        if self.session_token is not None and auth.authorize(self.session_token) == self.user_id:
+            if not admin or auth.authorize_admin(self.session_token) == self.user_id:
+                return True
+            QtWidgets.QMessageBox.warning(self, "Không có quyền", "Thao tác này cần tài khoản quản lý.")
+            return False
+        self.user_id = None
+        self.session_token = None
+        self._after_sign_in = action
+        self._open_sign_in()
+        return False
+
+    def _open_sign_in(self, message=""):
+        if self._sign_in_dialog is None:
+            self._sign_in_dialog = sign_in_view.SignInDialog(self)
+            self._sign_in_dialog.accepted.connect(lambda: self.sign_in(*self._sign_in_dialog.credentials()))
+            self._sign_in_dialog.rejected.connect(lambda: setattr(self, "_after_sign_in", None))
+        self._sign_in_dialog.reset(message)
+        self._sign_in_dialog.open()
+
+    def add_to_cart(self, mon_an_id):
+        """ Thêm món được bấm "+" trên menu vào giỏ của người dùng hiện tại """
+        if not self._require_session(lambda m=mon_an_id: self.add_to_cart(m)):
+            return
+        client = lan_api.get_client()
+        if client is not None:
+            client.add_to_cart(self.user_id, mon_an_id)
+        else:
+            cart_service.get_cart(self.user_id).add(mon_an_id)
+        self._order_key = None
+
+    def confirm_order(self, ui):
+        """ Chuyển giỏ hàng thành đơn cho bàn đang chọn trong chon_ban """
+        table_no = ui.chon_ban.currentData()  # mục đầu tiên "Bàn" có data 0
+        if not table_no:
+            QtWidgets.QMessageBox.warning(self, "Chọn bàn", "Vui lòng chọn bàn trước khi xác nhận.")
+            return
+        if not self._require_session(lambda u=ui: self.confirm_order(u)):
+            return
+        if self._order_key is None:
+            self._order_key = uuid.uuid4().hex
+        try:
+            order = (lan_api.get_client() or orders.get_service()).place_order(
+                self.user_id, table_no, self.payment_method, timeout=5, request_key=self._order_key)
+        except (orders.OrderFailed, orders.OrderQueueFull) as e:
+            # Giữ _order_key: bấm xác nhận lại không tạo đơn trùng
+            QtWidgets.QMessageBox.warning(self, "Chưa đặt được đơn", f"{e}\nVui lòng thử lại.")
+            return
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Lỗi", f"Không thể đặt đơn: {e}")
+            return
+        if order is None:
+            QtWidgets.QMessageBox.warning(self, "Giỏ hàng trống", "Giỏ hàng chưa có món nào.")
+            return
+        if self.payment_method == "chuyen_khoan":
+            self.pending_payment = (order["id"], order["total"])
+            # Bắt đầu vẽ QR ngay, song song với việc chuyển màn hình
+            payment_qr.get_renderer().request(order["total"], payment_qr.order_reference(order["id"]))
+            self.show_screen("chuyen_khoan")
+            return
+        QtWidgets.QMessageBox.information(self, "Thành công",
+                                          f"Đã đặt đơn #{order['id']} cho bàn {table_no}.")
+
+    def confirm_payment_manually(self):
+        """ Thu ngân tự xác nhận khi chưa nhận được thông báo từ ngân hàng """
+        if self.pending_payment is None:
+            return
+        if not self._require_session(self.confirm_payment_manually, admin=True):
+            return
+        order_id, amount = self.pending_payment
+        paid = database.mark_orders_paid([(f"TAY{order_id}", order_id, amount)])
+        if paid is None:
+            QtWidgets.QMessageBox.warning(self, "Lỗi", "Chưa ghi được thanh toán, vui lòng thử lại.")
+            return
+        if paid:
+            receipts.get_spooler().submit(order_id)
+            self._order_paid(order_id)
+
+    def _order_paid(self, order_id):
+        """ Đơn đang hiển thị QR đã được thanh toán (tự động hoặc bằng tay) """
+        if self.pending_payment is None or self.pending_payment[0] != order_id:
+            return
+        self.pending_payment = None
+        QtWidgets.QMessageBox.information(self, "Thành công", f"Đơn #{order_id} đã thanh toán.")
+        self.show_screen("menu")
+
+    def _show_payment_qr(self, ui):
+        """ Hiện QR chuyển khoản của đơn đang chờ thanh toán trên màn hình chuyen_khoan """
+        if self.pending_payment is None:
+            return
+        order_id, amount = self.pending_payment
+        future = payment_qr.get_renderer().request(amount, payment_qr.order_reference(order_id))
+        if future.done():
+            self._set_qr_image(ui, future.result())
+        else:
+            future.add_done_callback(lambda f, u=ui: self._signals.ready.emit(u, f.result()))
+
+    def _set_qr_image(self, ui, png):
+        if png is None:
+            return  # giữ ảnh qr.jpg tĩnh
+        pixmap = QtGui.QPixmap()
+        pixmap.loadFromData(png, "PNG")
+        ui.label.setStyleSheet("")
+        ui.label.setPixmap(pixmap.scaled(ui.label.size(), QtCore.Qt.AspectRatioMode.KeepAspectRatio))
+
+    def _bind_cart_total(self, ui):
+        """ Nhãn "Hiện giá tiền" theo dõi tổng giỏ hàng, không truy vấn lại cả giỏ """
+        if self.user_id is None:
+            return
+        client = lan_api.get_client()
+        if client is not None:
+            # Giỏ hàng nằm trên máy chủ: đọc tổng và giá combo một lần khi mở màn hình
+            summary = client.get_cart(self.user_id)
+            ui.label_9.setText(f"Hiện giá tiền: {summary['combo_total']:,} đ ({summary['count']} món)")
+            ui.label_7.setText(summary["breakdown"])
+            return
+        cart = cart_service.get_cart(self.user_id)
+        if self._cart_listener is not None:
+            if self._cart_listener[0] is cart:
+                return
+            self._unbind_cart_total()
+
+        # Giỏ có thể đổi trên luồng khác (luồng ghi đơn, lan_api): chỉ phát tín hiệu, nhãn được
+        # cập nhật trong _show_cart_total trên luồng giao diện
+        def listener(count, total, c=cart, u=ui):
+            self._signals.cart_changed.emit(c, u, count)
+
+        self._cart_listener = (cart, listener)
+        cart.subscribe(listener)
+
+    def _show_cart_total(self, cart, ui, count):
+        if self._cart_listener is None or self._cart_listener[0] is not cart:
+            return  # tín hiệu còn trong hàng đợi của giỏ đã bỏ theo dõi
+        # Giá sau khi ghép combo rẻ nhất, kèm bảng chi tiết các dòng combo / món lẻ
+        quote = combos.get_pricer().price(cart.quantities())
+        ui.label_9.setText(f"Hiện giá tiền: {quote.total:,} đ ({count} món)")
+        ui.label_7.setText(quote.breakdown())
+
+    def _unbind_cart_total(self):
+        if self._cart_listener is not None:
+            cart, listener = self._cart_listener
+            cart.unsubscribe(listener)
+            self._cart_listener = None
+
+    def closeEvent(self, event):
+        cart_service.flush_all()
+        super().closeEvent(event)
+
+    def _warm_one(self):
+        """ Dựng trước một màn hình trong hàng đợi, mỗi lần một màn để không chặn UI """
+        while self._warm_queue:
+            name = self._warm_queue.pop(0)
+            if name not in self._cache:
+                entry = self._build(name)
+                # Chỉ giữ màn dựng trước nếu còn đủ chỗ trong ngân sách: màn đoán trước không được
+                # đẩy các màn người dùng đã mở ra; không đủ chỗ thì bỏ màn vừa dựng và dừng dựng trước
+                if sum(cached[2] for cached in self._cache.values()) + entry[2] > self.widget_budget:
+                    self.stack.removeWidget(entry[0])
+                    entry[0].deleteLater()
+                    self._warm_queue = []
+                    break
+                # Màn dựng trước được xem là ít dùng nhất: màn mở sau sẽ đẩy nó ra trước
+                self._cache[name] = entry
+                self._cache.move_to_end(name, last=False)
+                break
+        if self._warm_queue:
+            self._idle_timer.start()
+
+    def _evict(self, exclude=None):
+        """
+        Giải phóng các màn hình ít dùng nhất khi vượt ngân sách, trừ màn hiện tại và màn exclude
+        (màn vừa dựng, sắp được hiển thị).
+        """
+        total = sum(entry[2] for entry in self._cache.values())
+        for name in list(self._cache):
+            if total <= self.widget_budget or len(self._cache) <= 1:
+                break
+            if name in (self.current, exclude):
+                continue
+            widget, _, cost = self._cache.pop(name)
+            if name == "gio_hang":
+                self._unbind_cart_total()
+            self.stack.removeWidget(widget)
+            widget.deleteLater()
+            total -= cost
+
+
+if __name__ == "__main__":
+    app = QtWidgets.QApplication(sys.argv)
+    shell = AppShell()
+    shell.show()
+    sys.exit(app.exec())
@@ -0,0 +1,156 @@
+# auth.py
+# Đăng nhập không chặn giao diện và phiên đăng nhập trong bộ nhớ.
+# Kiểm tra mật khẩu (PBKDF2, xem passwords.py) chạy trên nhóm luồng riêng; hashlib nhả GIL
+# trong lúc băm nên luồng giao diện vẫn chạy. Đăng nhập đúng trả về một token phiên; các lần
+# kiểm tra quyền sau đó chỉ tra token trong bộ nhớ, không truy vấn database.
+# Phiên mang cờ is_admin (cột users.is_admin) cho các thao tác quản lý; cấp quyền bằng database.set_admin.
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+SESSION_TTL = 8 * 3600     # giây không hoạt động trước khi phiên hết hạn (một ca làm việc)
+MAX_SESSIONS = 1024
+LOGIN_WORKERS = 2
+
+
+class Session:
+    __slots__ = ("token", "user_id", "ho", "ten", "is_admin", "expires_at")
+
+    def __init__(self, token, user_id, ho, ten, is_admin, expires_at):
+        self.token = token
+        self.user_id = user_id
+        self.ho = ho
+        self.ten = ten
+        self.is_admin = is_admin
+        self.expires_at = expires_at
+
+
+class SessionCache:
+    def __init__(self, ttl=SESSION_TTL, max_sessions=MAX_SESSIONS):
+        """ token -> Session, hết hạn sau ttl giây không dùng; quá max_sessions thì bỏ phiên cũ nhất """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, user_id, ho, ten, is_admin=False):
+        session = Session(secrets.token_urlsafe(32), user_id, ho, ten, bool(is_admin),
+                          time.monotonic() + self.ttl)
+        with self._lock:
+            self._sessions[session.token] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, token):
+        """ Phiên còn hạn của token (gia hạn thêm ttl), hoặc None """
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            now = time.monotonic()
+            if session.expires_at <= now:
+                del self._sessions[token]
+                return None
+            session.expires_at = now + self.ttl
+            self._sessions.move_to_end(token)
+            return session
+
+    def revoke(self, token):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def revoke_user(self, user_id):
+        """ Hủy mọi phiên của một người dùng (ví dụ khi đổi mật khẩu) """
+        with self._lock:
+            for token in [t for t, s in self._sessions.items() if s.user_id == user_id]:
+                del self._sessions[token]
+
+
+class Authenticator:
+    def __init__(self, sessions=None, workers=LOGIN_WORKERS):
+        """ Đăng nhập trên nhóm luồng riêng, phiên lưu trong SessionCache """
+        self.sessions = sessions or SessionCache()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login")
+
+    def _login(self, username, password, verify=None):
+        if verify is None:
+            # Import khi cần: import database tạo foodie.db trong thư mục hiện tại
+            import database
+            verify = database.login_user
+
+        user = verify(username, password)
+        if user is None:
+            return None
+        return self.sessions.create(*user)
+
+    def login_async(self, username, password, verify=None):
+        """
+        Future chứa Session nếu đăng nhập đúng, None nếu sai.
+        verify(username, password) trả về (id, ho, ten, is_admin) hoặc None; mặc định database.login_user
+        (máy trạm mỏng truyền lan_api.ApiClient.login để kiểm tra trên máy chủ).
+        """
+        return self._pool.submit(self._login, username, password, verify)
+
+    def authorize(self, token):
+        """ user_id của token còn hạn, hoặc None; không truy vấn database """
+        session = self.sessions.get(token)
+        return session.user_id if session is not None else None
+
+    def authorize_admin(self, token):
+        """ user_id của token còn hạn có quyền quản lý, hoặc None """
+        session = self.sessions.get(token)
+        return session.user_id if session is not None and session.is_admin else None
+
+    def logout(self, token):
+        self.sessions.revoke(token)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+_authenticator = None
+
+
+def get_authenticator():
+    global _authenticator
+    if _authenticator is None:
+        _authenticator = Authenticator()
+    return _authenticator
+
+
+def login_async(username, password, verify=None):
+    return get_authenticator().login_async(username, password, verify)
+
+
+def authorize(token):
+    return get_authenticator().authorize(token)
+
+
+def authorize_admin(token):
+    return get_authenticator().authorize_admin(token)
+
+
+if __name__ == "__main__":
+    # Đo thời gian một lần kiểm tra mật khẩu và một lần kiểm tra quyền bằng token
+    import os
+    import tempfile
+
+    import passwords
+
+    os.chdir(tempfile.mkdtemp())
+    import database
+
+    database.create_tables()
+    database.register_user("thu_ngan", "mat-khau", "Nguyễn", "An", "0900000000")
+    start = time.perf_counter()
+    session = login_async("thu_ngan", "mat-khau").result()
+    login_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(10000):
+        authorize(session.token)
+    authorize_us = (time.perf_counter() - start) * 1e6 / 10000
+    print(f"PBKDF2 {passwords.ITERATIONS} vòng: đăng nhập {login_ms:.1f} ms, "
+          f"kiểm tra token {authorize_us:.2f} µs")
@@ -0,0 +1,152 @@
+# build_ui.py
+# Sinh lại các màn hình từ file .ui và hậu xử lý output của pyuic:
+#   - chạy qua qt_compat để cả ứng dụng chỉ dùng một Qt binding
+#   - dùng QFont dùng chung từ theme.font() thay cho QFont() mới cho từng widget
+#   - bỏ setStyleSheet("") và chuyển các stylesheet lặp lại sang theme.qss
+#     (một stylesheet cấp ứng dụng), widget chỉ còn giữ thuộc tính themeRole
+#   python build_ui.py            -> chạy pyuic5 cho mọi file .ui rồi hậu xử lý
+#   python build_ui.py --fix-only -> chỉ hậu xử lý các file .py đã có
+import ast
+import hashlib
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+SCREENS = ["man_hinh_chinh", "page_1", "page_2", "page_3", "page_4",
+           "best_seller", "gio_hang", "chuyen_khoan"]
+
+# Enum viết tắt (chỉ PyQt5 hiểu) -> tên đầy đủ (PyQt5 >= 5.11 và PyQt6 đều hiểu)
+SCOPED_ENUMS = {
+    "QtCore.Qt.ArrowCursor": "QtCore.Qt.CursorShape.ArrowCursor",
+    "QtCore.Qt.LeftToRight": "QtCore.Qt.LayoutDirection.LeftToRight",
+    "QtCore.Qt.AlignCenter": "QtCore.Qt.AlignmentFlag.AlignCenter",
+}
+
+MARKER = "# Post-processed by build_ui.py to run on qt_compat."
+THEME_IMPORT = "import theme\n"
+THEME_FILE = "theme.qss"
+
+# self.x.setStyleSheet("..." "...") - pyuic viết chuỗi dài thành nhiều dòng liền nhau
+STYLE_CALL = re.compile(r'^(\s*)self\.(\w+)\.setStyleSheet\(((?:"(?:[^"\\\n]|\\.)*"\s*)+)\)\n', re.M)
+# font = QtGui.QFont() / font.setX(...) / target.setFont(font)
+FONT_BLOCK = re.compile(r'^(\s*)font = QtGui\.QFont\(\)\n((?:\1font\.set\w+\([^)\n]*\)\n)*)'
+                        r'\1((?:self\.)?\w+)\.setFont\(font\)\n', re.M)
+FONT_SETTER = re.compile(r'font\.set(\w)(\w*)\(([^)\n]*)\)')
+
+
+def make_portable(source):
+    """ Chuyển output của pyuic5 sang dạng chạy được trên PyQt5 lẫn PyQt6 """
+    if MARKER in source:
+        return source
+    source = source.replace("from PyQt5 import QtCore, QtGui, QtWidgets",
+                            "from qt_compat import QtCore, QtGui, QtWidgets, load_resources")
+    # QFont.setWeight(75) nhận int ở PyQt5 nhưng cần enum ở PyQt6; setBold(True) đã đủ
+    source = re.sub(r"^\s*font\.setWeight\(\d+\)\n", "", source, flags=re.M)
+    for short, scoped in SCOPED_ENUMS.items():
+        source = re.sub(re.escape(short) + r"\b", scoped, source)
+    source = source.replace("import doan_rc\n", "load_resources()\n")
+    source = source.replace("app.exec_()", "app.exec()")
+    source = source.replace("# run again.  Do not edit this file unless you know what you are doing.\n",
+                            "# run again.  Do not edit this file unless you know what you are doing.\n"
+                            + MARKER + "\n", 1)
+    return source
+
+
+def normalize_style(css):
+    """ Bỏ comment và khoảng trắng thừa để so sánh hai stylesheet """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    return re.sub(r"\s+", " ", css).strip()
+
+
+def style_role(css):
+    """ Tên role ổn định cho một stylesheet, dùng trong selector [themeRole="..."] """
+    return "s" + hashlib.sha1(css.encode("utf-8")).hexdigest()[:8]
+
+
+def scoped_rule(css, role):
+    """ Viết lại stylesheet của một widget thành rule cấp ứng dụng chỉ áp cho role """
+    attr = f'[themeRole="{role}"]'
+    if "{" not in css:
+        return f"*{attr} {{ {css} }}"
+    rules = []
+    for selectors, body in re.findall(r"([^{}]+)\{([^{}]*)\}", css):
+        scoped = []
+        for selector in selectors.split(","):
+            selector = selector.strip()
+            if selector.startswith("*"):
+                scoped.append("*" + attr + selector[1:])
+            else:
+                scoped.append(re.sub(r"^([A-Za-z_]\w*)", lambda m: m.group(1) + attr, selector, count=1))
+        rules.append(f"{', '.join(scoped)} {{ {body.strip()} }}")
+    return "\n".join(rules)
+
+
+def collect_styles(sources):
+    """ Đếm số lần mỗi stylesheet xuất hiện trên tất cả màn hình """
+    counts = Counter()
+    for source in sources:
+        for match in STYLE_CALL.finditer(source):
+            counts[normalize_style(ast.literal_eval("(" + match.group(3) + ")"))] += 1
+    return counts
+
+
+def apply_theme(source, shared_styles):
+    """ Thay QFont riêng lẻ bằng theme.font() và stylesheet lặp lại bằng themeRole """
+    if THEME_IMPORT in source:
+        return source
+
+    def replace_font(match):
+        indent, setters, target = match.group(1), match.group(2), match.group(3)
+        kwargs = [f"{first.lower()}{rest}={value}" for first, rest, value in FONT_SETTER.findall(setters)]
+        return f"{indent}{target}.setFont(theme.font({', '.join(kwargs)}))\n"
+
+    def replace_style(match):
+        indent, widget = match.group(1), match.group(2)
+        css = normalize_style(ast.literal_eval("(" + match.group(3) + ")"))
+        if not css:
+            return ""
+        if css in shared_styles:
+            return f'{indent}self.{widget}.setProperty("themeRole", "{style_role(css)}")\n'
+        return match.group(0)
+
+    source = FONT_BLOCK.sub(replace_font, source)
+    source = STYLE_CALL.sub(replace_style, source)
+    source = source.replace("load_resources\n", "load_resources\n" + THEME_IMPORT, 1)
+    source = source.replace("    app = QtWidgets.QApplication(sys.argv)\n",
+                            "    app = QtWidgets.QApplication(sys.argv)\n    theme.apply(app)\n", 1)
+    return source
+
+
+def write(path, text):
+    # Các file trong repo dùng CRLF
+    with open(path, "w", encoding="utf-8", newline="\r\n") as f:
+        f.write(text)
+
+
+def build(run_pyuic=True):
+    """ Sinh lại mọi màn hình, hậu xử lý và ghi theme.qss """
+    sources = {}
+    for name in SCREENS:
+        if run_pyuic:
+            subprocess.run(["pyuic5", f"{name}.ui", "-o", f"{name}.py"], check=True)
+        with open(f"{name}.py", encoding="utf-8") as f:
+            sources[name] = make_portable(f.read())
+
+    counts = collect_styles(sources.values())
+    # Chỉ stylesheet dùng từ 2 lần trở lên mới chuyển lên cấp ứng dụng;
+    # ảnh riêng từng món (border-image) vẫn để trên widget
+    shared = {css for css, count in counts.items() if css and count >= 2}
+    if shared:
+        rules = [scoped_rule(css, style_role(css)) for css in sorted(shared)]
+        write(THEME_FILE, "/* Generated by build_ui.py - do not edit. */\n" + "\n".join(rules) + "\n")
+
+    for name, source in sources.items():
+        write(f"{name}.py", apply_theme(source, shared))
+        print(f"Built {name}.py")
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    build(run_pyuic="--fix-only" not in sys.argv)
@@ -0,0 +1,283 @@
+# cart_service.py
+# Giỏ hàng trong bộ nhớ, ghi xuống bảng gio_hang theo lô (write-behind).
+# Mỗi lần bấm "+" chỉ cập nhật bộ nhớ và ghi một dòng vào journal; các lần bấm
+# liên tiếp cùng một món được gộp lại và ghi xuống database khi:
+#   - hết FLUSH_INTERVAL giây kể từ thay đổi đầu tiên chưa ghi
+#   - chuyển sang màn hình giỏ hàng (gio_hang)
+#   - thanh toán
+# Journal (cart_journal/<user_id>.log) cho phép phát lại các thay đổi chưa ghi
+# nếu ứng dụng bị tắt đột ngột.
+# Bảng giá trong bộ nhớ được nạp lại khi menu_version đổi (sửa giá, đồng bộ từ quầy khác); giỏ
+# đang mở được tính lại tổng theo giá mới, khớp với gio_hang_tong do trigger cập nhật.
+import os
+import threading
+import time
+
+import database
+
+FLUSH_INTERVAL = 2.0
+JOURNAL_DIR = "cart_journal"
+MENU_CHECK_INTERVAL = 1.0  # giây giữa hai lần đọc menu_version
+
+# mon_an_id -> gia, dùng để cập nhật tổng tiền mà không cần JOIN với mon_an
+_prices = {}
+_missing = set()  # mon_an_id không có trong bảng giá của phiên bản hiện tại (món đã xóa, journal cũ)
+_prices_version = None  # menu_version lúc nạp _prices
+_prices_checked_at = 0.0
+_prices_lock = threading.Lock()
+
+
+def prices():
+    """ (phiên bản, {mon_an_id: gia}); đọc lại bảng giá nếu menu_version đã đổi """
+    global _prices, _missing, _prices_version, _prices_checked_at
+    with _prices_lock:
+        now = time.monotonic()
+        if now - _prices_checked_at >= MENU_CHECK_INTERVAL:
+            _prices_checked_at = now
+            version = database.get_menu_version()
+            if version is not None and version != _prices_version:
+                _prices = database.get_mon_an_prices()
+                _missing = set()
+                _prices_version = version
+        return _prices_version, _prices
+
+
+def price_of(mon_an_id):
+    """
+    Giá món ăn từ bộ nhớ đệm, nạp lại bảng giá nếu gặp món mới hoặc thực đơn đã đổi.
+    Món vẫn không có sau khi nạp lại được nhớ là không có (giá 0) cho tới khi menu_version đổi,
+    để món đã xóa không làm mỗi lần bấm "+" đọc lại cả bảng.
+    """
+    global _prices
+    _, current = prices()
+    if mon_an_id not in current and mon_an_id not in _missing:
+        with _prices_lock:
+            _prices = {**_prices, **database.get_mon_an_prices()}
+            current = _prices
+            if mon_an_id not in current:
+                _missing.add(mon_an_id)
+    return current.get(mon_an_id, 0)
+
+
+class CartMetrics:
+    def __init__(self):
+        """ Số liệu về các lần ghi xuống database """
+        self.flush_count = 0
+        self.rows_flushed = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_lag_ms = 0.0  # thời gian từ thay đổi cũ nhất chưa ghi đến lúc ghi xong
+        self.max_lag_ms = 0.0
+
+    def record(self, batch_size, lag_ms):
+        self.flush_count += 1
+        self.rows_flushed += batch_size
+        self.last_batch_size = batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class Cart:
+    def __init__(self, user_id, flush_interval=FLUSH_INTERVAL, journal_dir=JOURNAL_DIR):
+        """ Giỏ hàng của một người dùng; số lượng đọc từ gio_hang rồi giữ trong bộ nhớ """
+        self.user_id = user_id
+        self.flush_interval = flush_interval
+        self.metrics = CartMetrics()
+        self._lock = threading.RLock()
+        self._timer = None
+        self._pending = {}  # mon_an_id -> delta chưa ghi xuống database
+        self._pending_since = None
+        self._seq = database.get_cart_last_seq(user_id)
+        self.items = database.get_cart_quantities(user_id)  # mon_an_id -> so_luong
+        # Tổng giỏ hàng được cập nhật theo từng thay đổi, đọc ra là O(1)
+        self.count, self.total = database.get_cart_total(user_id)
+        self._prices_version = prices()[0]
+        self._listeners = []
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self._journal_path = os.path.join(journal_dir, f"{user_id}.log")
+        self._replay_journal()
+        self._journal = open(self._journal_path, "a", encoding="utf-8")
+        if self._pending:
+            print(f"Phát lại {len(self._pending)} món chưa ghi của giỏ hàng user {self.user_id}")
+            self.flush()
+
+    def _replay_journal(self):
+        """ Phát lại các thay đổi còn trong journal mà database chưa có """
+        if not os.path.exists(self._journal_path):
+            return
+        last_flushed = self._seq
+        with open(self._journal_path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 3:
+                    continue  # dòng ghi dở khi bị tắt đột ngột
+                seq, mon_an_id, delta = (int(p) for p in parts)
+                if seq <= last_flushed:
+                    continue
+                self._seq = max(self._seq, seq)
+                self._apply(mon_an_id, delta)
+
+    def _reprice(self):
+        """ Tính lại tổng theo bảng giá mới nếu thực đơn đã đổi từ lần tính trước """
+        version, current = prices()
+        if version == self._prices_version:
+            return False
+        self._prices_version = version
+        self.total = sum(quantity * current.get(mon_an_id, 0) for mon_an_id, quantity in self.items.items())
+        return True
+
+    def _apply(self, mon_an_id, delta):
+        self._reprice()
+        quantity = self.items.get(mon_an_id, 0) + delta
+        self.count += delta
+        self.total += delta * price_of(mon_an_id)
+        if quantity > 0:
+            self.items[mon_an_id] = quantity
+        else:
+            self.items.pop(mon_an_id, None)
+        self._pending[mon_an_id] = self._pending.get(mon_an_id, 0) + delta
+        if self._pending_since is None:
+            self._pending_since = time.perf_counter()
+
+    def add(self, mon_an_id, quantity=1):
+        """ Thêm (hoặc bớt nếu quantity < 0) món vào giỏ, áp dụng ngay trong bộ nhớ """
+        with self._lock:
+            if quantity < 0:
+                quantity = max(quantity, -self.items.get(mon_an_id, 0))
+            if quantity == 0:
+                return
+            self._seq += 1
+            self._journal.write(f"{self._seq} {mon_an_id} {quantity}\n")
+            self._journal.flush()
+            self._apply(mon_an_id, quantity)
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        self._notify()
+
+    def subscribe(self, listener):
+        """
+        Đăng ký hàm listener(count, total) được gọi mỗi khi giỏ hàng thay đổi. listener chạy trên
+        luồng vừa đổi giỏ (luồng ghi đơn, nhóm luồng của lan_api, ...): giao diện chỉ nên phát tín hiệu Qt
+        """
+        self._listeners.append(listener)
+        listener(self.count, self.total)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self):
+        for listener in list(self._listeners):
+            listener(self.count, self.total)
+
+    def summary(self):
+        """ (số món, tổng tiền) của giỏ hàng """
+        with self._lock:
+            repriced = self._reprice()
+            result = self.count, self.total
+        if repriced:
+            self._notify()
+        return result
+
+    def remove(self, mon_an_id, quantity=1):
+        self.add(mon_an_id, -quantity)
+
+    def quantity(self, mon_an_id):
+        return self.items.get(mon_an_id, 0)
+
+    def quantities(self):
+        """ Bản sao {mon_an_id: số lượng}, đọc an toàn từ luồng khác """
+        with self._lock:
+            return dict(self.items)
+
+    def flush(self):
+        """ Ghi mọi thay đổi đang chờ xuống gio_hang trong một transaction """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            changes = {k: v for k, v in self._pending.items() if v != 0}
+            if not changes:
+                self._pending.clear()
+                self._pending_since = None
+                return True
+            if not database.apply_cart_changes(self.user_id, changes, self._seq):
+                # Giữ lại thay đổi để lần sau ghi tiếp
+                return False
+            lag_ms = (time.perf_counter() - self._pending_since) * 1000
+            self._pending.clear()
+            self._pending_since = None
+            # Database đã có mọi thay đổi đến self._seq, journal có thể xóa
+            self._journal.seek(0)
+            self._journal.truncate()
+            self.metrics.record(len(changes), lag_ms)
+            return True
+
+    def clear(self):
+        """ Xóa giỏ hàng (sau khi thanh toán xong) """
+        with self._lock:
+            self.flush()
+            database.clear_cart(self.user_id)
+            self.items.clear()
+            self.count, self.total = 0, 0
+        self._notify()
+
+    def checkout(self, place):
+        """
+        Ghi giỏ hàng xuống database rồi gọi place() (ví dụ database.place_order) trong khi
+        giữ khóa, để không có món nào được thêm vào giữa lúc chuyển giỏ thành đơn.
+        Nếu place() trả về kết quả khác None thì giỏ trong bộ nhớ được làm trống.
+        Không ghi được giỏ xuống database thì ném database.Error (giỏ trong bộ nhớ giữ nguyên).
+        """
+        with self._lock:
+            if not self.flush():
+                raise database.Error("Không ghi được giỏ hàng xuống database")
+            result = place()
+            if result is not None:
+                self.items.clear()
+                self.count, self.total = 0, 0
+        if result is not None:
+            self._notify()
+        return result
+
+    def close(self):
+        self.flush()
+        self._journal.close()
+
+
+# user_id -> Cart
+_carts = {}
+_carts_lock = threading.Lock()
+
+
+def get_cart(user_id):
+    """ Giỏ hàng dùng chung của người dùng trong tiến trình """
+    with _carts_lock:
+        cart = _carts.get(user_id)
+        if cart is None:
+            cart = _carts[user_id] = Cart(user_id)
+        return cart
+
+
+def get_cart_total(user_id):
+    """ (số món, tổng tiền) của giỏ hàng, gồm cả thay đổi chưa ghi xuống database """
+    with _carts_lock:
+        cart = _carts.get(user_id)
+    if cart is not None:
+        return cart.summary()
+    return database.get_cart_total(user_id)
+
+
+def flush_all():
+    """ Ghi mọi giỏ hàng xuống database (khi đóng ứng dụng) """
+    with _carts_lock:
+        carts = list(_carts.values())
+    for cart in carts:
+        cart.flush()
@@ -0,0 +1,315 @@
+# combos.py
+# Tính giá giỏ hàng rẻ nhất khi ghép các món thành combo (combo1..combo5 trên page_3/page_4).
+# Giỏ hàng được chia thành các nhóm món độc lập (hai món cùng nhóm nếu có combo chứa cả hai),
+# mỗi nhóm được giải như bài toán quy hoạch nguyên "chọn số lần dùng mỗi combo sao cho tiết
+# kiệm nhiều nhất" bằng nhánh cận, có ghi nhớ các trạng thái (combo đang xét, số món còn lại)
+# đã gặp. Món còn lại sau khi ghép combo được tính giá lẻ.
+# Kết quả của các giỏ đã tính được giữ trong LRU nên màn hình gio_hang cập nhật gần như tức thì.
+import random
+import threading
+import time
+from collections import OrderedDict
+
+import cart_service
+import database
+
+# (mã, tên hiển thị, {tên món: số lượng}, giá combo) - theo nhãn trên page_3/page_4
+COMBOS = (
+    ("combo1", "Combo 1", {"Gà rán truyền thống": 1, "Khoai tây chiên vừa": 1, "Pepsi": 1}, 59000),
+    ("combo2", "Combo 2", {"Gà viên": 1, "Khoai tây chiên lớn": 1, "Coca Cola": 1}, 58000),
+    ("combo3", "Combo 3", {"Hamburger gà": 1, "Khoai tây chiên vừa": 1, "7 UP": 1}, 60000),
+    ("combo4", "Combo 4", {"Gà rán cay": 1, "Khoai lắc phô mai": 1, "Pepsi": 1}, 62000),
+    ("combo5", "Combo 5", {"Gà nướng BBQ": 1, "Hamburger phô mai": 1, "Coca Cola": 1}, 75000),
+)
+CACHE_SIZE = 256
+# Giới hạn số nút tìm kiếm mỗi giỏ. Mục tiêu 5 ms/giỏ CHƯA đạt ở trường hợp xấu nhất: benchmark()
+# (200 giỏ 50 món, 100 combo) đo được trung bình ~2.3 ms, p95 ~4 ms nhưng chậm nhất 7.34 ms, và chỉ
+# 86/200 giỏ được chứng minh tối ưu trong giới hạn này (các giỏ còn lại đạt ~98.8% mức tiết kiệm tối ưu).
+MAX_NODES = 120
+
+
+class ComboRule:
+    __slots__ = ("code", "label", "items", "price")
+
+    def __init__(self, code, label, items, price):
+        """ items là {mon_an_id: số lượng} """
+        self.code = code
+        self.label = label
+        self.items = dict(items)
+        self.price = price
+
+
+class Quote:
+    def __init__(self, total, alacarte_total, lines, optimal=True):
+        """ Kết quả tính giá; lines là [(tên, số lượng, thành tiền), ...] """
+        self.total = total
+        self.optimal = optimal  # False nếu dừng tìm kiếm vì hết max_nodes
+        self.alacarte_total = alacarte_total
+        self.savings = alacarte_total - total
+        self.lines = lines
+
+    def breakdown(self):
+        """ Chuỗi nhiều dòng để hiện trên màn hình gio_hang """
+        rows = [f"{qty} x {name}: {amount:,} đ" for name, qty, amount in self.lines]
+        if self.savings:
+            rows.append(f"Tiết kiệm nhờ combo: {self.savings:,} đ")
+        return "\n".join(rows)
+
+
+class ComboPricer:
+    def __init__(self, rules, prices, names=None, cache_size=CACHE_SIZE, max_nodes=MAX_NODES):
+        """ rules: [ComboRule]; prices: {mon_an_id: giá lẻ}; names: {mon_an_id: tên món} """
+        self.prices = dict(prices)
+        self.max_nodes = max_nodes
+        self.names = dict(names or {})
+        # Bỏ các combo thiếu giá món hoặc không rẻ hơn mua lẻ: không bao giờ được chọn
+        self.rules = [rule for rule in rules
+                      if all(mon_an_id in self.prices for mon_an_id in rule.items)
+                      and rule.price < sum(self.prices[m] * q for m, q in rule.items.items())]
+        self._rules_by_item = {}  # mon_an_id -> [ComboRule chứa món đó]
+        for rule in self.rules:
+            for mon_an_id in rule.items:
+                self._rules_by_item.setdefault(mon_an_id, []).append(rule)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # tuple(sorted(quantities)) -> Quote
+        # Pricer dùng chung giữa luồng giao diện, luồng ghi đơn và máy chủ LAN
+        self._cache_lock = threading.Lock()
+
+    def price(self, quantities):
+        """ Quote rẻ nhất cho giỏ {mon_an_id: số lượng} """
+        key = tuple(sorted((m, q) for m, q in quantities.items() if q > 0))
+        with self._cache_lock:
+            quote = self._cache.get(key)
+            if quote is not None:
+                self._cache.move_to_end(key)
+                return quote
+        # Giải ngoài khóa: hai luồng cùng giỏ có thể giải trùng, kết quả như nhau
+        quote = self._solve(dict(key))
+        with self._cache_lock:
+            self._cache[key] = quote
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return quote
+
+    def _groups(self, quantities):
+        """ Chia các món có combo thành nhóm độc lập (union-find theo combo dùng được) """
+        parent = {m: m for m in quantities if m in self._rules_by_item}
+
+        def find(m):
+            while parent[m] != m:
+                parent[m] = parent[parent[m]]
+                m = parent[m]
+            return m
+
+        usable = set()
+        for mon_an_id in parent:
+            for rule in self._rules_by_item[mon_an_id]:
+                if id(rule) in usable or any(quantities.get(m, 0) < q for m, q in rule.items.items()):
+                    continue
+                usable.add(id(rule))
+                ids = list(rule.items)
+                for other in ids[1:]:
+                    a, b = find(ids[0]), find(other)
+                    if a != b:
+                        parent[a] = b
+        groups = {}
+        for mon_an_id in parent:
+            groups.setdefault(find(mon_an_id), []).append(mon_an_id)
+        rules = [rule for rule in self.rules if id(rule) in usable]
+        return list(groups.values()), rules
+
+    def _solve(self, quantities):
+        groups, rules = self._groups(quantities)
+        counts = {}  # tên dòng -> [số lượng, thành tiền]
+        grouped = set()
+        optimal = True
+        budget = [self.max_nodes]  # số nút tìm kiếm còn lại cho cả giỏ
+        for ids in groups:
+            grouped.update(ids)
+            ids.sort()
+            group_rules = [rule for rule in rules if next(iter(rule.items)) in ids]
+            choices, proven = self._solve_group(ids, group_rules, quantities, budget)
+            optimal = optimal and proven
+            for name, amount in choices:
+                line = counts.setdefault(name, [0, 0])
+                line[0] += 1
+                line[1] += amount
+        for mon_an_id, qty in quantities.items():
+            if mon_an_id not in grouped:
+                line = counts.setdefault(self._name(mon_an_id), [0, 0])
+                line[0] += qty
+                line[1] += qty * self.prices.get(mon_an_id, 0)
+        alacarte = sum(qty * self.prices.get(m, 0) for m, qty in quantities.items())
+        lines = [(name, qty, amount) for name, (qty, amount) in counts.items()]
+        lines.sort(key=lambda line: -line[2])
+        return Quote(sum(line[2] for line in lines), alacarte, lines, optimal)
+
+    def _solve_group(self, ids, rules, quantities, budget):
+        """
+        Nhánh cận trên số lần dùng mỗi combo trong một nhóm; trả về (các combo đã chọn, đã chứng minh tối ưu).
+        Combo được xét theo tỉ lệ giảm giá tốt nhất trước, mỗi combo thử số lần dùng từ nhiều đến ít,
+        nên nhánh đầu tiên chính là cách ghép tham lam. Cận trên của phần tiết kiệm còn lại: mỗi món
+        nhân với mức tiết kiệm lớn nhất nó có thể mang lại trong các combo chưa xét, cập nhật dần
+        theo từng bước. Hết budget nút thì dừng và dùng kết quả tốt nhất đã tìm được.
+        """
+        n = len(ids)
+        position = {m: i for i, m in enumerate(ids)}
+        start = [quantities[m] for m in ids]
+        options = []  # (rule, ((vị trí món, số lượng), ...), tiền tiết kiệm, giá lẻ)
+        for rule in rules:
+            full = sum(self.prices[m] * q for m, q in rule.items.items())
+            options.append((rule, tuple((position[m], q) for m, q in rule.items.items()),
+                            full - rule.price, full))
+        options.sort(key=lambda option: option[3] / option[2])
+        count = len(options)
+        # Hai cách chia tiền tiết kiệm của combo cho các món (theo giá lẻ, hoặc dồn cho món khan
+        # nhất trong giỏ); với mỗi cách, suffix[k][i] là mức lớn nhất của món i trong combo k..cuối
+        # và drop[k] là phần suffix[k] giảm đi khi bỏ qua combo k (chỉ ở các món của combo k)
+        suffixes, drops = [], []
+        for split in ("price", "scarce"):
+            suffix = [[0.0] * n]
+            for rule, parts, saving, full in reversed(options):
+                row = list(suffix[-1])
+                if split == "price":
+                    shares = [(i, saving * self.prices[ids[i]] / full) for i, _ in parts]
+                else:
+                    i, q = min(parts, key=lambda part: start[part[0]] / part[1])
+                    shares = [(i, saving / q)]
+                for i, share in shares:
+                    if share > row[i]:
+                        row[i] = share
+                suffix.append(row)
+            suffix.reverse()
+            suffixes.append(suffix)
+            drops.append([[(i, suffix[k][i] - suffix[k + 1][i]) for i, _ in options[k][1]
+                           if suffix[k][i] > suffix[k + 1][i]] for k in range(count)])
+        (suffix_a, suffix_b), (drop_a, drop_b) = suffixes, drops
+
+        state = list(start)
+        best = [-1, None]
+        chosen = []
+        seen = {}  # (k, trạng thái) -> tiền tiết kiệm lớn nhất đã đạt tại đó
+        truncated = [False]
+
+        def search(k, saved, bound_a, bound_b):
+            # bound_a, bound_b: cận trên phần tiết kiệm còn lại tại (k, state)
+            while k < count and any(state[i] < q for i, q in options[k][1]):
+                bound_a -= sum(d * state[i] for i, d in drop_a[k])  # combo không còn đủ món
+                bound_b -= sum(d * state[i] for i, d in drop_b[k])
+                k += 1
+            if k == count:
+                if saved > best[0]:
+                    best[0], best[1] = saved, list(chosen)
+                return
+            if saved + min(bound_a, bound_b) <= best[0]:
+                return
+            if budget[0] <= 0:
+                truncated[0] = True
+                if best[1] is not None:
+                    return
+            budget[0] -= 1
+            key = (k, tuple(state))
+            if seen.get(key, -1) >= saved:
+                return
+            seen[key] = saved
+            rule, parts, saving, _ = options[k]
+            next_a = bound_a - sum(d * state[i] for i, d in drop_a[k])
+            next_b = bound_b - sum(d * state[i] for i, d in drop_b[k])
+            row_a, row_b = suffix_a[k + 1], suffix_b[k + 1]
+            most = min(state[i] // q for i, q in parts)
+            # Hết budget mà chưa có lời giải: chỉ đi tiếp nhánh tham lam
+            for times in range(most, -1 if budget[0] > 0 else most - 1, -1):
+                for i, q in parts:
+                    state[i] -= q * times
+                chosen.extend([rule] * times)
+                search(k + 1, saved + saving * times,
+                       next_a - sum(row_a[i] * q for i, q in parts) * times,
+                       next_b - sum(row_b[i] * q for i, q in parts) * times)
+                del chosen[len(chosen) - times:]
+                for i, q in parts:
+                    state[i] += q * times
+
+        search(0, 0, sum(w * q for w, q in zip(suffix_a[0], start)),
+               sum(w * q for w, q in zip(suffix_b[0], start)))
+        used = {}
+        for rule in best[1]:
+            for m, q in rule.items.items():
+                used[m] = used.get(m, 0) + q
+        choices = [(rule.label, rule.price) for rule in best[1]]
+        for m in ids:
+            choices += [(self._name(m), self.prices[m])] * (quantities[m] - used.get(m, 0))
+        return choices, not truncated[0]
+
+    def _name(self, mon_an_id):
+        return self.names.get(mon_an_id, f"Món {mon_an_id}")
+
+
+def load_rules(menu=None):
+    """ Đổi COMBOS theo tên món sang ComboRule theo mon_an_id; bỏ combo thiếu món trong menu """
+    menu = database.get_mon_an_by_name() if menu is None else menu
+    rules = []
+    for code, label, items, price in COMBOS:
+        if all(name in menu for name in items):
+            rules.append(ComboRule(code, label, {menu[name][0]: qty for name, qty in items.items()}, price))
+    return rules
+
+
+_pricer = None
+_pricer_version = None  # menu_version lúc dựng _pricer
+
+
+def get_pricer():
+    """ ComboPricer dùng chung, dựng từ bảng mon_an; dựng lại khi menu_version đổi (giá món, món mới) """
+    global _pricer, _pricer_version
+    version = cart_service.prices()[0]
+    if _pricer is None or version != _pricer_version:
+        menu = database.get_mon_an_by_name()
+        prices = {mon_an_id: gia for mon_an_id, gia in menu.values()}
+        names = {mon_an_id: name for name, (mon_an_id, _) in menu.items()}
+        _pricer = ComboPricer(load_rules(menu), prices, names)
+        _pricer_version = version
+    return _pricer
+
+
+def benchmark(cart_items=50, rule_count=100, carts=200, seed=1):
+    """
+    Thời gian tính giá giỏ cart_items món với rule_count combo (món chính + món phụ + nước)
+    ngẫu nhiên, không dùng cache; so tiền tiết kiệm với lời giải tìm kiếm không giới hạn.
+    Lần đo gần nhất: chậm nhất 7.34 ms (vượt mục tiêu 5 ms), 86/200 giỏ chứng minh được tối ưu.
+    """
+    rng = random.Random(seed)
+    mains, sides, drinks = range(1, 31), range(31, 46), range(46, 61)
+    prices = {m: rng.randrange(30, 50) * 1000 for m in mains}
+    prices.update({m: rng.randrange(15, 30) * 1000 for m in sides})
+    prices.update({m: rng.randrange(10, 16) * 1000 for m in drinks})
+    triples = set()
+    while len(triples) < rule_count:
+        triples.add((rng.choice(mains), rng.choice(sides), rng.choice(drinks)))
+    rules = []
+    for n, triple in enumerate(sorted(triples)):
+        full = sum(prices[m] for m in triple)
+        rules.append(ComboRule(f"r{n}", f"Combo {n}", {m: 1 for m in triple},
+                               int(full * rng.uniform(0.8, 0.92)) // 1000 * 1000))
+    pricer = ComboPricer(rules, prices, cache_size=0)
+    exact = ComboPricer(rules, prices, cache_size=0, max_nodes=10 ** 9)
+    times, optimal, savings, best_savings = [], 0, 0, 0
+    for _ in range(carts):
+        cart = {}
+        for _ in range(cart_items):
+            m = rng.choice(sorted(prices))
+            cart[m] = cart.get(m, 0) + 1
+        start = time.perf_counter()
+        quote = pricer.price(cart)
+        times.append((time.perf_counter() - start) * 1000)
+        optimal += quote.optimal
+        savings += quote.savings
+        best_savings += quote.savings if quote.optimal else exact.price(cart).savings
+    times.sort()
+    print(f"{carts} giỏ {cart_items} món, {len(pricer.rules)} combo: "
+          f"trung bình {sum(times) / carts:.2f} ms, p95 {times[int(carts * 0.95)]:.2f} ms, "
+          f"chậm nhất {times[-1]:.2f} ms; tối ưu chứng minh được {optimal}/{carts}, "
+          f"đạt {savings / best_savings:.2%} mức tiết kiệm tối ưu")
+
+
+if __name__ == "__main__":
+    benchmark()
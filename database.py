@@ -1,6 +1,30 @@
+import os
 import sqlite3
+import time
 from sqlite3 import Error
 
+import passwords
+import storage
+
+# Khóa chống đặt trùng (idempotency key) được giữ trong 24 giờ
+IDEMPOTENCY_TTL = 24 * 3600
+
+# Món lẻ có trong các combo (xem combos.py)
+COMBO_MON_AN = [
+    ("Gà rán truyền thống", 35000, ":/pic/ga_ran_truyen_thong.jpg"),
+    ("Gà rán cay", 38000, ":/pic/ga_ran_cay.png"),
+    ("Gà nướng BBQ", 42000, ":/pic/ga_nuong_bbq.jpg"),
+    ("Gà viên", 30000, ":/pic/ga_vien.jpg"),
+    ("Hamburger gà", 40000, ":/pic/hamburger_ga.jpg"),
+    ("Hamburger phô mai", 45000, ":/pic/hamburger_ga_pho_mai.jpg"),
+    ("Khoai tây chiên vừa", 20000, ":/pic/khoai_tay_vua.png"),
+    ("Khoai tây chiên lớn", 28000, ":/pic/khoai_tay_lon.png"),
+    ("Khoai lắc phô mai", 25000, ":/pic/khoai_tay_lac.jpg"),
+    ("Pepsi", 12000, ":/pic/pepsi.png"),
+    ("Coca Cola", 12000, ":/pic/cocacola.jpg"),
+    ("7 UP", 12000, ":/pic/7up.jpg"),
+]
+
 def create_connection():
     conn = None
     try:
@@ -10,8 +34,16 @@ def create_connection():
         print(e)
     return conn
 
-def create_tables():
-    conn = create_connection()
+# Món ăn và giỏ hàng đi qua storage.Store (backend theo FOODIE_STORAGE, xem storage.py).
+# Khóa theo đường dẫn tuyệt đối: mỗi thư mục làm việc có kết nối riêng, như create_connection
+def get_store():
+    return storage.get_store(path=os.path.abspath('foodie.db'))
+
+# conn: tạo bảng trên một kết nối có sẵn (ví dụ database trong bộ nhớ của storage.FakeBackend)
+def create_tables(conn=None):
+    own_connection = conn is None
+    if own_connection:
+        conn = create_connection()
     if conn is not None:
         try:
             c = conn.cursor()
@@ -23,7 +55,12 @@ def create_tables():
                           password TEXT NOT NULL,
                           ho TEXT NOT NULL,
                           ten TEXT NOT NULL,
-                          sdt TEXT NOT NULL)''')
+                          sdt TEXT NOT NULL,
+                          is_admin INTEGER NOT NULL DEFAULT 0)''')
+            # Người dùng tạo trước khi có cột is_admin (quyền quản lý: màn hình bếp, xác nhận thanh toán tay)
+            c.execute("PRAGMA table_info(users)")
+            if "is_admin" not in [col[1] for col in c.fetchall()]:
+                c.execute("ALTER TABLE users ADD COLUMN is_admin INTEGER NOT NULL DEFAULT 0")
             
             # Bảng món ăn
             c.execute('''CREATE TABLE IF NOT EXISTS mon_an
@@ -41,6 +78,111 @@ def create_tables():
                           FOREIGN KEY (user_id) REFERENCES users (id),
                           FOREIGN KEY (mon_an_id) REFERENCES mon_an (id))''')
             
+            # Số thứ tự thay đổi cuối cùng của giỏ hàng đã ghi xuống (xem cart_service.py)
+            c.execute('''CREATE TABLE IF NOT EXISTS gio_hang_flush
+                         (user_id INTEGER PRIMARY KEY,
+                          last_seq INTEGER NOT NULL)''')
+            
+            # Tổng giỏ hàng (số món, tổng tiền) được trigger cập nhật mỗi khi gio_hang thay đổi
+            c.execute('''CREATE TABLE IF NOT EXISTS gio_hang_tong
+                         (user_id INTEGER PRIMARY KEY,
+                          so_mon INTEGER NOT NULL DEFAULT 0,
+                          tong_tien INTEGER NOT NULL DEFAULT 0)''')
+            c.execute("SELECT COUNT(*) FROM gio_hang_tong")
+            if c.fetchone()[0] == 0:
+                # Tính lại tổng cho giỏ hàng đã có trước khi có bảng gio_hang_tong
+                c.execute('''INSERT INTO gio_hang_tong (user_id, so_mon, tong_tien)
+                             SELECT g.user_id, SUM(g.so_luong), SUM(g.so_luong * m.gia)
+                             FROM gio_hang g JOIN mon_an m ON g.mon_an_id = m.id
+                             GROUP BY g.user_id''')
+            c.execute('''CREATE TRIGGER IF NOT EXISTS gio_hang_tong_insert AFTER INSERT ON gio_hang
+                         BEGIN
+                             INSERT OR IGNORE INTO gio_hang_tong (user_id) VALUES (NEW.user_id);
+                             UPDATE gio_hang_tong
+                             SET so_mon = so_mon + NEW.so_luong,
+                                 tong_tien = tong_tien + NEW.so_luong * (SELECT gia FROM mon_an WHERE id = NEW.mon_an_id)
+                             WHERE user_id = NEW.user_id;
+                         END''')
+            c.execute('''CREATE TRIGGER IF NOT EXISTS gio_hang_tong_delete AFTER DELETE ON gio_hang
+                         BEGIN
+                             UPDATE gio_hang_tong
+                             SET so_mon = so_mon - OLD.so_luong,
+                                 tong_tien = tong_tien - OLD.so_luong * (SELECT gia FROM mon_an WHERE id = OLD.mon_an_id)
+                             WHERE user_id = OLD.user_id;
+                         END''')
+            c.execute('''CREATE TRIGGER IF NOT EXISTS gio_hang_tong_update
+                         AFTER UPDATE OF user_id, mon_an_id, so_luong ON gio_hang
+                         BEGIN
+                             UPDATE gio_hang_tong
+                             SET so_mon = so_mon - OLD.so_luong,
+                                 tong_tien = tong_tien - OLD.so_luong * (SELECT gia FROM mon_an WHERE id = OLD.mon_an_id)
+                             WHERE user_id = OLD.user_id;
+                             INSERT OR IGNORE INTO gio_hang_tong (user_id) VALUES (NEW.user_id);
+                             UPDATE gio_hang_tong
+                             SET so_mon = so_mon + NEW.so_luong,
+                                 tong_tien = tong_tien + NEW.so_luong * (SELECT gia FROM mon_an WHERE id = NEW.mon_an_id)
+                             WHERE user_id = NEW.user_id;
+                         END''')
+            # Bảng đơn hàng: giỏ hàng được chuyển thành đơn khi xác nhận (place_order)
+            c.execute('''CREATE TABLE IF NOT EXISTS orders
+                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                          user_id INTEGER NOT NULL,
+                          table_no INTEGER NOT NULL,
+                          payment_method TEXT NOT NULL,
+                          total INTEGER NOT NULL DEFAULT 0,
+                          status TEXT NOT NULL DEFAULT 'cho_xu_ly',
+                          created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                          FOREIGN KEY (user_id) REFERENCES users (id))''')
+            c.execute('''CREATE TABLE IF NOT EXISTS order_items
+                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                          order_id INTEGER NOT NULL,
+                          mon_an_id INTEGER NOT NULL,
+                          so_luong INTEGER NOT NULL,
+                          gia INTEGER NOT NULL,
+                          FOREIGN KEY (order_id) REFERENCES orders (id),
+                          FOREIGN KEY (mon_an_id) REFERENCES mon_an (id))''')
+            c.execute("CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items (order_id)")
+            # Đơn tạo trước khi có cột paid
+            c.execute("PRAGMA table_info(orders)")
+            if "paid" not in [col[1] for col in c.fetchall()]:
+                c.execute("ALTER TABLE orders ADD COLUMN paid INTEGER NOT NULL DEFAULT 0")
+            # Giao dịch chuyển khoản đã nhận; transaction_id là khóa chính để không ghi trùng
+            c.execute('''CREATE TABLE IF NOT EXISTS payments
+                         (transaction_id TEXT PRIMARY KEY,
+                          order_id INTEGER NOT NULL,
+                          amount INTEGER NOT NULL,
+                          received_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                          FOREIGN KEY (order_id) REFERENCES orders (id))''')
+            c.execute("CREATE INDEX IF NOT EXISTS idx_orders_table_status ON orders (table_no, status)")
+            # Khóa của mỗi lần bấm xác nhận -> đơn đã tạo, để bấm đúp/thử lại không tạo đơn mới
+            c.execute('''CREATE TABLE IF NOT EXISTS order_requests
+                         (request_key TEXT PRIMARY KEY,
+                          order_id INTEGER NOT NULL,
+                          created_at REAL NOT NULL,
+                          FOREIGN KEY (order_id) REFERENCES orders (id))''')
+            c.execute("CREATE INDEX IF NOT EXISTS idx_order_requests_created ON order_requests (created_at)")
+            
+            # Đổi giá món ăn thì cập nhật tổng của các giỏ đang có món đó
+            c.execute('''CREATE TRIGGER IF NOT EXISTS gio_hang_tong_gia AFTER UPDATE OF gia ON mon_an
+                         BEGIN
+                             UPDATE gio_hang_tong
+                             SET tong_tien = tong_tien + (NEW.gia - OLD.gia) *
+                                 (SELECT SUM(so_luong) FROM gio_hang
+                                  WHERE gio_hang.user_id = gio_hang_tong.user_id AND mon_an_id = NEW.id)
+                             WHERE user_id IN (SELECT user_id FROM gio_hang WHERE mon_an_id = NEW.id);
+                         END''')
+            
+            # Phiên bản thực đơn, tăng mỗi khi mon_an thay đổi; file menu_snapshot.bin cũ hơn thì được xuất lại
+            c.execute('''CREATE TABLE IF NOT EXISTS menu_version
+                         (id INTEGER PRIMARY KEY CHECK (id = 1),
+                          version INTEGER NOT NULL DEFAULT 0)''')
+            c.execute("INSERT OR IGNORE INTO menu_version (id, version) VALUES (1, 0)")
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                c.execute(f'''CREATE TRIGGER IF NOT EXISTS menu_version_{event.lower()} AFTER {event} ON mon_an
+                              BEGIN
+                                  UPDATE menu_version SET version = version + 1 WHERE id = 1;
+                              END''')
+            
             conn.commit()
             
             # Thêm dữ liệu mẫu nếu bảng món ăn trống
@@ -65,11 +207,20 @@ def create_tables():
                 ]
                 c.executemany("INSERT INTO mon_an (ten_mon, gia, hinh_anh) VALUES (?, ?, ?)", mon_an_data)
                 conn.commit()
+            
+            # Các món lẻ tạo nên combo1..combo5 (page_3, page_4), cần có để tính giá combo
+            c.execute("SELECT ten_mon FROM mon_an")
+            existing = {row[0] for row in c.fetchall()}
+            combo_mon_an = [row for row in COMBO_MON_AN if row[0] not in existing]
+            if combo_mon_an:
+                c.executemany("INSERT INTO mon_an (ten_mon, gia, hinh_anh) VALUES (?, ?, ?)", combo_mon_an)
+                conn.commit()
                 
         except Error as e:
             print(e)
         finally:
-            conn.close()
+            if own_connection:
+                conn.close()
 
 def register_user(username, password, ho, ten, sdt):
     conn = create_connection()
@@ -77,7 +228,7 @@ def register_user(username, password, ho, ten, sdt):
         try:
             c = conn.cursor()
             c.execute("INSERT INTO users (username, password, ho, ten, sdt) VALUES (?, ?, ?, ?, ?)",
-                      (username, password, ho, ten, sdt))
+                      (username, passwords.hash_password(password), ho, ten, sdt))
             conn.commit()
             return True
         except Error as e:
@@ -87,14 +238,39 @@ def register_user(username, password, ho, ten, sdt):
             conn.close()
     return False
 
+# Cấp hoặc thu quyền quản lý; người tự đăng ký luôn bắt đầu không có quyền này
+def set_admin(username, is_admin=True):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("UPDATE users SET is_admin=? WHERE username=?", (int(bool(is_admin)), username))
+            conn.commit()
+            return c.rowcount > 0
+        except Error as e:
+            print(e)
+            return False
+        finally:
+            conn.close()
+    return False
+
+# Đăng nhập: trả về (id, ho, ten, is_admin) hoặc None. Mật khẩu cũ (chữ thường hoặc ít vòng băm)
+# được băm lại với cấu hình hiện tại sau khi đăng nhập đúng.
+# Mỗi lần kiểm tra tốn vài chục ms (xem passwords.py) - giao diện nên gọi qua auth.login_async
 def login_user(username, password):
     conn = create_connection()
     if conn is not None:
         try:
             c = conn.cursor()
-            c.execute("SELECT id, ho, ten FROM users WHERE username=? AND password=?", (username, password))
+            c.execute("SELECT id, ho, ten, password, is_admin FROM users WHERE username=?", (username,))
             user = c.fetchone()
-            return user if user else None
+            if user is None or not passwords.verify_password(password, user[3]):
+                return None
+            if passwords.needs_rehash(user[3]):
+                c.execute("UPDATE users SET password=? WHERE id=? AND password=?",
+                          (passwords.hash_password(password), user[0], user[3]))
+                conn.commit()
+            return user[0], user[1], user[2], bool(user[4])
         except Error as e:
             print(e)
             return None
@@ -103,39 +279,161 @@ def login_user(username, password):
     return None
 
 def get_mon_an(page=1, items_per_page=8):
+    try:
+        return get_store().get_mon_an(page, items_per_page)
+    except storage.StorageError as e:
+        print(e)
+        return []
+
+def add_to_cart(user_id, mon_an_id):
+    # Có rồi thì tăng số lượng lên 1, chưa có thì thêm mới (một transaction, xem Store.add_to_cart)
+    try:
+        return get_store().add_to_cart(user_id, mon_an_id)
+    except storage.StorageError as e:
+        print(e)
+        return False
+
+# Ghi một lô thay đổi số lượng {mon_an_id: delta} vào gio_hang trong một transaction
+def apply_cart_changes(user_id, changes, last_seq):
     conn = create_connection()
     if conn is not None:
         try:
             c = conn.cursor()
-            offset = (page - 1) * items_per_page
-            c.execute("SELECT * FROM mon_an LIMIT ? OFFSET ?", (items_per_page, offset))
-            return c.fetchall()
+            c.execute("SELECT last_seq FROM gio_hang_flush WHERE user_id=?", (user_id,))
+            row = c.fetchone()
+            if row and row[0] >= last_seq:
+                # Lô này đã được ghi trước đó (phát lại journal sau khi bị tắt đột ngột)
+                return True
+            for mon_an_id, delta in changes.items():
+                c.execute("UPDATE gio_hang SET so_luong = so_luong + ? WHERE user_id=? AND mon_an_id=?",
+                          (delta, user_id, mon_an_id))
+                if c.rowcount == 0 and delta > 0:
+                    c.execute("INSERT INTO gio_hang (user_id, mon_an_id, so_luong) VALUES (?, ?, ?)",
+                              (user_id, mon_an_id, delta))
+            c.execute("DELETE FROM gio_hang WHERE user_id=? AND so_luong <= 0", (user_id,))
+            c.execute("INSERT OR REPLACE INTO gio_hang_flush (user_id, last_seq) VALUES (?, ?)",
+                      (user_id, last_seq))
+            conn.commit()
+            return True
         except Error as e:
             print(e)
-            return []
+            conn.rollback()
+            return False
         finally:
             conn.close()
-    return []
+    return False
 
-def add_to_cart(user_id, mon_an_id):
+# Chuyển giỏ hàng thành đơn hàng trong một transaction, trả về id đơn (None nếu giỏ trống).
+# Lỗi SQLite (ví dụ database is locked) được ném lại để không bị nhầm với giỏ trống.
+# Gọi lại với cùng request_key trả về đơn đã tạo thay vì tạo đơn mới.
+# discount là tiền giảm nhờ ghép combo (xem combos.py), trừ vào tổng đơn
+def place_order(user_id, table_no, payment_method, request_key=None, discount=0):
     conn = create_connection()
     if conn is not None:
         try:
             c = conn.cursor()
-            # Kiểm tra xem món đã có trong giỏ hàng chưa
-            c.execute("SELECT id, so_luong FROM gio_hang WHERE user_id=? AND mon_an_id=?", (user_id, mon_an_id))
-            item = c.fetchone()
-            
-            if item:
-                # Nếu có rồi thì tăng số lượng lên 1
-                new_quantity = item[1] + 1
-                c.execute("UPDATE gio_hang SET so_luong=? WHERE id=?", (new_quantity, item[0]))
-            else:
-                # Nếu chưa có thì thêm mới
-                c.execute("INSERT INTO gio_hang (user_id, mon_an_id) VALUES (?, ?)", (user_id, mon_an_id))
-            
+            # IMMEDIATE: giữ khóa ghi ngay từ đầu để các bàn đặt cùng lúc xếp hàng thay vì lỗi giữa chừng
+            c.execute("BEGIN IMMEDIATE")
+            if request_key is not None:
+                c.execute("SELECT order_id FROM order_requests WHERE request_key=? AND created_at > ?",
+                          (request_key, time.time() - IDEMPOTENCY_TTL))
+                row = c.fetchone()
+                if row is not None:
+                    conn.rollback()
+                    return row[0]
+            c.execute("SELECT COUNT(*) FROM gio_hang WHERE user_id=? AND so_luong > 0", (user_id,))
+            if c.fetchone()[0] == 0:
+                conn.rollback()
+                return None
+            c.execute("INSERT INTO orders (user_id, table_no, payment_method) VALUES (?, ?, ?)",
+                      (user_id, table_no, payment_method))
+            order_id = c.lastrowid
+            c.execute('''INSERT INTO order_items (order_id, mon_an_id, so_luong, gia)
+                         SELECT ?, g.mon_an_id, SUM(g.so_luong), m.gia
+                         FROM gio_hang g JOIN mon_an m ON g.mon_an_id = m.id
+                         WHERE g.user_id=? AND g.so_luong > 0
+                         GROUP BY g.mon_an_id''', (order_id, user_id))
+            c.execute('''UPDATE orders SET total =
+                             MAX((SELECT SUM(so_luong * gia) FROM order_items WHERE order_id=?) - ?, 0)
+                         WHERE id=?''', (order_id, discount, order_id))
+            c.execute("DELETE FROM gio_hang WHERE user_id=?", (user_id,))
+            if request_key is not None:
+                c.execute("INSERT OR REPLACE INTO order_requests (request_key, order_id, created_at) VALUES (?, ?, ?)",
+                          (request_key, order_id, time.time()))
             conn.commit()
-            return True
+            return order_id
+        except Error as e:
+            print(e)
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    raise Error("Không mở được foodie.db")
+
+# Đơn đã được tạo với request_key (None nếu chưa có hoặc khóa đã hết hạn)
+def get_order_for_request(request_key):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("SELECT order_id FROM order_requests WHERE request_key=? AND created_at > ?",
+                      (request_key, time.time() - IDEMPOTENCY_TTL))
+            row = c.fetchone()
+            return row[0] if row else None
+        except Error as e:
+            print(e)
+            return None
+        finally:
+            conn.close()
+    return None
+
+# Xóa các khóa chống đặt trùng đã hết hạn, trả về số dòng đã xóa
+def purge_order_requests(ttl=IDEMPOTENCY_TTL):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("DELETE FROM order_requests WHERE created_at <= ?", (time.time() - ttl,))
+            conn.commit()
+            return c.rowcount
+        except Error as e:
+            print(e)
+            return 0
+        finally:
+            conn.close()
+    return 0
+
+# Thông tin đơn hàng: (id, user_id, table_no, payment_method, total, status, created_at) và các món
+def get_order(order_id):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute('''SELECT id, user_id, table_no, payment_method, total, status, created_at
+                         FROM orders WHERE id=?''', (order_id,))
+            order = c.fetchone()
+            if order is None:
+                return None, []
+            c.execute('''SELECT o.mon_an_id, m.ten_mon, o.gia, o.so_luong, o.gia * o.so_luong
+                         FROM order_items o JOIN mon_an m ON o.mon_an_id = m.id
+                         WHERE o.order_id=?''', (order_id,))
+            return order, c.fetchall()
+        except Error as e:
+            print(e)
+            return None, []
+        finally:
+            conn.close()
+    return None, []
+
+# Đổi trạng thái đơn hàng (cho_xu_ly, dang_lam, da_xong, da_thanh_toan, ...)
+def set_order_status(order_id, status):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("UPDATE orders SET status=? WHERE id=?", (status, order_id))
+            conn.commit()
+            return c.rowcount > 0
         except Error as e:
             print(e)
             return False
@@ -143,15 +441,34 @@ def add_to_cart(user_id, mon_an_id):
             conn.close()
     return False
 
-def get_cart_items(user_id):
+# Các đơn chưa xong của một bàn (hoặc mọi bàn nếu table_no là None), theo thứ tự đặt
+def get_open_orders(table_no=None):
     conn = create_connection()
     if conn is not None:
         try:
             c = conn.cursor()
-            c.execute('''SELECT m.id, m.ten_mon, m.gia, g.so_luong, m.gia * g.so_luong as thanh_tien 
-                         FROM gio_hang g 
-                         JOIN mon_an m ON g.mon_an_id = m.id 
-                         WHERE g.user_id=?''', (user_id,))
+            query = '''SELECT id, user_id, table_no, payment_method, total, status, created_at
+                       FROM orders WHERE status NOT IN ('da_xong', 'da_huy')'''
+            if table_no is None:
+                c.execute(query + " ORDER BY id")
+            else:
+                c.execute(query + " AND table_no=? ORDER BY id", (table_no,))
+            return c.fetchall()
+        except Error as e:
+            print(e)
+            return []
+        finally:
+            conn.close()
+    return []
+
+# Các đơn chưa thanh toán theo phương thức: [(id, table_no, total), ...]
+def get_unpaid_orders(payment_method):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute('''SELECT id, table_no, total FROM orders
+                         WHERE paid = 0 AND payment_method = ? AND status != 'da_huy' ''', (payment_method,))
             return c.fetchall()
         except Error as e:
             print(e)
@@ -160,6 +477,153 @@ def get_cart_items(user_id):
             conn.close()
     return []
 
+# Ghi nhận một lô thanh toán [(transaction_id, order_id, amount), ...] trong một transaction.
+# Trả về danh sách order_id vừa được đánh dấu đã thanh toán (bỏ qua giao dịch trùng),
+# None nếu không ghi được (ví dụ database is locked) để người gọi thử lại
+def mark_orders_paid(payments):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            paid = []
+            for transaction_id, order_id, amount in payments:
+                c.execute("INSERT OR IGNORE INTO payments (transaction_id, order_id, amount) VALUES (?, ?, ?)",
+                          (transaction_id, order_id, amount))
+                if c.rowcount == 0:
+                    continue
+                c.execute("UPDATE orders SET paid = 1 WHERE id=? AND paid = 0", (order_id,))
+                if c.rowcount > 0:
+                    paid.append(order_id)
+            conn.commit()
+            return paid
+        except Error as e:
+            print(e)
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+    return None
+
+# Tổng giỏ hàng (so_mon, tong_tien) đọc từ gio_hang_tong, không cần JOIN lại cả giỏ
+def get_cart_total(user_id):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("SELECT so_mon, tong_tien FROM gio_hang_tong WHERE user_id=?", (user_id,))
+            row = c.fetchone()
+            return row if row else (0, 0)
+        except Error as e:
+            print(e)
+            return (0, 0)
+        finally:
+            conn.close()
+    return (0, 0)
+
+# Giá của mọi món ăn {id: gia}
+def get_mon_an_prices():
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("SELECT id, gia FROM mon_an")
+            return dict(c.fetchall())
+        except Error as e:
+            print(e)
+            return {}
+        finally:
+            conn.close()
+    return {}
+
+# Phiên bản hiện tại của thực đơn (xem menu_snapshot.py), None nếu lỗi
+def get_menu_version():
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("SELECT version FROM menu_version WHERE id = 1")
+            row = c.fetchone()
+            return row[0] if row else 0
+        except Error as e:
+            print(e)
+            return None
+        finally:
+            conn.close()
+    return None
+
+# Toàn bộ thực đơn theo id và phiên bản của nó, đọc trong cùng một transaction
+def get_menu_with_version():
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("BEGIN")
+            c.execute("SELECT version FROM menu_version WHERE id = 1")
+            row = c.fetchone()
+            c.execute("SELECT id, ten_mon, gia, hinh_anh FROM mon_an ORDER BY id")
+            return (row[0] if row else 0), c.fetchall()
+        except Error as e:
+            print(e)
+            return None, []
+        finally:
+            conn.close()
+    return None, []
+
+# {ten_mon: (id, gia)} của mọi món ăn
+def get_mon_an_by_name():
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("SELECT ten_mon, id, gia FROM mon_an")
+            return {ten_mon: (mon_an_id, gia) for ten_mon, mon_an_id, gia in c.fetchall()}
+        except Error as e:
+            print(e)
+            return {}
+        finally:
+            conn.close()
+    return {}
+
+# Số thứ tự thay đổi cuối cùng đã ghi vào gio_hang của người dùng (0 nếu chưa có)
+def get_cart_last_seq(user_id):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("SELECT last_seq FROM gio_hang_flush WHERE user_id=?", (user_id,))
+            row = c.fetchone()
+            return row[0] if row else 0
+        except Error as e:
+            print(e)
+            return 0
+        finally:
+            conn.close()
+    return 0
+
+# Trả về {mon_an_id: so_luong} của giỏ hàng
+def get_cart_quantities(user_id):
+    conn = create_connection()
+    if conn is not None:
+        try:
+            c = conn.cursor()
+            c.execute("SELECT mon_an_id, SUM(so_luong) FROM gio_hang WHERE user_id=? GROUP BY mon_an_id",
+                      (user_id,))
+            return dict(c.fetchall())
+        except Error as e:
+            print(e)
+            return {}
+        finally:
+            conn.close()
+    return {}
+
+def get_cart_items(user_id):
+    # (id, ten_mon, gia, so_luong, thanh_tien)
+    try:
+        return get_store().get_cart_items(user_id)
+    except storage.StorageError as e:
+        print(e)
+        return []
+
 def clear_cart(user_id):
     conn = create_connection()
     if conn is not None:
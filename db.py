@@ -1,18 +1,18 @@
 # db.py
-import sqlite3
+# Trước đây tạo bảng users riêng trong users.db; nay người dùng nằm trong foodie.db
+# (database.py). create_db giữ tên cũ để code đang gọi vẫn chạy: tạo các bảng của foodie.db
+# và chuyển người dùng còn trong users.db sang (xem migrate_users.py).
+import os
+
+import database
+import migrate_users
 
 def create_db():
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ho TEXT,
-            ten TEXT,
-            sdt TEXT,
-            username TEXT UNIQUE,
-            password TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    database.create_tables()
+    if os.path.exists(migrate_users.LEGACY_DB):
+        report = migrate_users.migrate()
+        print(report.summary())
+        if report.conflicts:
+            report.write_csv(migrate_users.REPORT_PATH)
+        # Đổi tên để lần sau không mở lại users.db
+        os.replace(migrate_users.LEGACY_DB, migrate_users.LEGACY_DB + ".migrated")
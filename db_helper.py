@@ -1,20 +1,11 @@
 # db_helper.py
-import pyodbc
+# Tìm món trên SQL Server của đồ án qua storage.ODBCBackend: kết nối lấy từ nhóm kết nối
+# dùng chung thay vì mở một kết nối mới mỗi lần tìm.
+import storage
 
 def search_food_names(keyword):
     try:
-        conn = pyodbc.connect(
-            "Driver={SQL Server};"
-            "Server=DESKTOP-XXXXXXX\\SQLEXPRESS;"   
-            "Database=DOAN;"                         
-            "Trusted_Connection=yes;"
-        )
-        cursor = conn.cursor()
-        query = "SELECT TenMonAn FROM MonAn WHERE TenMonAn LIKE ?"
-        cursor.execute(query, ('%' + keyword + '%',))
-        result = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return result
+        return storage.get_store("odbc").search_food_names(keyword)
     except Exception as e:
         print("Lỗi kết nối hoặc truy vấn:", e)
         return []
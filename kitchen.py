@@ -0,0 +1,351 @@
+# kitchen.py
+# Điều phối phiếu bếp cho các đơn hàng (orders.py).
+# Mỗi món trong đơn thành một phiếu, được đưa vào hàng đợi ưu tiên của trạm làm món đó
+# (chiên, nướng, nước, bếp chính). Độ ưu tiên dựa trên thời gian khách đã chờ, thời gian
+# làm món và mức ưu tiên của bàn: món lâu hơn phải bắt đầu sớm hơn để các món trong
+# cùng đơn xong cùng lúc. Khi một trạm lấy việc, các phiếu cùng món của nhiều đơn được
+# gộp thành một mẻ (ví dụ 5 "Gà rán cay" của 3 bàn).
+#   KitchenScheduler: phần lập lịch, không phụ thuộc asyncio
+#   KitchenService:   dịch vụ asyncio nhận đơn, phát cập nhật cho màn hình bếp
+#   get_service():    KitchenService dùng chung chạy trên luồng riêng, nhận đơn từ orders.get_service();
+#                     màn hình bếp là kitchen_view.py (màn "bep" của app_shell, launcher.py --kitchen)
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import threading
+import time
+
+import database
+import orders
+
+STATIONS = ("chien", "nuong", "nuoc", "bep")
+
+# Từ khóa trong tên món -> trạm; món không khớp đi về bếp chính
+STATION_KEYWORDS = (
+    ("nuoc", ("pepsi", "coca", "7up", "up ", "mirinda", "lipton", "milo", "nước", "trà", "sữa")),
+    ("nuong", ("nướng", "bbq")),
+    ("chien", ("rán", "chiên", "khoai", "viên", "popcorn", "không xương")),
+)
+
+# Thời gian làm món mặc định (giây) theo trạm
+PREP_SECONDS = {"chien": 420, "nuong": 600, "nuoc": 60, "bep": 480}
+# Thời gian mục tiêu từ lúc đặt đến lúc món ra (giây)
+TARGET_SECONDS = 900
+MAX_BATCH = 8
+
+
+def station_for(ten_mon):
+    """ Trạm làm món dựa trên tên món """
+    name = ten_mon.lower()
+    for station, keywords in STATION_KEYWORDS:
+        if any(keyword in name for keyword in keywords):
+            return station
+    return "bep"
+
+
+class Ticket:
+    __slots__ = ("id", "order_id", "table_no", "mon_an_id", "ten_mon", "so_luong",
+                 "station", "prep_seconds", "created_at", "priority", "status")
+
+    def __init__(self, ticket_id, order_id, table_no, mon_an_id, ten_mon, so_luong,
+                 station, prep_seconds, created_at, table_boost=0):
+        self.id = ticket_id
+        self.order_id = order_id
+        self.table_no = table_no
+        self.mon_an_id = mon_an_id
+        self.ten_mon = ten_mon
+        self.so_luong = so_luong
+        self.station = station
+        self.prep_seconds = prep_seconds
+        self.created_at = created_at
+        # Thời điểm muộn nhất nên bắt đầu làm; càng nhỏ càng gấp
+        self.priority = created_at + TARGET_SECONDS - prep_seconds - table_boost
+        self.status = "cho"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Batch:
+    def __init__(self, station, mon_an_id, ten_mon, tickets):
+        """ Một mẻ cùng món gồm nhiều phiếu của nhiều bàn """
+        self.station = station
+        self.mon_an_id = mon_an_id
+        self.ten_mon = ten_mon
+        self.tickets = tickets
+
+    @property
+    def quantity(self):
+        return sum(ticket.so_luong for ticket in self.tickets)
+
+    @property
+    def tables(self):
+        return sorted({ticket.table_no for ticket in self.tickets})
+
+    def as_dict(self):
+        return {"station": self.station, "mon_an_id": self.mon_an_id, "ten_mon": self.ten_mon,
+                "quantity": self.quantity, "tables": self.tables,
+                "tickets": [ticket.id for ticket in self.tickets]}
+
+
+class KitchenScheduler:
+    def __init__(self, max_batch=MAX_BATCH, prep_seconds=None):
+        """ Hàng đợi ưu tiên theo trạm, gộp phiếu cùng món khi lấy việc """
+        self.max_batch = max_batch
+        self.prep_seconds = dict(PREP_SECONDS, **(prep_seconds or {}))
+        self.table_boost = {}  # table_no -> số giây được ưu tiên thêm
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        # station -> heap (priority, seq, ticket); phiếu đã lấy được bỏ qua khi pop (lazy)
+        self._heaps = {station: [] for station in STATIONS}
+        # station -> mon_an_id -> {ticket_id: ticket} đang chờ
+        self._waiting = {station: {} for station in STATIONS}
+        self.tickets = {}  # ticket_id -> Ticket chưa xong
+        self._remaining = {}  # order_id -> số phiếu chưa xong
+
+    def add_order(self, order_id, table_no, items, created_at=None):
+        """ Tạo phiếu cho các món của đơn; items là [(mon_an_id, ten_mon, so_luong), ...] """
+        created_at = time.time() if created_at is None else created_at
+        boost = self.table_boost.get(table_no, 0)
+        tickets = []
+        for mon_an_id, ten_mon, so_luong in items:
+            station = station_for(ten_mon)
+            ticket = Ticket(next(self._ids), order_id, table_no, mon_an_id, ten_mon, so_luong,
+                            station, self.prep_seconds[station], created_at, boost)
+            self.tickets[ticket.id] = ticket
+            self._remaining[order_id] = self._remaining.get(order_id, 0) + 1
+            self._waiting[station].setdefault(mon_an_id, {})[ticket.id] = ticket
+            heapq.heappush(self._heaps[station], (ticket.priority, next(self._seq), ticket))
+            tickets.append(ticket)
+        return tickets
+
+    def pending(self, station=None):
+        """ Số phiếu đang chờ (của một trạm hoặc tất cả) """
+        stations = STATIONS if station is None else (station,)
+        return sum(len(group) for s in stations for group in self._waiting[s].values())
+
+    def next_batch(self, station):
+        """ Lấy mẻ tiếp theo của trạm: phiếu gấp nhất cùng các phiếu cùng món đang chờ """
+        heap = self._heaps[station]
+        while heap:
+            _, _, ticket = heapq.heappop(heap)
+            if ticket.status == "cho":
+                break
+        else:
+            return None
+        group = self._waiting[station][ticket.mon_an_id]
+        chosen = sorted(group.values(), key=lambda t: t.priority)[:self.max_batch]
+        for item in chosen:
+            item.status = "dang_lam"
+            del group[item.id]
+        if not group:
+            del self._waiting[station][ticket.mon_an_id]
+        return Batch(station, ticket.mon_an_id, ticket.ten_mon, chosen)
+
+    def complete(self, batch):
+        """ Đánh dấu mẻ đã xong; trả về các order_id mà mọi phiếu đều đã xong """
+        done_orders = []
+        for ticket in batch.tickets:
+            ticket.status = "xong"
+            self.tickets.pop(ticket.id, None)
+            self._remaining[ticket.order_id] -= 1
+            if self._remaining[ticket.order_id] == 0:
+                del self._remaining[ticket.order_id]
+                done_orders.append(ticket.order_id)
+        return sorted(done_orders)
+
+    def snapshot(self):
+        """ Danh sách phiếu đang chờ theo trạm, sắp theo độ ưu tiên (cho màn hình bếp) """
+        return {station: sorted((t.as_dict() for group in self._waiting[station].values()
+                                 for t in group.values()), key=lambda t: t["priority"])
+                for station in STATIONS}
+
+
+class KitchenService:
+    def __init__(self, scheduler=None):
+        """ Dịch vụ bếp chạy trên vòng lặp asyncio """
+        self.scheduler = scheduler or KitchenScheduler()
+        self.order_service = None
+        self._loop = None
+        self._incoming = None
+        self._work_ready = None
+        self._displays = []
+        self._listeners = []
+        self._started_orders = set()
+        # Một luồng ghi trạng thái: "dang_lam" luôn được ghi trước "da_xong" của cùng đơn
+        self._status_writer = concurrent.futures.ThreadPoolExecutor(max_workers=1,
+                                                                    thread_name_prefix="kitchen-status")
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._incoming = asyncio.Queue()
+        self._work_ready = asyncio.Condition()
+        self._task = asyncio.create_task(self._receive())
+
+    def submit_order_threadsafe(self, order):
+        """ Gọi từ luồng khác (ví dụ listener của OrderService) để đưa đơn vào bếp """
+        self._loop.call_soon_threadsafe(self._incoming.put_nowait, order)
+
+    def attach(self, order_service):
+        """ Nhận đơn mới từ orders.OrderService """
+        self.order_service = order_service
+
+        def listener(event, order):
+            if event == "placed":
+                self.submit_order_threadsafe(order)
+        order_service.subscribe(listener)
+
+    async def _receive(self):
+        while True:
+            order = await self._incoming.get()
+            if order["id"] in self.scheduler._remaining:
+                continue  # đã nhận (đơn nạp lại lúc khởi động trùng với sự kiện "placed")
+            items = order.get("items")
+            if items is None:
+                # Đọc món của đơn ngoài vòng lặp sự kiện để không chặn màn hình bếp
+                _, rows = await asyncio.to_thread(database.get_order, order["id"])
+                items = [(mon_an_id, ten_mon, so_luong) for mon_an_id, ten_mon, _, so_luong, _ in rows]
+            tickets = self.scheduler.add_order(order["id"], order["table_no"], items)
+            async with self._work_ready:
+                self._work_ready.notify_all()
+            self._publish({"event": "tickets", "tickets": [t.as_dict() for t in tickets]})
+
+    async def next_batch(self, station):
+        """ Chờ đến khi trạm có việc rồi trả về mẻ tiếp theo """
+        async with self._work_ready:
+            while True:
+                batch = self._take(station)
+                if batch is not None:
+                    return batch
+                await self._work_ready.wait()
+
+    def _take(self, station):
+        batch = self.scheduler.next_batch(station)
+        if batch is None:
+            return None
+        self._publish({"event": "started", "batch": batch.as_dict()})
+        # Đơn có món đầu tiên bắt đầu làm chuyển sang "dang_lam" (ghi database ngoài vòng lặp)
+        for ticket in batch.tickets:
+            if ticket.order_id not in self._started_orders:
+                self._started_orders.add(ticket.order_id)
+                self._loop.run_in_executor(self._status_writer, self._set_order_status,
+                                           ticket.order_id, ticket.table_no, "dang_lam")
+        return batch
+
+    def _set_order_status(self, order_id, table_no, status):
+        if self.order_service is not None:
+            self.order_service.set_status(order_id, table_no, status)
+
+    def complete(self, batch):
+        done_orders = self.scheduler.complete(batch)
+        self._started_orders.difference_update(done_orders)
+        # Đơn có phiếu cuối cùng vừa xong chuyển sang "da_xong" (bỏ khỏi hàng đợi của bàn)
+        tables = {ticket.order_id: ticket.table_no for ticket in batch.tickets}
+        for order_id in done_orders:
+            self._loop.run_in_executor(self._status_writer, self._set_order_status,
+                                       order_id, tables[order_id], "da_xong")
+        self._publish({"event": "done", "batch": batch.as_dict(), "orders_done": done_orders})
+        return done_orders
+
+    # --- Gọi từ luồng khác (màn hình bếp Qt) ---
+
+    def take_batch_threadsafe(self, station):
+        """ concurrent Future chứa mẻ tiếp theo của trạm, hoặc None nếu trạm không có việc """
+        async def take():
+            return self._take(station)
+        return asyncio.run_coroutine_threadsafe(take(), self._loop)
+
+    def complete_threadsafe(self, batch):
+        self._loop.call_soon_threadsafe(self.complete, batch)
+
+    def subscribe_threadsafe(self, listener):
+        """ listener(update) được gọi trên luồng của vòng lặp bếp, bắt đầu bằng ảnh chụp hiện tại """
+        def add():
+            self._listeners.append(listener)
+            listener({"event": "snapshot", "stations": self.scheduler.snapshot()})
+        self._loop.call_soon_threadsafe(add)
+
+    def unsubscribe_threadsafe(self, listener):
+        def remove():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        self._loop.call_soon_threadsafe(remove)
+
+    def display(self):
+        """ Hàng đợi cập nhật cho một màn hình bếp; bắt đầu bằng ảnh chụp hiện tại """
+        updates = asyncio.Queue()
+        updates.put_nowait({"event": "snapshot", "stations": self.scheduler.snapshot()})
+        self._displays.append(updates)
+        return updates
+
+    def _publish(self, update):
+        for updates in self._displays:
+            updates.put_nowait(update)
+        for listener in list(self._listeners):
+            try:
+                listener(update)
+            except RuntimeError:
+                # Màn hình Qt đã bị hủy trước khi kịp hủy đăng ký
+                self._listeners.remove(listener)
+
+
+_service = None
+
+
+def get_service():
+    """
+    KitchenService dùng chung: vòng lặp asyncio chạy trên luồng riêng, nhận đơn mới từ
+    orders.get_service() và nạp lại các đơn chưa làm khi khởi động.
+    """
+    global _service
+    if _service is None:
+        service = KitchenService()
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(service.start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="kitchen", daemon=True).start()
+        started.wait()
+        order_service = orders.get_service()
+        service.attach(order_service)
+        for order_id, _, table_no, _, _, status, _ in database.get_open_orders():
+            if status == "cho_xu_ly":
+                service.submit_order_threadsafe({"id": order_id, "table_no": table_no})
+        _service = service
+    return _service
+
+
+def benchmark(open_tickets=5000, dishes=40, tables=50):
+    """ Đo số phiếu thêm vào và số mẻ lấy ra mỗi giây với hàng nghìn phiếu đang mở """
+    scheduler = KitchenScheduler()
+    names = [f"Gà rán {i}" if i % 4 == 0 else f"Pepsi {i}" if i % 4 == 1 else
+             f"Gà nướng {i}" if i % 4 == 2 else f"Cơm {i}" for i in range(dishes)]
+    start = time.perf_counter()
+    now = time.time()
+    for n in range(open_tickets):
+        dish = n % dishes
+        scheduler.add_order(n, n % tables + 1, [(dish, names[dish], 1 + n % 3)], created_at=now + n * 0.01)
+    add_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batches = 0
+    for station in itertools.cycle(STATIONS):
+        if scheduler.pending() == 0:
+            break
+        batch = scheduler.next_batch(station)
+        if batch is not None:
+            scheduler.complete(batch)
+            batches += 1
+    pull_seconds = time.perf_counter() - start
+    print(f"add: {open_tickets / add_seconds:,.0f} phiếu/s, "
+          f"dispatch: {batches / pull_seconds:,.0f} mẻ/s ({batches} mẻ cho {open_tickets} phiếu)")
+
+
+if __name__ == "__main__":
+    benchmark()
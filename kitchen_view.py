@@ -0,0 +1,170 @@
+# kitchen_view.py
+# Màn hình bếp: mỗi trạm (chiên, nướng, nước, bếp chính) một cột gồm các phiếu đang chờ theo độ
+# ưu tiên và mẻ đang làm. KitchenService (kitchen.py) đẩy cập nhật từ luồng của vòng lặp bếp;
+# tín hiệu Qt chuyển chúng về luồng giao diện nên màn hình không hỏi lại database hay scheduler.
+import sys
+import time
+
+from qt_compat import QtCore, QtWidgets
+
+import kitchen
+
+STATION_LABELS = {"chien": "Chiên", "nuong": "Nướng", "nuoc": "Nước", "bep": "Bếp chính"}
+REFRESH_MS = 30 * 1000  # cập nhật thời gian chờ hiển thị
+
+
+class StationPanel(QtWidgets.QFrame):
+    def __init__(self, station, parent=None):
+        """ Cột của một trạm: phiếu đang chờ, mẻ đang làm và hai nút lấy mẻ / xong """
+        super().__init__(parent)
+        self.station = station
+        self.setStyleSheet("background-color: rgb(255, 245, 225);")
+        layout = QtWidgets.QVBoxLayout(self)
+        self.title = QtWidgets.QLabel(STATION_LABELS[station], self)
+        self.title.setStyleSheet("font-size: 18pt; font-weight: bold; color: #C62828;")
+        self.tickets = QtWidgets.QListWidget(self)
+        self.current = QtWidgets.QLabel("Chưa làm mẻ nào", self)
+        self.current.setWordWrap(True)
+        self.take_button = QtWidgets.QPushButton("Lấy mẻ tiếp", self)
+        self.done_button = QtWidgets.QPushButton("Xong", self)
+        self.done_button.setEnabled(False)
+        for widget in (self.title, self.tickets, self.current, self.take_button, self.done_button):
+            layout.addWidget(widget)
+
+
+class KitchenDisplay(QtWidgets.QWidget):
+    update_received = QtCore.pyqtSignal(object)
+    batch_taken = QtCore.pyqtSignal(str, object)
+
+    def __init__(self, service, parent=None):
+        """ Màn hình bếp theo dõi service (kitchen.KitchenService đang chạy, xem kitchen.get_service) """
+        super().__init__(parent)
+        self.service = service
+        self._waiting = {station: {} for station in kitchen.STATIONS}  # ticket_id -> phiếu (dict)
+        self._batches = {station: None for station in kitchen.STATIONS}  # mẻ màn hình này đang làm
+        layout = QtWidgets.QVBoxLayout(self)
+        columns = QtWidgets.QHBoxLayout()
+        self.panels = {}
+        for station in kitchen.STATIONS:
+            panel = self.panels[station] = StationPanel(station, self)
+            panel.take_button.clicked.connect(lambda checked=False, s=station: self.take_batch(s))
+            panel.done_button.clicked.connect(lambda checked=False, s=station: self.complete_batch(s))
+            columns.addWidget(panel)
+        layout.addLayout(columns)
+        self.status = QtWidgets.QLabel("", self)
+        layout.addWidget(self.status)
+
+        self.update_received.connect(self._apply)
+        self.batch_taken.connect(self._set_batch)
+        # Phát tín hiệu từ luồng bếp là an toàn: Qt chuyển lời gọi về luồng của widget
+        self._listener = self.update_received.emit
+        service.subscribe_threadsafe(self._listener)
+        self.destroyed.connect(lambda *args, s=service, l=self._listener: s.unsubscribe_threadsafe(l))
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self._refresh_all)
+        self._timer.start()
+
+    def _apply(self, update):
+        """ Áp dụng một cập nhật của KitchenService vào các cột """
+        event = update["event"]
+        if event == "snapshot":
+            for station, tickets in update["stations"].items():
+                self._waiting[station] = {ticket["id"]: ticket for ticket in tickets}
+            self._refresh_all()
+        elif event == "tickets":
+            stations = set()
+            for ticket in update["tickets"]:
+                self._waiting[ticket["station"]][ticket["id"]] = ticket
+                stations.add(ticket["station"])
+            for station in stations:
+                self._refresh(station)
+        elif event == "started":
+            batch = update["batch"]
+            for ticket_id in batch["tickets"]:
+                self._waiting[batch["station"]].pop(ticket_id, None)
+            self.panels[batch["station"]].current.setText(
+                f"Đang làm: {batch['quantity']} x {batch['ten_mon']} "
+                f"(bàn {', '.join(map(str, batch['tables']))})")
+            self._refresh(batch["station"])
+        elif event == "done":
+            batch = update["batch"]
+            self.panels[batch["station"]].current.setText("Chưa làm mẻ nào")
+            if update["orders_done"]:
+                self.status.setText(f"Đơn đã xong món: {', '.join(f'#{o}' for o in update['orders_done'])}")
+
+    def _refresh(self, station):
+        now = time.time()
+        panel = self.panels[station]
+        panel.tickets.clear()
+        panel.tickets.addItems([
+            f"{t['so_luong']} x {t['ten_mon']} - bàn {t['table_no']} (chờ {int(now - t['created_at']) // 60} phút)"
+            for t in sorted(self._waiting[station].values(), key=lambda t: t["priority"])])
+
+    def _refresh_all(self):
+        for station in kitchen.STATIONS:
+            self._refresh(station)
+
+    def take_batch(self, station):
+        """ Lấy mẻ tiếp theo của trạm; kết quả về qua batch_taken trên luồng giao diện """
+        if self._batches[station] is not None:
+            return
+        future = self.service.take_batch_threadsafe(station)
+        future.add_done_callback(lambda f, s=station: self.batch_taken.emit(
+            s, f.result() if f.exception() is None else None))
+
+    def _set_batch(self, station, batch):
+        self._batches[station] = batch
+        self.panels[station].done_button.setEnabled(batch is not None)
+        if batch is None:
+            self.status.setText(f"{STATION_LABELS[station]}: không có phiếu đang chờ")
+
+    def complete_batch(self, station):
+        batch = self._batches[station]
+        if batch is None:
+            return
+        self.service.complete_threadsafe(batch)
+        self._set_batch(station, None)
+        self.status.setText("")
+
+
+class Ui_Dialog(object):
+    """ Màn hình bếp trong app_shell, cùng giao diện setupUi với các màn hình pyuic5 """
+
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1220, 801)
+        layout = QtWidgets.QGridLayout(Dialog)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        header = QtWidgets.QLabel("Chicky - Bếp", Dialog)
+        header.setFixedHeight(120)
+        header.setStyleSheet("background-color: #D32F2F; color: white; font-size: 37pt;"
+                             " font-weight: bold; padding-left: 130px;")
+        layout.addWidget(header, 0, 0, 1, 2)
+
+        sidebar = QtWidgets.QWidget(Dialog)
+        sidebar.setFixedWidth(221)
+        sidebar.setStyleSheet("background-color: #C62828;")
+        side_layout = QtWidgets.QVBoxLayout(sidebar)
+        side_layout.setContentsMargins(0, 0, 0, 0)
+        self.mon_an = QtWidgets.QPushButton("🍰Menu món ăn ", sidebar)
+        self.mon_an.setObjectName("mon_an")
+        self.mon_an.setMinimumHeight(100)
+        side_layout.addWidget(self.mon_an)
+        side_layout.addStretch(1)
+        layout.addWidget(sidebar, 1, 0)
+
+        self.kitchen_display = KitchenDisplay(kitchen.get_service(), Dialog)
+        self.kitchen_display.setObjectName("kitchen_display")
+        layout.addWidget(self.kitchen_display, 1, 1)
+
+
+if __name__ == "__main__":
+    app = QtWidgets.QApplication(sys.argv)
+    display = KitchenDisplay(kitchen.get_service())
+    display.resize(1000, 680)
+    display.show()
+    sys.exit(app.exec())
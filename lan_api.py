@@ -0,0 +1,544 @@
+# lan_api.py
+# Dịch vụ HTTP/JSON trong mạng nội bộ để nhiều quầy dùng chung một database thực đơn / giỏ hàng.
+#   python lan_api.py serve [--host 127.0.0.1] [--port 8765]   (--host 0.0.0.0 để các quầy khác kết nối)
+#   python lan_api.py loadtest [http://host:8765] [--clients 32] [--seconds 5] [--path /menu]
+# Máy chủ chạy asyncio (không cần thư viện ngoài); truy vấn database chạy trên nhóm luồng, mỗi
+# luồng giữ một kết nối (storage.SQLiteBackend) thay vì mở kết nối mỗi yêu cầu.
+#   GET  /menu?page=&size=        trang thực đơn, có ETag (If-None-Match -> 304)
+#   GET  /search?q=               tên món chứa q
+#   GET  /cart?user_id=           giỏ hàng (cart_service) kèm giá combo
+#   POST /cart                    {"user_id", "mon_an_id", "quantity"}
+#   GET  /orders?table_no=        đơn đang mở của bàn
+#   POST /orders                  {"user_id", "table_no", "payment_method", "request_key"}
+#   GET  /products                toàn bộ sản phẩm mỹ phẩm, trả về dạng chunked theo lô
+#   POST /products, /products/update, /products/delete, /inventory, /checkout   (DataManager)
+#   POST /batch                   {"requests": [{"method", "path", "query", "body"}, ...]}
+#   POST /login                   {"username", "password"} -> {"token", "user"}
+# Mọi yêu cầu POST (trừ /login) cần "Authorization: Bearer <token>" của phiên còn hạn (auth.authorize);
+# /cart và /orders chỉ nhận user_id của chính phiên đó. Yêu cầu con trong /batch dùng token của lượt gộp.
+# Chế độ máy trạm mỏng: đặt FOODIE_API=http://<máy chủ>:8765 thì giao diện (menu_view, app_shell)
+# đọc thực đơn, thêm giỏ và đặt đơn qua ApiClient thay vì mở foodie.db trên máy.
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import auth
+import cart_service
+import combos
+import money
+import orders
+import storage
+
+HOST = "127.0.0.1"
+PORT = 8765
+DB_WORKERS = 8
+MENU_TTL = 5.0            # giây giữ một trang thực đơn đã dựng trước khi đọc lại database
+PRODUCT_CHUNK = 500       # số sản phẩm mỗi chunk của GET /products
+CLIENT_TIMEOUT = 10.0
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+               404: "Not Found", 409: "Conflict", 500: "Internal Server Error", 503: "Service Unavailable"}
+# Yêu cầu POST không cần token
+PUBLIC_POSTS = {"/login", "/batch"}
+
+
+class Response:
+    def __init__(self, status=200, body=b"", headers=None, stream=None):
+        """ body là bytes; stream (async iterator các bytes) thì gửi dạng chunked """
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.stream = stream
+
+
+def json_response(payload, status=200, headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return Response(status, body, dict(headers or {}, **{"Content-Type": "application/json; charset=utf-8"}))
+
+
+class ApiServer:
+    def __init__(self, host=HOST, port=PORT, foodie_path="foodie.db", cosmetics_path="cosmetics.db",
+                 workers=DB_WORKERS):
+        self.host = host
+        self.port = port
+        self.cosmetics_path = cosmetics_path
+        self.foodie = storage.Store(storage.SQLiteBackend(foodie_path))
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-db")
+        self._menu_cache = {}  # (page, size) -> (etag, body, hết hạn lúc)
+        self._data_manager = None
+        self.request_count = 0
+        self.routes = {
+            ("GET", "/menu"): self.menu,
+            ("GET", "/search"): self.search,
+            ("GET", "/cart"): self.get_cart,
+            ("POST", "/cart"): self.add_to_cart,
+            ("GET", "/orders"): self.get_orders,
+            ("POST", "/orders"): self.place_order,
+            ("GET", "/products"): self.products,
+            ("POST", "/products"): self.add_product,
+            ("POST", "/products/update"): self.update_product,
+            ("POST", "/products/delete"): self.delete_product,
+            ("POST", "/inventory"): self.update_inventory,
+            ("POST", "/checkout"): self.checkout,
+            ("POST", "/batch"): self.batch,
+            ("POST", "/login"): self.login,
+        }
+
+    async def _call(self, fn, *args):
+        """ Chạy hàm database trên nhóm luồng để không chặn vòng lặp sự kiện """
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    @staticmethod
+    def _user(headers):
+        """ user_id của token trong header Authorization, hoặc None """
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        return auth.authorize(token.strip()) if scheme.lower() == "bearer" and token else None
+
+    async def login(self, query, body, headers):
+        session = await asyncio.wrap_future(auth.login_async(body["username"], body["password"]))
+        if session is None:
+            return json_response({"error": "Sai tên đăng nhập hoặc mật khẩu"}, 401)
+        return json_response({"token": session.token,
+                              "user": [session.user_id, session.ho, session.ten, session.is_admin]})
+
+    def data_manager(self):
+        # main.py nạp Qt, chỉ import khi có yêu cầu mỹ phẩm
+        if self._data_manager is None:
+            import main
+            self._data_manager = main.DataManager()
+        return self._data_manager
+
+    # --- Thực đơn, giỏ hàng, đơn hàng (database.py) ---
+
+    async def menu(self, query, body, headers):
+        key = (int(query.get("page", 1)), int(query.get("size", 8)))
+        cached = self._menu_cache.get(key)
+        if cached is None or cached[2] <= time.monotonic():
+            rows = await self._call(self.foodie.get_mon_an, *key)
+            data = json.dumps(rows, ensure_ascii=False).encode("utf-8")
+            cached = self._menu_cache[key] = ('"%s"' % hashlib.sha1(data).hexdigest(), data,
+                                              time.monotonic() + MENU_TTL)
+        etag, data, _ = cached
+        if headers.get("if-none-match") == etag:
+            return Response(304, headers={"ETag": etag})
+        return Response(200, data, {"ETag": etag, "Content-Type": "application/json; charset=utf-8"})
+
+    async def search(self, query, body, headers):
+        return json_response(await self._call(self.foodie.search_food_names, query.get("q", "")))
+
+    def _cart_dict(self, user_id):
+        cart = cart_service.get_cart(user_id)
+        quote = combos.get_pricer().price(cart.items)
+        return {"items": sorted(cart.items.items()), "count": cart.count, "total": cart.total,
+                "combo_total": quote.total, "breakdown": quote.breakdown()}
+
+    async def get_cart(self, query, body, headers):
+        return json_response(await self._call(self._cart_dict, int(query["user_id"])))
+
+    async def add_to_cart(self, query, body, headers):
+        if int(body["user_id"]) != self._user(headers):
+            return json_response({"error": "Không được sửa giỏ hàng của người khác"}, 403)
+
+        def add():
+            cart = cart_service.get_cart(int(body["user_id"]))
+            cart.add(int(body["mon_an_id"]), int(body.get("quantity", 1)))
+            return {"count": cart.count, "total": cart.total}
+        return json_response(await self._call(add))
+
+    async def get_orders(self, query, body, headers):
+        return json_response(orders.get_service().orders_for_table(int(query["table_no"])))
+
+    async def place_order(self, query, body, headers):
+        if int(body["user_id"]) != self._user(headers):
+            return json_response({"error": "Không được đặt đơn cho người khác"}, 403)
+        future = orders.get_service().submit(int(body["user_id"]), int(body["table_no"]),
+                                             body["payment_method"], body.get("request_key"))
+        order = await asyncio.wrap_future(future)
+        if order is None:
+            return json_response({"order": None, "error": "Giỏ hàng trống"}, 409)
+        return json_response({"order": order})
+
+    # --- Mỹ phẩm (DataManager trong main.py) ---
+
+    def _product_chunks(self):
+        """ Các đoạn JSON của một mảng sản phẩm, mỗi đoạn PRODUCT_CHUNK dòng """
+        conn = sqlite3.connect(self.cosmetics_path, check_same_thread=False)
+        try:
+            cursor = conn.execute("""SELECT p.id, p.name, p.brand, p.category, p.price, p.sku, inv.quantity
+                                     FROM products p JOIN inventory inv ON p.id = inv.product_id
+                                     ORDER BY p.id""")
+            prefix = b"["
+            while True:
+                rows = cursor.fetchmany(PRODUCT_CHUNK)
+                if not rows:
+                    break
+                yield prefix + json.dumps(rows, ensure_ascii=False).encode("utf-8")[1:-1]
+                prefix = b","
+            yield b"[]" if prefix == b"[" else b"]"
+        finally:
+            conn.close()
+
+    async def products(self, query, body, headers):
+        chunks = self._product_chunks()
+        done = object()
+
+        async def stream():
+            # Mỗi lô được đọc trên nhóm luồng; lô sau chỉ được đọc khi lô trước đã gửi đi
+            while True:
+                chunk = await self._call(next, chunks, done)
+                if chunk is done:
+                    break
+                yield chunk
+        return Response(200, headers={"Content-Type": "application/json; charset=utf-8"}, stream=stream())
+
+    async def add_product(self, query, body, headers):
+        ok = await self._call(self.data_manager().add_product, body["name"], body.get("brand"),
+                              body.get("category"), money.to_minor(body["price"]), body.get("sku"),
+                              int(body.get("quantity", 0)))
+        return json_response({"ok": ok}, 200 if ok else 409)
+
+    async def update_product(self, query, body, headers):
+        ok = await self._call(self.data_manager().update_product, int(body["id"]), body["name"],
+                              body.get("brand"), body.get("category"), money.to_minor(body["price"]),
+                              body.get("sku"))
+        return json_response({"ok": ok}, 200 if ok else 409)
+
+    async def delete_product(self, query, body, headers):
+        ok = await self._call(self.data_manager().delete_product, int(body["id"]))
+        return json_response({"ok": ok}, 200 if ok else 409)
+
+    async def update_inventory(self, query, body, headers):
+        ok = await self._call(self.data_manager().update_inventory, int(body["product_id"]),
+                              int(body["quantity_change"]))
+        return json_response({"ok": ok}, 200 if ok else 409)
+
+    async def checkout(self, query, body, headers):
+        items = [(int(product_id), int(quantity)) for product_id, quantity in body["items"]]
+        sale_id = await self._call(self.data_manager().checkout, items, body.get("customer_id"),
+                                   body.get("request_key"))
+        return json_response({"sale_id": sale_id}, 200 if sale_id is not None else 409)
+
+    # --- Gộp nhiều yêu cầu trong một lượt ---
+
+    async def batch(self, query, body, headers):
+        """ Chạy lần lượt các yêu cầu con (theo thứ tự gửi) và trả về kết quả của từng yêu cầu """
+        results = []
+        for request in body["requests"]:
+            if request.get("path") == "/batch" or request.get("path") == "/products" and \
+                    request.get("method", "GET") == "GET":
+                results.append({"status": 400, "body": {"error": "Không gộp được yêu cầu này"}})
+                continue
+            response = await self.dispatch(request.get("method", "GET"), request["path"],
+                                           {k: str(v) for k, v in request.get("query", {}).items()},
+                                           request.get("body"),
+                                           {"authorization": headers.get("authorization", "")})
+            results.append({"status": response.status,
+                            "body": json.loads(response.body) if response.body else None})
+        return json_response({"responses": results})
+
+    # --- HTTP ---
+
+    async def dispatch(self, method, path, query, body, headers):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            return json_response({"error": f"Không có {method} {path}"}, 404)
+        self.request_count += 1
+        if method == "POST" and path not in PUBLIC_POSTS and self._user(headers) is None:
+            return json_response({"error": "Cần đăng nhập"}, 401)
+        try:
+            return await handler(query, body or {}, headers)
+        except (KeyError, ValueError, TypeError) as e:
+            return json_response({"error": f"Yêu cầu không hợp lệ: {e}"}, 400)
+        except orders.OrderQueueFull as e:
+            return json_response({"error": str(e) or "Hàng đợi đơn hàng đầy"}, 503)
+        except orders.OrderFailed as e:
+            # Lỗi ghi tạm thời (database bị khóa...): thử lại với cùng request_key là an toàn
+            return json_response({"error": str(e)}, 503)
+        except Exception as e:
+            print(f"Lỗi xử lý {method} {path}: {e}")
+            return json_response({"error": str(e)}, 500)
+
+    async def _handle(self, reader, writer):
+        """ Một kết nối keep-alive: đọc lần lượt từng yêu cầu HTTP/1.1 """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, _ = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                raw = await reader.readexactly(length) if length else b""
+                path, _, qs = target.partition("?")
+                query = {k: v[-1] for k, v in parse_qs(qs).items()}
+                try:
+                    body = json.loads(raw) if raw else None
+                    response = await self.dispatch(method, path, query, body, headers)
+                except json.JSONDecodeError:
+                    response = json_response({"error": "JSON không hợp lệ"}, 400)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._write(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _write(self, writer, response, keep_alive):
+        headers = dict(response.headers)
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        if response.stream is not None:
+            headers["Transfer-Encoding"] = "chunked"
+        else:
+            headers["Content-Length"] = str(len(response.body))
+        head = f"HTTP/1.1 {response.status} {STATUS_TEXT.get(response.status, '')}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1"))
+        if response.stream is None:
+            writer.write(response.body)
+        else:
+            async for chunk in response.stream:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"LAN API chạy tại http://{self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+    def start_in_thread(self):
+        """ Chạy máy chủ trên luồng nền (dùng khi đo tải / thử), trả về cổng đang nghe """
+        started = threading.Event()
+
+        async def run():
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = server.sockets[0].getsockname()[1]
+            started.set()
+            async with server:
+                await server.serve_forever()
+        threading.Thread(target=lambda: asyncio.run(run()), name="lan-api", daemon=True).start()
+        started.wait()
+        return self.port
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class ApiClient:
+    def __init__(self, base_url, timeout=CLIENT_TIMEOUT):
+        """ Máy trạm mỏng: cùng tên hàm với database.py / DataManager nhưng gọi qua LAN API.
+            Mỗi luồng giữ một kết nối keep-alive; trang thực đơn được nhớ theo ETag. """
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or PORT
+        self.timeout = timeout
+        self.token = None  # token phiên trên máy chủ (login), gửi kèm mọi yêu cầu
+        self._local = threading.local()
+        self._etags = {}  # target -> (etag, dữ liệu)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def _request(self, method, path, query=None, body=None, headers=None):
+        target = path + ("?" + urlencode(query) if query else "")
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = dict(headers or {})
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+        if self.token is not None:
+            headers["Authorization"] = f"Bearer {self.token}"
+        # Chỉ gửi lại khi chắc không ghi trùng: GET, hoặc yêu cầu mang request_key
+        retry = method == "GET" or (body or {}).get("request_key") is not None
+        for attempt in (0, 1):
+            conn = self._connection()
+            try:
+                conn.request(method, target, data, headers)
+                response = conn.getresponse()
+                payload = response.read()
+                return response.status, response, payload
+            except (ConnectionError, http.client.HTTPException):
+                # Máy chủ đã đóng kết nối keep-alive cũ: mở lại một lần
+                conn.close()
+                self._local.conn = None
+                if attempt or not retry:
+                    raise
+
+    def _json(self, method, path, query=None, body=None, ok=(200,)):
+        status, _, payload = self._request(method, path, query, body)
+        result = json.loads(payload) if payload else None
+        if status not in ok:
+            raise ApiError(status, (result or {}).get("error", ""))
+        return result
+
+    def get_mon_an(self, page=1, items_per_page=8):
+        target = f"/menu?page={page}&size={items_per_page}"
+        cached = self._etags.get(target)
+        status, response, payload = self._request(
+            "GET", target, headers={"If-None-Match": cached[0]} if cached else None)
+        if status == 304:
+            return cached[1]
+        if status != 200:
+            raise ApiError(status, payload.decode("utf-8", "replace"))
+        rows = [tuple(row) for row in json.loads(payload)]
+        self._etags[target] = (response.getheader("ETag"), rows)
+        return rows
+
+    def login(self, username, password):
+        """ Đăng nhập trên máy chủ và giữ token; trả về (id, ho, ten, is_admin) như database.login_user """
+        result = self._json("POST", "/login", body={"username": username, "password": password}, ok=(200, 401))
+        if "token" not in result:
+            return None
+        self.token = result["token"]
+        return tuple(result["user"])
+
+    def search_food_names(self, keyword):
+        return self._json("GET", "/search", {"q": keyword})
+
+    def get_cart(self, user_id):
+        return self._json("GET", "/cart", {"user_id": user_id})
+
+    def add_to_cart(self, user_id, mon_an_id, quantity=1):
+        return self._json("POST", "/cart", body={"user_id": user_id, "mon_an_id": mon_an_id,
+                                                  "quantity": quantity})
+
+    def orders_for_table(self, table_no):
+        return self._json("GET", "/orders", {"table_no": table_no})
+
+    def place_order(self, user_id, table_no, payment_method, timeout=None, request_key=None):
+        """ Đơn (dict) như OrderService.place_order, None nếu giỏ trống; lỗi ghi đơn ném ApiError(503) """
+        result = self._json("POST", "/orders", body={"user_id": user_id, "table_no": table_no,
+                                                     "payment_method": payment_method,
+                                                     "request_key": request_key}, ok=(200, 409))
+        return result["order"]
+
+    def get_all_products(self):
+        return [tuple(row) for row in self._json("GET", "/products")]
+
+    def checkout(self, items, customer_id=None, request_key=None):
+        return self._json("POST", "/checkout", body={"items": items, "customer_id": customer_id,
+                                                     "request_key": request_key}, ok=(200, 409))["sale_id"]
+
+    def batch(self, requests):
+        """ Gửi nhiều yêu cầu trong một lượt; trả về [{"status", "body"}] theo thứ tự """
+        return self._json("POST", "/batch", body={"requests": requests})["responses"]
+
+
+_client = None
+
+
+def get_client():
+    """ ApiClient khi chạy chế độ máy trạm mỏng (FOODIE_API), ngược lại None """
+    global _client
+    if _client is None and os.environ.get("FOODIE_API"):
+        _client = ApiClient(os.environ["FOODIE_API"])
+    return _client
+
+
+async def _load_client(host, port, target, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    etag = None
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            request = f"GET {target} HTTP/1.1\r\nHost: {host}\r\n"
+            if etag:
+                request += f"If-None-Match: {etag}\r\n"
+            writer.write((request + "\r\n").encode("latin-1"))
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+            length = 0
+            for line in head.split("\r\n")[1:]:
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+                elif name.lower() == "etag":
+                    etag = value.strip()
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def _load_test(host, port, target, clients, seconds):
+    deadline = time.perf_counter() + seconds
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_client(host, port, target, deadline, latencies) for _ in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def load_test(base_url, clients=32, seconds=5.0, target="/menu?page=1&size=8"):
+    """ clients kết nối keep-alive gửi liên tục GET target trong seconds giây; in số yêu cầu / giây """
+    parts = urlsplit(base_url)
+    latencies, elapsed = asyncio.run(_load_test(parts.hostname, parts.port or PORT, target, clients, seconds))
+    latencies.sort()
+    if not latencies:
+        print("Không có yêu cầu nào hoàn thành")
+        return 0.0
+    rps = len(latencies) / elapsed
+    print(f"{target}: {clients} kết nối, {len(latencies)} yêu cầu trong {elapsed:.1f} s = {rps:,.0f} yêu cầu/s, "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    return rps
+
+
+def main(args):
+    rest = list(args)
+    command = rest.pop(0) if rest else "serve"
+    options = {"--host": HOST, "--port": PORT, "--clients": 32, "--seconds": 5.0, "--path": "/menu?page=1&size=8"}
+    url = None
+    while rest:
+        arg = rest.pop(0)
+        if arg in options:
+            options[arg] = type(options[arg])(rest.pop(0))
+        else:
+            url = arg
+    if command == "serve":
+        import database
+        database.create_tables()
+        asyncio.run(ApiServer(options["--host"], options["--port"]).serve_forever())
+    elif command == "loadtest":
+        if url is None:
+            # Không có máy chủ: chạy một máy chủ tạm trên database mới để đo
+            import tempfile
+
+            import database
+            os.chdir(tempfile.mkdtemp())
+            database.create_tables()
+            url = f"http://127.0.0.1:{ApiServer('127.0.0.1', 0).start_in_thread()}"
+        load_test(url, options["--clients"], options["--seconds"], options["--path"])
+    else:
+        print("Cách dùng: python lan_api.py serve|loadtest [url] [--host] [--port] [--clients] [--seconds] [--path]")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,93 @@
+# launcher.py
+# Một tiến trình, một QApplication, một Qt binding cho cả hai ứng dụng:
+# quản lý mỹ phẩm (main.py) và kiosk bán đồ ăn (app_shell.py).
+#   python launcher.py            -> mở cả hai cửa sổ
+#   python launcher.py --food     -> chỉ mở kiosk bán đồ ăn
+#   python launcher.py --cosmetics-> chỉ mở quản lý mỹ phẩm
+#   python launcher.py --kitchen  -> kiosk bán đồ ăn kèm cửa sổ bếp riêng (bếp nhận đơn của kiosk
+#                                    trong cùng tiến trình, xem kitchen.get_service)
+#   python launcher.py --measure  -> đo thời gian import và RSS rồi thoát
+#   python launcher.py --measure --legacy -> đo như cũ (nạp cả PyQt5 và PyQt6)
+import os
+import resource
+import sys
+import time
+
+
+def rss_mb():
+    """ RSS lớn nhất của tiến trình (MB); Linux trả về KB, macOS trả về byte """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(legacy=False):
+    """ In thời gian import các module giao diện và RSS sau khi tạo QApplication """
+    start = time.perf_counter()
+    if legacy:
+        # Trạng thái trước đây: main.py dùng PyQt6, các màn hình dùng PyQt5
+        import PyQt6.QtWidgets  # noqa: F401
+        import PyQt5.QtWidgets  # noqa: F401
+    import qt_compat
+    import main  # noqa: F401
+    import app_shell  # noqa: F401
+    elapsed = (time.perf_counter() - start) * 1000
+    app = qt_compat.QtWidgets.QApplication(sys.argv)
+    loaded = [name for name in ("PyQt5", "PyQt6") if name in sys.modules]
+    print(f"Bindings loaded: {', '.join(loaded)}")
+    print(f"Import time: {elapsed:.1f} ms")
+    print(f"Peak RSS: {rss_mb():.1f} MB")
+    app.quit()
+
+
+def run(food=True, cosmetics=True, kitchen=False):
+    """ Khởi động các ứng dụng được chọn trong cùng một vòng lặp sự kiện """
+    from qt_compat import QtWidgets
+
+    app = QtWidgets.QApplication(sys.argv)
+    windows = []
+
+    if cosmetics:
+        import main
+        db_exists = os.path.exists(main.DATABASE_NAME)
+        main.create_tables()
+        if not db_exists:
+            main.add_initial_data()
+        windows.append(main.MainWindow())
+
+    if food:
+        import app_shell
+        import reconcile
+        windows.append(app_shell.AppShell())
+        try:
+            # Endpoint nhận thông báo chuyển khoản để tự xác nhận thanh toán
+            reconcile.start_server(reconcile.get_reconciler())
+        except OSError as e:
+            print(f"Không mở được endpoint đối soát: {e}")
+
+    if kitchen:
+        # Kiosk đã có màn hình bếp (Ctrl+K); đây là cửa sổ riêng cho màn hình đặt trong bếp
+        import kitchen as kitchen_service
+        import kitchen_view
+        display = kitchen_view.KitchenDisplay(kitchen_service.get_service())
+        display.setWindowTitle("Chicky - Bếp")
+        display.resize(1000, 680)
+        windows.append(display)
+
+    for window in windows:
+        window.show()
+    return app.exec()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--measure" in args:
+        measure(legacy="--legacy" in args)
+        sys.exit(0)
+    only_food = "--food" in args
+    only_cosmetics = "--cosmetics" in args
+    with_kitchen = "--kitchen" in args
+    if with_kitchen and not only_cosmetics:
+        only_food = True
+    if not only_food and not only_cosmetics:
+        only_food = only_cosmetics = True
+    sys.exit(run(food=only_food, cosmetics=only_cosmetics, kitchen=with_kitchen))
@@ -1,18 +1,37 @@
 import sys
 import sqlite3
 import os # Cần cho việc kiểm tra sự tồn tại của file database
-
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QDialog, QMessageBox,
-    QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit,
-    QPushButton, QTableView, QDialogButtonBox, QWidget, QHeaderView, QSpacerItem,
-    QSizePolicy # Cần cho QSpacerItem
-)
-from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from PyQt6.uic import loadUi # Hàm để load file .ui
+import re
+import time
+
+import money # Tiền là số nguyên đồng
+import storage # Dòng hóa đơn ghi / đọc qua storage.Store
+from qt_compat import QtCore, QtGui, QtWidgets # Dùng chung một Qt binding với ứng dụng bán đồ ăn
+from ui_cache import setup_ui # Dựng UI từ class đã biên dịch sẵn thay cho loadUi
+from product_catalog import COLUMNS, ProductCatalog # Danh mục sản phẩm lưu theo cột
+from scanner import ScanSession # Quét mã vạch, tra SKU trong bộ nhớ
+
+QApplication = QtWidgets.QApplication
+QMainWindow = QtWidgets.QMainWindow
+QDialog = QtWidgets.QDialog
+QMessageBox = QtWidgets.QMessageBox
+QTableView = QtWidgets.QTableView
+QHeaderView = QtWidgets.QHeaderView
+QAbstractTableModel = QtCore.QAbstractTableModel
+QModelIndex = QtCore.QModelIndex
+Qt = QtCore.Qt
+QTimer = QtCore.QTimer
 
 # --- Cấu hình Database ---
 DATABASE_NAME = "cosmetics.db"
+SALE_REQUEST_TTL = 24 * 3600 # Giữ khóa chống thanh toán trùng trong 24 giờ
+SALE_REQUEST_SWEEP_MS = 60 * 60 * 1000 # Dọn khóa hết hạn mỗi giờ
+# Các cột tiền, lưu bằng số nguyên đơn vị nhỏ nhất (money.MINOR_UNITS); bản cũ lưu REAL
+MONEY_COLUMNS = {
+    "products": ("price",),
+    "sales": ("total_amount",),
+    "sale_items": ("unit_price", "subtotal"),
+}
 
 def create_connection():
     """ Tạo kết nối đến cơ sở dữ liệu SQLite """
@@ -24,9 +43,11 @@ def create_connection():
         print(f"Database connection error: {e}")
         return None
 
-def create_tables():
-    """ Tạo các bảng cần thiết nếu chưa tồn tại """
-    conn = create_connection()
+def create_tables(conn=None):
+    """ Tạo các bảng cần thiết nếu chưa tồn tại; conn: dùng kết nối có sẵn (ví dụ storage.FakeBackend) """
+    own_connection = conn is None
+    if own_connection:
+        conn = create_connection()
     if conn is not None:
         try:
             cursor = conn.cursor()
@@ -36,7 +57,7 @@ def create_tables():
                     name TEXT NOT NULL,
                     brand TEXT,
                     category TEXT,
-                    price REAL NOT NULL,
+                    price INTEGER NOT NULL,
                     sku TEXT UNIQUE
                 )
             """)
@@ -53,7 +74,7 @@ def create_tables():
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     sale_date DATETIME DEFAULT CURRENT_TIMESTAMP,
                     customer_id INTEGER,
-                    total_amount REAL NOT NULL,
+                    total_amount INTEGER NOT NULL,
                     FOREIGN KEY (customer_id) REFERENCES customers(id)
                 )
             """)
@@ -63,8 +84,8 @@ def create_tables():
                     sale_id INTEGER NOT NULL,
                     product_id INTEGER NOT NULL,
                     quantity INTEGER NOT NULL,
-                    unit_price REAL NOT NULL,
-                    subtotal REAL NOT NULL,
+                    unit_price INTEGER NOT NULL,
+                    subtotal INTEGER NOT NULL,
                     FOREIGN KEY (sale_id) REFERENCES sales(id),
                     FOREIGN KEY (product_id) REFERENCES products(id)
                 )
@@ -77,15 +98,76 @@ def create_tables():
                     FOREIGN KEY (product_id) REFERENCES products(id)
                 )
             """)
+            # Khóa của mỗi lần thanh toán -> hóa đơn đã tạo, để bấm đúp/thử lại không trừ kho hai lần
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sale_requests (
+                    request_key TEXT PRIMARY KEY,
+                    sale_id INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    FOREIGN KEY (sale_id) REFERENCES sales(id)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sale_requests_created ON sale_requests (created_at)")
             conn.commit()
             print("Tables created or already exist.")
+            migrated = migrate_money_columns(conn)
+            if migrated:
+                print(f"Money columns migrated to INTEGER: {', '.join(migrated)}")
         except sqlite3.Error as e:
             print(f"Error creating tables: {e}")
         finally:
-            conn.close()
+            if own_connection:
+                conn.close()
     else:
         print("Could not create database connection.")
 
+def migrate_money_columns(conn):
+    """
+    Chuyển các cột tiền REAL của database cũ sang INTEGER (làm tròn về đơn vị nhỏ nhất).
+    SQLite không đổi được kiểu cột nên mỗi bảng được dựng lại: tạo bảng mới, chép dữ liệu, xóa bảng
+    cũ rồi đổi tên, tất cả trong một transaction. Chỉ mục, trigger (kể cả trigger đồng bộ của sync.py)
+    và bộ đếm AUTOINCREMENT được giữ nguyên. Trả về các bảng đã chuyển.
+    """
+    cursor = conn.cursor()
+    migrated = []
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for table, columns in MONEY_COLUMNS.items():
+            cursor.execute(f"PRAGMA table_info({table})")
+            info = cursor.fetchall()
+            if not any(row[1] in columns and row[2].upper() == "REAL" for row in info):
+                continue
+            names = [row[1] for row in info]
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            create_sql = cursor.fetchone()[0]
+            cursor.execute("SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') "
+                           "AND sql IS NOT NULL", (table,))
+            extras = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+            seq = cursor.fetchone()
+
+            new_sql = re.sub(rf"\b({'|'.join(columns)})\s+REAL\b", r"\1 INTEGER", create_sql)
+            new_sql = re.sub(rf'^CREATE TABLE\s+"?{table}"?', f"CREATE TABLE {table}_new", new_sql)
+            cursor.execute(new_sql)
+            select = ", ".join(f"CAST(ROUND({name} * {money.MINOR_UNITS}) AS INTEGER)" if name in columns
+                               else name for name in names)
+            cursor.execute(f"INSERT INTO {table}_new ({', '.join(names)}) SELECT {select} FROM {table}")
+            cursor.execute(f"DROP TABLE {table}")
+            cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            for sql in extras:
+                cursor.execute(sql)
+            if seq is not None:
+                # Giữ bộ đếm id (có thể cao hơn id lớn nhất, ví dụ khối id dành riêng của sync.py)
+                cursor.execute("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+                cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, seq[0]))
+            migrated.append(table)
+        conn.commit()
+        return migrated
+    except sqlite3.Error as e:
+        print(f"Error migrating money columns: {e}")
+        conn.rollback()
+        return []
+
 def add_initial_data():
     """ Thêm dữ liệu sản phẩm ban đầu và tồn kho """
     conn = create_connection()
@@ -133,6 +215,19 @@ def add_initial_data():
 # --- Data Management ---
 
 class DataManager:
+    def __init__(self, store=None):
+        self.catalog = None # ProductCatalog, nạp lần đầu trong get_catalog rồi cập nhật theo từng thay đổi
+        # Truy vấn dòng hóa đơn dùng chung với các backend khác (xem storage.Store); cosmetics.db luôn là SQLite
+        self.store = store or storage.get_store("sqlite", os.path.abspath(DATABASE_NAME))
+
+    def get_catalog(self, reload=False):
+        """ Danh mục sản phẩm trong bộ nhớ; chỉ đọc cả bảng ở lần đầu (hoặc khi reload) """
+        if self.catalog is None:
+            self.catalog = ProductCatalog(self.get_all_products())
+        elif reload:
+            self.catalog.reset(self.get_all_products())
+        return self.catalog
+
     def get_all_products(self):
         """ Lấy tất cả sản phẩm từ CSDL cùng với số lượng tồn kho """
         conn = create_connection()
@@ -156,7 +251,8 @@ class DataManager:
         return []
 
     def add_product(self, name, brand, category, price, sku, initial_quantity):
-        """ Thêm sản phẩm mới và cập nhật tồn kho ban đầu """
+        """ Thêm sản phẩm mới và cập nhật tồn kho ban đầu; price là số đồng (xem money.to_minor) """
+        price = money.to_minor(price)
         conn = create_connection()
         if conn:
             try:
@@ -174,6 +270,8 @@ class DataManager:
                                (product_id, initial_quantity))
 
                 conn.commit() # Commit transaction nếu thành công
+                if self.catalog is not None:
+                    self.catalog.add(product_id, name, brand, category, price, sku, initial_quantity)
                 print(f"Product '{name}' added successfully.")
                 return True
             except sqlite3.IntegrityError:
@@ -190,6 +288,7 @@ class DataManager:
 
     def update_product(self, product_id, name, brand, category, price, sku):
          """ Cập nhật thông tin sản phẩm (không bao gồm tồn kho) """
+         price = money.to_minor(price)
          conn = create_connection()
          if conn:
              try:
@@ -200,6 +299,8 @@ class DataManager:
                     WHERE id = ?
                  """, (name, brand, category, price, sku, product_id))
                  conn.commit()
+                 if self.catalog is not None:
+                     self.catalog.update(product_id, name, brand, category, price, sku)
                  print(f"Product ID {product_id} updated.")
                  return True
              except sqlite3.IntegrityError:
@@ -231,6 +332,8 @@ class DataManager:
                 cursor.execute("DELETE FROM products WHERE id = ?", (product_id,))
 
                 conn.commit() # Commit transaction nếu thành công
+                if self.catalog is not None:
+                    self.catalog.remove(product_id)
                 print(f"Product ID {product_id} deleted.")
                 return True
             except sqlite3.Error as e:
@@ -250,6 +353,8 @@ class DataManager:
                 cursor.execute("UPDATE inventory SET quantity = quantity + ? WHERE product_id = ?",
                                (quantity_change, product_id))
                 conn.commit()
+                if self.catalog is not None:
+                    self.catalog.adjust_quantity(product_id, quantity_change)
                 print(f"Inventory updated for product ID {product_id}.")
                 return True
             except sqlite3.Error as e:
@@ -260,7 +365,143 @@ class DataManager:
                 conn.close()
         return False
 
-    # TODO: Add methods for Customers, Sales, Reports
+    def checkout(self, items, customer_id=None, request_key=None):
+        """
+        Tạo hóa đơn bán hàng và trừ tồn kho trong một transaction.
+        items là [(product_id, quantity), ...] hoặc [(product_id, quantity, giá đã báo khách), ...].
+        Trả về id hóa đơn, hoặc None nếu lỗi/không đủ hàng/giá trong CSDL khác giá đã báo.
+        Gọi lại với cùng request_key trả về hóa đơn đã tạo mà không ghi gì thêm.
+        """
+        conn = create_connection()
+        if conn:
+            try:
+                cursor = conn.cursor()
+                conn.execute("BEGIN IMMEDIATE")
+                if request_key is not None:
+                    cursor.execute("SELECT sale_id FROM sale_requests WHERE request_key = ? AND created_at > ?",
+                                   (request_key, time.time() - SALE_REQUEST_TTL))
+                    row = cursor.fetchone()
+                    if row is not None:
+                        conn.rollback()
+                        return row[0]
+
+                cursor.execute("INSERT INTO sales (customer_id, total_amount) VALUES (?, 0)", (customer_id,))
+                sale_id = cursor.lastrowid
+                total = 0
+                lines = []
+                for product_id, quantity, *quoted in items:
+                    # Chỉ trừ khi còn đủ hàng
+                    cursor.execute("UPDATE inventory SET quantity = quantity - ? WHERE product_id = ? AND quantity >= ?",
+                                   (quantity, product_id, quantity))
+                    if cursor.rowcount == 0:
+                        print(f"Error: Not enough stock for product ID {product_id}.")
+                        conn.rollback()
+                        return None
+                    cursor.execute("SELECT price FROM products WHERE id = ?", (product_id,))
+                    unit_price = cursor.fetchone()[0]
+                    if quoted and quoted[0] != unit_price:
+                        print(f"Error: Price of product ID {product_id} changed ({quoted[0]} -> {unit_price}).")
+                        conn.rollback()
+                        return None
+                    lines.append((product_id, quantity, unit_price))
+                    total += unit_price * quantity
+                # Ghi các dòng hóa đơn trong cùng transaction
+                self.store.add_sale_items(sale_id, lines, cursor)
+                cursor.execute("UPDATE sales SET total_amount = ? WHERE id = ?", (total, sale_id))
+                if request_key is not None:
+                    cursor.execute("INSERT OR REPLACE INTO sale_requests (request_key, sale_id, created_at) VALUES (?, ?, ?)",
+                                   (request_key, sale_id, time.time()))
+
+                conn.commit()
+                if self.catalog is not None:
+                    for product_id, quantity, *_ in items:
+                        self.catalog.adjust_quantity(product_id, -quantity)
+                print(f"Sale {sale_id} recorded.")
+                return sale_id
+            except sqlite3.Error as e:
+                print(f"Error recording sale: {e}")
+                conn.rollback()
+                return None
+            finally:
+                conn.close()
+        return None
+
+    def purge_sale_requests(self, ttl=SALE_REQUEST_TTL):
+        """ Xóa các khóa chống thanh toán trùng đã hết hạn """
+        conn = create_connection()
+        if conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM sale_requests WHERE created_at <= ?", (time.time() - ttl,))
+                conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                print(f"Error purging sale requests: {e}")
+                return 0
+            finally:
+                conn.close()
+        return 0
+
+    def get_sales_report(self, start=None, end=None):
+        """
+        Doanh thu theo ngày [(ngày, số hóa đơn, doanh thu)], sale_date trong [start, end) nếu có.
+        Doanh thu là số nguyên đồng: SUM trên cột INTEGER chính xác, không cần làm tròn.
+        """
+        conn = create_connection()
+        if conn:
+            try:
+                cursor = conn.cursor()
+                conditions, params = [], []
+                if start is not None:
+                    conditions.append("sale_date >= ?")
+                    params.append(start)
+                if end is not None:
+                    conditions.append("sale_date < ?")
+                    params.append(end)
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(f"""
+                    SELECT date(sale_date), COUNT(*), SUM(total_amount)
+                    FROM sales {where}
+                    GROUP BY date(sale_date)
+                    ORDER BY date(sale_date)
+                """, params)
+                return cursor.fetchall()
+            except sqlite3.Error as e:
+                print(f"Error reading sales report: {e}")
+                return []
+            finally:
+                conn.close()
+        return []
+
+    def get_sale_items(self, sale_id):
+        """ Các dòng của một hóa đơn [(product_id, quantity, unit_price, subtotal)] """
+        try:
+            return self.store.get_sale_items(sale_id)
+        except storage.StorageError as e:
+            print(f"Error reading sale items: {e}")
+            return []
+
+    def get_product_revenue(self):
+        """ Số lượng đã bán và doanh thu theo sản phẩm [(product_id, số lượng, doanh thu)], doanh thu giảm dần """
+        conn = create_connection()
+        if conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT product_id, SUM(quantity), SUM(subtotal)
+                    FROM sale_items
+                    GROUP BY product_id
+                    ORDER BY SUM(subtotal) DESC
+                """)
+                return cursor.fetchall()
+            except sqlite3.Error as e:
+                print(f"Error reading product revenue: {e}")
+                return []
+            finally:
+                conn.close()
+        return []
+
+    # TODO: Add methods for Customers
 
 # --- UI Logic for Product Dialog ---
 
@@ -271,33 +512,44 @@ class ProductDialog(QDialog):
         product_data: List/Tuple chứa dữ liệu sản phẩm nếu đang ở chế độ Sửa.
         """
         super().__init__()
-        # Load UI từ file .ui
+        # Dựng UI từ class biên dịch sẵn của file .ui (xem ui_cache.py)
         # Đảm bảo file 'ui/product_dialog.ui' tồn tại
         try:
-             loadUi("ui/product_dialog.ui", self)
+             setup_ui("ui/product_dialog.ui", self)
         except FileNotFoundError:
              QMessageBox.critical(self, "Lỗi UI", "Không tìm thấy file ui/product_dialog.ui. Vui lòng kiểm tra lại đường dẫn.")
              self.close() # Đóng dialog nếu không load được UI
              return
 
+        # Connect signals (Assuming object names from .ui file)
+        # QDialogButtonBox standard signals are 'accepted' and 'rejected'
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+        self.reset(product_data)
+
+    def reset(self, product_data=None):
+        """
+        Đưa dialog về trạng thái ban đầu để dùng lại thay vì tạo dialog mới.
+        product_data: List/Tuple chứa dữ liệu sản phẩm nếu đang ở chế độ Sửa.
+        """
         self.product_data = product_data
         self.is_edit_mode = product_data is not None
 
         self.setWindowTitle("Thêm Sản phẩm Mới" if not self.is_edit_mode else "Sửa Thông tin Sản phẩm")
 
+        for field in (self.lineEditName, self.lineEditBrand, self.lineEditCategory,
+                      self.lineEditPrice, self.lineEditSku, self.lineEditQuantity):
+            field.clear()
+        self.lineEditName.setFocus()
+
         # Load data if in edit mode
         if self.is_edit_mode:
             self._load_product_data()
-            # Disable SKU field in edit mode to prevent changing unique key
-            self.lineEditSku.setEnabled(False)
-            # Disable Quantity field in edit mode - stock should be managed via stock adjustments
-            self.lineEditQuantity.setEnabled(False)
-
-
-        # Connect signals (Assuming object names from .ui file)
-        # QDialogButtonBox standard signals are 'accepted' and 'rejected'
-        self.buttonBox.accepted.connect(self.accept)
-        self.buttonBox.rejected.connect(self.reject)
+        # Disable SKU field in edit mode to prevent changing unique key
+        self.lineEditSku.setEnabled(not self.is_edit_mode)
+        # Disable Quantity field in edit mode - stock should be managed via stock adjustments
+        self.lineEditQuantity.setEnabled(not self.is_edit_mode)
 
     def _load_product_data(self):
         """ Load existing product data into the form fields """
@@ -307,7 +559,7 @@ class ProductDialog(QDialog):
             self.lineEditName.setText(str(self.product_data[1])) # name
             self.lineEditBrand.setText(str(self.product_data[2])) # brand
             self.lineEditCategory.setText(str(self.product_data[3])) # category
-            self.lineEditPrice.setText(str(self.product_data[4])) # price
+            self.lineEditPrice.setText(money.format_vnd(self.product_data[4])) # price
             self.lineEditSku.setText(str(self.product_data[5])) # sku
             self.lineEditQuantity.setText(str(self.product_data[6])) # quantity
 
@@ -326,7 +578,10 @@ class ProductDialog(QDialog):
                  QMessageBox.warning(self, "Lỗi nhập liệu", "Tên sản phẩm, Giá và Mã SKU không được để trống.")
                  return None # Return None to indicate validation failure
 
-            price = float(price_str)
+            price = money.parse(price_str)
+            if price < 0:
+                 QMessageBox.warning(self, "Lỗi nhập liệu", "Giá không thể là số âm.")
+                 return None
 
             # Quantity is only required and used for adding new product initially
             if not self.is_edit_mode:
@@ -371,6 +626,62 @@ class ProductDialog(QDialog):
              return None # Return None to indicate validation failure
 
 
+# --- Table Model for Products ---
+
+# Model bảng sản phẩm đọc thẳng từ các cột của ProductCatalog, không tạo QStandardItem cho từng ô
+class ProductTableModel(QAbstractTableModel):
+    HEADERS = ["ID", "Tên Sản phẩm", "Thương hiệu", "Loại", "Giá", "Mã SKU", "Tồn kho"]
+
+    def __init__(self, catalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self._row_count = len(catalog)
+        catalog.subscribe(self._catalog_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        value = self.catalog.value(index.row(), index.column())
+        if index.column() == 4:
+            return money.format_vnd(value)
+        return str(value) if value is not None else ''
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def _catalog_changed(self, event, row):
+        """ Báo cho view đúng phần đã đổi thay vì dựng lại cả bảng; begin...() chạy trước khi danh mục đổi """
+        if event == "before_insert":
+            self.beginInsertRows(QModelIndex(), row, row)
+        elif event == "insert":
+            self._row_count = len(self.catalog)
+            self.endInsertRows()
+        elif event == "update":
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+        elif event == "before_remove":
+            # Dòng cuối sẽ được chuyển vào vị trí row: với view, dòng cuối biến mất và dòng row đổi dữ liệu
+            last = self._row_count - 1
+            self.beginRemoveRows(QModelIndex(), last, last)
+        elif event == "remove":
+            self._row_count = len(self.catalog)
+            self.endRemoveRows()
+            if row < self._row_count:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+        elif event == "before_reset":
+            self.beginResetModel()
+        else:
+            self._row_count = len(self.catalog)
+            self.endResetModel()
+
+
 # --- UI Logic for Main Window ---
 
 class MainWindow(QMainWindow):
@@ -380,24 +691,30 @@ class MainWindow(QMainWindow):
         # Load UI từ file .ui
         # Đảm bảo file 'ui/main_window.ui' tồn tại
         try:
-            loadUi("ui/main_window.ui", self)
+            setup_ui("ui/main_window.ui", self)
         except FileNotFoundError:
             QMessageBox.critical(self, "Lỗi UI", "Không tìm thấy file ui/main_window.ui. Vui lòng kiểm tra lại đường dẫn.")
             sys.exit(1) # Thoát ứng dụng nếu không load được UI
 
         self.data_manager = DataManager() # Khởi tạo DataManager
+        self._product_dialog = None # Dialog thêm/sửa được tạo một lần rồi dùng lại
+
+        # Dọn định kỳ bảng sale_requests để bảng luôn nhỏ
+        self.data_manager.purge_sale_requests()
+        self._sale_request_sweeper = QTimer(self)
+        self._sale_request_sweeper.timeout.connect(self.data_manager.purge_sale_requests)
+        self._sale_request_sweeper.start(SALE_REQUEST_SWEEP_MS)
 
         self.setWindowTitle("Ứng dụng Quản lý Mỹ phẩm")
 
-        # Setup Table View Model
-        self.product_model = QStandardItemModel()
+        # Setup Table View Model: bảng đọc trực tiếp từ danh mục sản phẩm trong bộ nhớ
+        self.product_model = ProductTableModel(self.data_manager.get_catalog())
         self.tableViewProducts.setModel(self.product_model)
-        self._set_table_headers()
         # Fit columns to content/view and stretch Name
         self.tableViewProducts.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         # Find index of Name column dynamically if headers change order
         try:
-             name_col_index = self.product_model.horizontalHeaderLabels().index("Tên Sản phẩm")
+             name_col_index = ProductTableModel.HEADERS.index("Tên Sản phẩm")
              self.tableViewProducts.horizontalHeader().setSectionResizeMode(name_col_index, QHeaderView.ResizeMode.Stretch)
         except ValueError:
              print("Warning: 'Tên Sản phẩm' column not found for stretching.")
@@ -410,9 +727,7 @@ class MainWindow(QMainWindow):
         self.tableViewProducts.setSelectionMode(QTableView.SelectionMode.SingleSelection) # Allow only single selection
 
         self.setup_ui_logic() # Kết nối tín hiệu/slot
-
-        # Load initial data
-        self.load_products_data()
+        print(f"Loaded {len(self.product_model.catalog)} products.")
 
 
     def setup_ui_logic(self):
@@ -429,6 +744,19 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'btnDeleteProduct'):
             self.btnDeleteProduct.clicked.connect(self.delete_selected_product)
 
+        # Quầy thu ngân: máy quét gõ mã vạch rồi Enter vào lineEditScan
+        self.scan_session = ScanSession(self.data_manager)
+        self._scan_results = [] # Kết quả quét chưa hiển thị
+        # Nhiều lần quét dồn dập chỉ vẽ lại một lần khi vòng lặp sự kiện rảnh
+        self._scan_display_timer = QTimer(self)
+        self._scan_display_timer.setSingleShot(True)
+        self._scan_display_timer.setInterval(0)
+        self._scan_display_timer.timeout.connect(self._show_scans)
+        if hasattr(self, 'lineEditScan'):
+            self.lineEditScan.returnPressed.connect(self.scan_barcode)
+        if hasattr(self, 'btnCheckout'):
+            self.btnCheckout.clicked.connect(self.checkout_scanned_sale)
+
         # TODO: Connect other menu actions and buttons for other features
 
 
@@ -440,34 +768,23 @@ class MainWindow(QMainWindow):
         # QMessageBox.information(self, "Thông báo", "Đây là màn hình Quản lý Sản phẩm.")
 
 
-    def _set_table_headers(self):
-        """ Set headers for the product table model """
-        # Ensure headers match the order of columns fetched by get_all_products
-        headers = ["ID", "Tên Sản phẩm", "Thương hiệu", "Loại", "Giá", "Mã SKU", "Tồn kho"]
-        self.product_model.setHorizontalHeaderLabels(headers)
-
     def load_products_data(self):
-        """ Load product data from DB and display in QTableView """
-        self.product_model.removeRows(0, self.product_model.rowCount()) # Clear existing data
-
-        products = self.data_manager.get_all_products()
+        """ Đọc lại toàn bộ sản phẩm từ DB (thêm/sửa/xóa đã tự cập nhật danh mục, không cần gọi) """
+        catalog = self.data_manager.get_catalog(reload=True)
+        print(f"Loaded {len(catalog)} products.")
 
-        for product in products:
-            # product is a tuple/list: (id, name, brand, category, price, sku, quantity)
-            items = [QStandardItem(str(col) if col is not None else '') for col in product]
-
-            # Make all items non-editable directly in the table view
-            for item in items:
-                 item.setEditable(False)
-
-            self.product_model.appendRow(items)
-
-        print(f"Loaded {len(products)} products.")
 
+    def product_dialog(self, product_data=None):
+        """ Lấy ProductDialog dùng chung, đã được reset theo product_data """
+        if self._product_dialog is None:
+            self._product_dialog = ProductDialog(product_data)
+        else:
+            self._product_dialog.reset(product_data)
+        return self._product_dialog
 
     def open_add_product_dialog(self):
         """ Open dialog to add a new product """
-        dialog = ProductDialog()
+        dialog = self.product_dialog()
         if dialog.exec() == QDialog.DialogCode.Accepted: # Check if dialog was accepted (OK clicked)
             product_data = dialog.get_product_data()
             if product_data: # Check if get_product_data returned data (validation passed)
@@ -481,8 +798,7 @@ class MainWindow(QMainWindow):
                     product_data['initial_quantity'] # Use initial_quantity key
                 )
                 if success:
-                    QMessageBox.information(self, "Thành công", "Đã thêm sản phẩm mới.")
-                    self.load_products_data() # Reload table data to show the new product
+                    QMessageBox.information(self, "Thành công", "Đã thêm sản phẩm mới.") # Bảng tự thêm dòng mới
                 else:
                      # Error message handled in DataManager, but we can show a generic one or refine
                      QMessageBox.warning(self, "Lỗi", "Không thể thêm sản phẩm. Mã SKU có thể đã tồn tại hoặc lỗi khác.")
@@ -498,32 +814,15 @@ class MainWindow(QMainWindow):
         # Get data of the first selected row (assuming single selection is enforced)
         selected_row = selected_indexes[0].row()
 
-        # Get the full product data from the model for the selected row
-        # This data format should match what DataManager.get_all_products returns
-        product_data = []
-        for col in range(self.product_model.columnCount()):
-            item = self.product_model.item(selected_row, col)
-            product_data.append(item.text() if item else '')
-
-        # Convert numeric data types from string representation in model
+        # Dòng (id, name, brand, category, price, sku, quantity) lấy thẳng từ danh mục, không đọc lại chữ trong bảng
         try:
-             # Assuming order from _set_table_headers and get_all_products:
-             # ID, Name, Brand, Category, Price, SKU, Quantity
-             product_id = int(product_data[0])
-             price = float(product_data[4])
-             quantity = int(product_data[6]) # Pass original quantity for dialog load
-
-             # Create a list/tuple in the format expected by ProductDialog init
-             # (id, name, brand, category, price, sku, quantity) - used for loading dialog
-             product_info_for_dialog = (product_id, product_data[1], product_data[2],
-                                        product_data[3], price, product_data[5], quantity)
-
-        except (ValueError, IndexError) as e:
+             product_info_for_dialog = self.product_model.catalog.row(selected_row)
+        except IndexError as e:
              QMessageBox.critical(self, "Lỗi dữ liệu", f"Không thể đọc dữ liệu sản phẩm từ bảng: {e}")
              return
 
         # Open dialog with existing data
-        dialog = ProductDialog(product_data=product_info_for_dialog)
+        dialog = self.product_dialog(product_data=product_info_for_dialog)
         if dialog.exec() == QDialog.DialogCode.Accepted: # Check if dialog was accepted
             updated_data = dialog.get_product_data()
             if updated_data and 'id' in updated_data: # Ensure get_product_data returned valid update data
@@ -539,8 +838,7 @@ class MainWindow(QMainWindow):
                  # Quantity update is NOT handled here; should be separate stock adjustment
 
                  if success:
-                     QMessageBox.information(self, "Thành công", "Đã cập nhật sản phẩm.")
-                     self.load_products_data() # Reload table data
+                     QMessageBox.information(self, "Thành công", "Đã cập nhật sản phẩm.") # Bảng tự cập nhật dòng
                  else:
                       # Error handled in DataManager, often SKU conflict
                       QMessageBox.warning(self, "Lỗi", "Không thể cập nhật sản phẩm. Mã SKU có thể đã tồn tại hoặc lỗi khác.")
@@ -555,17 +853,11 @@ class MainWindow(QMainWindow):
 
         # Get ID and Name of the first selected row
         selected_row = selected_indexes[0].row()
-        product_id_item = self.product_model.item(selected_row, 0) # Assuming ID is in column 0
-        product_name_item = self.product_model.item(selected_row, 1) # Assuming Name is in column 1
-
+        catalog = self.product_model.catalog
 
-        if product_id_item and product_name_item:
-             try:
-                 product_id = int(product_id_item.text())
-                 product_name = product_name_item.text()
-             except ValueError:
-                 QMessageBox.critical(self, "Lỗi dữ liệu", "Không thể đọc ID sản phẩm.")
-                 return
+        if selected_row < len(catalog):
+             product_id = catalog.ids[selected_row]
+             product_name = catalog.names[selected_row]
 
              # Confirmation dialog
              reply = QMessageBox.question(self, 'Xác nhận xóa',
@@ -576,8 +868,7 @@ class MainWindow(QMainWindow):
                  # Call data manager to delete product
                  success = self.data_manager.delete_product(product_id)
                  if success:
-                     QMessageBox.information(self, "Thành công", "Đã xóa sản phẩm.")
-                     self.load_products_data() # Reload table data
+                     QMessageBox.information(self, "Thành công", "Đã xóa sản phẩm.") # Bảng tự bỏ dòng
                  else:
                       # Error handled in DataManager
                       QMessageBox.warning(self, "Lỗi", "Không thể xóa sản phẩm. Có thể do ràng buộc dữ liệu (ví dụ: sản phẩm đã có trong đơn hàng).")
@@ -586,6 +877,61 @@ class MainWindow(QMainWindow):
              QMessageBox.critical(self, "Lỗi dữ liệu", "Không thể lấy thông tin sản phẩm để xóa.")
 
 
+    def scan_barcode(self):
+        """ Thêm sản phẩm có mã vừa quét vào hóa đơn (không truy vấn DB) """
+        code = self.lineEditScan.text()
+        self.lineEditScan.clear()
+        if code.strip():
+            self._scan_results.append(self.scan_session.scan(code))
+            if not self._scan_display_timer.isActive():
+                self._scan_display_timer.start()
+
+    def _show_scans(self):
+        """ Hiển thị hóa đơn sau một loạt lần quét và ghi độ trễ quét -> hiển thị của từng lần """
+        results, self._scan_results = self._scan_results, []
+        if not results:
+            return
+        self._show_sale_lines(results[-1].total)
+        errors = [f"{result.code}: {result.error}" for result in results if result.error]
+        if errors:
+            self.statusBar().showMessage("; ".join(errors), 5000)
+        for result in results:
+            self.scan_session.metrics.record_display(result.scanned_at)
+
+    def _show_sale_lines(self, total):
+        if hasattr(self, 'listWidgetSale'):
+            self.listWidgetSale.clear()
+            self.listWidgetSale.addItems([f"{quantity} x {name}: {money.format_vnd(subtotal)}"
+                                          for _, name, _, quantity, subtotal in self.scan_session.lines()])
+        if hasattr(self, 'labelSaleTotal'):
+            self.labelSaleTotal.setText(f"Tổng: {money.format_vnd(total)}")
+
+    def checkout_scanned_sale(self):
+        """ Ghi hóa đơn đang quét vào DB trong một transaction """
+        if not self.scan_session.items:
+            QMessageBox.warning(self, "Hóa đơn trống", "Chưa quét sản phẩm nào.")
+            return
+        sale_id = self.scan_session.commit()
+        if sale_id is None:
+            if self.scan_session.price_changes:
+                # Hóa đơn đã được tính lại theo giá mới; hiện lại để thu ngân báo khách trước khi thanh toán
+                self._show_sale_lines(self.scan_session.total)
+                QMessageBox.warning(self, "Giá đã thay đổi",
+                                    f"Giá của {len(self.scan_session.price_changes)} sản phẩm đã thay đổi. "
+                                    f"Tổng mới: {money.format_vnd(self.scan_session.total)}.")
+                return
+            QMessageBox.warning(self, "Lỗi", "Không thể thanh toán. Có thể sản phẩm đã hết hàng.")
+            return
+        if hasattr(self, 'listWidgetSale'):
+            self.listWidgetSale.clear()
+        if hasattr(self, 'labelSaleTotal'):
+            self.labelSaleTotal.setText(f"Tổng: {money.format_vnd(0)}")
+        summary = self.scan_session.metrics.summary()
+        QMessageBox.information(self, "Thành công", f"Đã lưu hóa đơn #{sale_id}.")
+        if "p95_ms" in summary:
+            print(f"Quét -> hiển thị: p50 {summary['p50_ms']:.2f} ms, p95 {summary['p95_ms']:.2f} ms, "
+                  f"tối đa {summary['max_ms']:.2f} ms ({summary['scans']} lần quét)")
+
     # TODO: Implement other screens and their logic (Sales, Customers, Inventory, Reports)
 
 
@@ -6,9 +6,11 @@
 #
 # WARNING: Any manual changes made to this file will be lost when pyuic5 is
 # run again.  Do not edit this file unless you know what you are doing.
+# Post-processed by build_ui.py to run on qt_compat.
 
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+from qt_compat import QtCore, QtGui, QtWidgets, load_resources
+import theme
 
 
 class Ui_Dialog(object):
@@ -17,82 +19,38 @@ class Ui_Dialog(object):
         Dialog.resize(1220, 798)
         self.label_5 = QtWidgets.QLabel(Dialog)
         self.label_5.setGeometry(QtCore.QRect(0, 120, 221, 681))
-        font = QtGui.QFont()
-        font.setPointSize(15)
-        font.setBold(True)
-        font.setWeight(75)
-        self.label_5.setFont(font)
-        self.label_5.setStyleSheet("background-color: #C62828\n"
-"")
+        self.label_5.setFont(theme.font(pointSize=15, bold=True))
+        self.label_5.setProperty("themeRole", "s10229903")
         self.label_5.setText("")
         self.label_5.setObjectName("label_5")
         self.mon_an = QtWidgets.QPushButton(Dialog)
         self.mon_an.setGeometry(QtCore.QRect(-10, 120, 231, 101))
-        font = QtGui.QFont()
-        font.setPointSize(15)
-        font.setBold(True)
-        font.setWeight(75)
-        self.mon_an.setFont(font)
-        self.mon_an.setStyleSheet("")
+        self.mon_an.setFont(theme.font(pointSize=15, bold=True))
         self.mon_an.setObjectName("mon_an")
         self.gio_hang = QtWidgets.QPushButton(Dialog)
         self.gio_hang.setGeometry(QtCore.QRect(-10, 210, 231, 91))
-        font = QtGui.QFont()
-        font.setPointSize(15)
-        font.setBold(True)
-        font.setWeight(75)
-        self.gio_hang.setFont(font)
-        self.gio_hang.setStyleSheet("")
+        self.gio_hang.setFont(theme.font(pointSize=15, bold=True))
         self.gio_hang.setObjectName("gio_hang")
         self.label_4 = QtWidgets.QLabel(Dialog)
         self.label_4.setGeometry(QtCore.QRect(30, 20, 91, 91))
-        self.label_4.setStyleSheet("border-image: url(:/pic/logoss.png);")
+        self.label_4.setProperty("themeRole", "sa0693a71")
         self.label_4.setText("")
         self.label_4.setObjectName("label_4")
         self.tim_kiem = QtWidgets.QLineEdit(Dialog)
         self.tim_kiem.setGeometry(QtCore.QRect(360, 40, 281, 51))
-        font = QtGui.QFont()
-        font.setPointSize(-1)
-        self.tim_kiem.setFont(font)
-        self.tim_kiem.setStyleSheet("QLineEdit {\n"
-"    border: 2px solid white;\n"
-"    border-radius: 20px;\n"
-"    padding: 6px 12px;\n"
-"    background-color: #f9f9f9;\n"
-"    font-size: 14px;\n"
-"    color: #333;\n"
-"}\n"
-"\n"
-"QLineEdit:focus {\n"
-"    border: 2px solid white;  /* vẫn là trắng khi focus */\n"
-"}\n"
-"")
+        self.tim_kiem.setFont(theme.font(pointSize=-1))
+        self.tim_kiem.setProperty("themeRole", "s2ec2a732")
         self.tim_kiem.setText("")
         self.tim_kiem.setObjectName("tim_kiem")
         self.label_3 = QtWidgets.QLabel(Dialog)
         self.label_3.setGeometry(QtCore.QRect(130, 10, 211, 101))
-        font = QtGui.QFont()
-        font.setPointSize(37)
-        font.setBold(True)
-        font.setWeight(75)
-        self.label_3.setFont(font)
-        self.label_3.setStyleSheet("QLabel {\n"
-"    color: white;\n"
-"    background-color: transparent;  /* làm nền trong suốt nếu muốn */            /* tùy chỉnh cỡ chữ nếu cần */\n"
-"    font-weight: bold;              /* chữ đậm */\n"
-"}\n"
-"")
+        self.label_3.setFont(theme.font(pointSize=37, bold=True))
+        self.label_3.setProperty("themeRole", "s28a0c2f6")
         self.label_3.setObjectName("label_3")
         self.label_2 = QtWidgets.QLabel(Dialog)
         self.label_2.setGeometry(QtCore.QRect(0, 0, 1231, 121))
-        font = QtGui.QFont()
-        font.setFamily("Microsoft YaHei UI")
-        font.setPointSize(35)
-        font.setBold(True)
-        font.setWeight(75)
-        self.label_2.setFont(font)
-        self.label_2.setStyleSheet("background-color: #D32F2F\n"
-"")
+        self.label_2.setFont(theme.font(family="Microsoft YaHei UI", pointSize=35, bold=True))
+        self.label_2.setProperty("themeRole", "s82c31d20")
         self.label_2.setText("")
         self.label_2.setObjectName("label_2")
         self.label_6 = QtWidgets.QLabel(Dialog)
@@ -119,14 +77,15 @@ class Ui_Dialog(object):
         self.gio_hang.setText(_translate("Dialog", "🛒Giỏ hàng"))
         self.tim_kiem.setPlaceholderText(_translate("Dialog", "Tìm kiếm..."))
         self.label_3.setText(_translate("Dialog", "Chicky"))
-import doan_rc
+load_resources()
 
 
 if __name__ == "__main__":
     import sys
     app = QtWidgets.QApplication(sys.argv)
+    theme.apply(app)
     Dialog = QtWidgets.QDialog()
     ui = Ui_Dialog()
     ui.setupUi(Dialog)
     Dialog.show()
-    sys.exit(app.exec_())
+    sys.exit(app.exec())
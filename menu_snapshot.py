@@ -0,0 +1,254 @@
+# menu_snapshot.py
+# Ảnh chụp thực đơn (bảng mon_an) dạng nhị phân gọn, đọc bằng mmap khi khởi động để màn hình
+# menu có dữ liệu mà không cần truy vấn database.
+# Bố cục file (little-endian):
+#   header   MAGIC, FORMAT_VERSION, phiên bản thực đơn (menu_version), số món n, kích thước bảng chuỗi
+#   ids      n x int64 (tăng dần; id của máy đồng bộ số k bắt đầu từ k * sync.ID_BLOCK, vượt int32)
+#   gia      n x int64
+#   offsets  (2n + 1) x uint32 vị trí trong bảng chuỗi: ten_mon của món i là [2i, 2i+1),
+#            hinh_anh là [2i+1, 2i+2)
+#   chuỗi    UTF-8 nối liền
+# Database chỉ được đọc lại toàn bộ khi phiên bản trong file khác menu_version (trigger trên mon_an
+# tăng phiên bản mỗi lần thực đơn đổi).
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+import database
+
+SNAPSHOT_PATH = "menu_snapshot.bin"
+MAGIC = b"MENU"
+FORMAT_VERSION = 2  # 1: id / gia int32
+HEADER = struct.Struct("<4sHHqII")
+
+
+class SnapshotError(Exception):
+    """ File ảnh chụp hỏng hoặc khác định dạng """
+
+
+def export(path=SNAPSHOT_PATH):
+    """ Ghi ảnh chụp thực đơn hiện tại ra path, trả về phiên bản thực đơn (None nếu lỗi) """
+    version, rows = database.get_menu_with_version()
+    if version is None:
+        return None
+    ids = array("q")
+    prices = array("q")
+    offsets = array("I", [0])
+    strings = bytearray()
+    for mon_an_id, ten_mon, gia, hinh_anh in rows:
+        ids.append(mon_an_id)
+        prices.append(gia)
+        for text in (ten_mon, hinh_anh):
+            strings += text.encode("utf-8")
+            offsets.append(len(strings))
+    if sys.byteorder != "little":
+        for part in (ids, prices, offsets):
+            part.byteswap()
+    # Ghi ra file tạm rồi đổi tên để tiến trình khác không bao giờ đọc phải file ghi dở
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, version, len(ids), len(strings)))
+        f.write(ids.tobytes())
+        f.write(prices.tobytes())
+        f.write(offsets.tobytes())
+        f.write(strings)
+    os.replace(tmp_path, path)
+    return version
+
+
+class MenuRecord:
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot, index):
+        """ Một món trong ảnh chụp; các trường được đọc thẳng từ vùng nhớ mmap khi truy cập """
+        self._snapshot = snapshot
+        self._index = index
+
+    @property
+    def id(self):
+        return self._snapshot.ids[self._index]
+
+    @property
+    def gia(self):
+        return self._snapshot.prices[self._index]
+
+    @property
+    def ten_mon(self):
+        return self._snapshot.string(2 * self._index)
+
+    @property
+    def hinh_anh(self):
+        return self._snapshot.string(2 * self._index + 1)
+
+    def as_tuple(self):
+        """ (id, ten_mon, gia, hinh_anh) như một dòng của database.get_mon_an """
+        return self.id, self.ten_mon, self.gia, self.hinh_anh
+
+
+class MenuSnapshot:
+    def __init__(self, path=SNAPSHOT_PATH):
+        """ Mở ảnh chụp bằng mmap; không chép dữ liệu, chỉ tạo các memoryview trỏ vào file """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotError(f"{path} rỗng")
+        self._view = memoryview(self._mmap)
+        try:
+            magic, fmt, _, self.version, count, strings_size = HEADER.unpack_from(self._view)
+            if magic != MAGIC or fmt != FORMAT_VERSION:
+                raise SnapshotError(f"{path} không phải ảnh chụp thực đơn phiên bản {FORMAT_VERSION}")
+            ids_at = HEADER.size
+            prices_at = ids_at + 8 * count
+            offsets_at = prices_at + 8 * count
+            strings_at = offsets_at + 4 * (2 * count + 1)
+            if len(self._view) != strings_at + strings_size:
+                raise SnapshotError(f"{path} bị cắt ngắn hoặc hỏng")
+        except (struct.error, SnapshotError):
+            self.close()
+            raise
+        if sys.byteorder != "little":
+            # Máy big-endian: chép và đảo byte một lần thay vì đọc trực tiếp
+            self.ids = self._swapped("q", self._view[ids_at:prices_at])
+            self.prices = self._swapped("q", self._view[prices_at:offsets_at])
+            self._offsets = self._swapped("I", self._view[offsets_at:strings_at])
+        else:
+            self.ids = self._view[ids_at:prices_at].cast("q")
+            self.prices = self._view[prices_at:offsets_at].cast("q")
+            self._offsets = self._view[offsets_at:strings_at].cast("I")
+        self._strings = self._view[strings_at:]
+
+    @staticmethod
+    def _swapped(typecode, view):
+        data = array(typecode)
+        data.frombytes(view)
+        data.byteswap()
+        return data
+
+    def string_bytes(self, n):
+        """ Chuỗi thứ n dạng memoryview (không chép); phải bỏ đi trước khi close() """
+        return self._strings[self._offsets[n]:self._offsets[n + 1]]
+
+    def string(self, n):
+        return str(self._strings[self._offsets[n]:self._offsets[n + 1]], "utf-8")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if not -len(self.ids) <= index < len(self.ids):
+            raise IndexError(index)
+        return MenuRecord(self, index % len(self.ids))
+
+    def __iter__(self):
+        return (MenuRecord(self, i) for i in range(len(self.ids)))
+
+    def find(self, mon_an_id):
+        """ Món có id mon_an_id (tìm nhị phân trên mảng id), hoặc None """
+        index = bisect_left(self.ids, mon_an_id)
+        if index < len(self.ids) and self.ids[index] == mon_an_id:
+            return MenuRecord(self, index)
+        return None
+
+    def get_mon_an(self, page=1, items_per_page=8):
+        """ Một trang thực đơn, cùng kết quả với database.get_mon_an """
+        start = (page - 1) * items_per_page
+        return [MenuRecord(self, i).as_tuple() for i in range(start, min(start + items_per_page, len(self.ids)))]
+
+    def prices_by_id(self):
+        return dict(zip(self.ids, self.prices))
+
+    def close(self):
+        for view in (getattr(self, name, None) for name in ("ids", "prices", "_offsets", "_strings", "_view")):
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def load(path=SNAPSHOT_PATH, check=True):
+    """
+    Mở ảnh chụp thực đơn; xuất lại từ database nếu file chưa có, hỏng, hoặc (khi check)
+    phiên bản khác menu_version. Trả về None (nơi gọi đọc thẳng database) nếu không đọc được file
+    và cũng không xuất lại được.
+    """
+    snapshot = None
+    try:
+        snapshot = MenuSnapshot(path)
+    except (OSError, SnapshotError):
+        pass
+    if snapshot is not None and (not check or snapshot.version == database.get_menu_version()):
+        return snapshot
+    if snapshot is not None:
+        # Phải bỏ ánh xạ trước khi thay file (Windows không cho thay file đang được mmap)
+        snapshot.close()
+    try:
+        version = export(path)
+    except (OverflowError, OSError) as e:
+        print(f"Không xuất được ảnh chụp thực đơn: {e}")
+        return None
+    if version is None:
+        return None
+    try:
+        return MenuSnapshot(path)
+    except (OSError, SnapshotError) as e:
+        print(f"Không đọc được ảnh chụp thực đơn: {e}")
+        return None
+
+
+_snapshot = None
+
+
+def get_snapshot():
+    """ Ảnh chụp thực đơn dùng chung, kiểm tra phiên bản một lần khi nạp """
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = load()
+    return _snapshot
+
+
+def refresh():
+    """ Kiểm tra lại phiên bản (sau khi thực đơn đổi), trả về ảnh chụp mới nhất """
+    global _snapshot
+    if _snapshot is not None:
+        _snapshot.close()
+        _snapshot = None
+    return get_snapshot()
+
+
+if __name__ == "__main__":
+    # So sánh thời gian từ lúc mở đến khi có trang thực đơn đầu tiên: ảnh chụp và SQLite
+    import tempfile
+
+    os.chdir(tempfile.mkdtemp())
+    database.create_tables()
+    conn = database.create_connection()
+    with conn:
+        conn.executemany("INSERT INTO mon_an (ten_mon, gia, hinh_anh) VALUES (?, ?, ?)",
+                         [(f"Món thử {i}", 20000 + i, f":/pic/mon_{i}.jpg") for i in range(5000)])
+    conn.close()
+    start = time.perf_counter()
+    export()
+    print(f"Xuất {len(database.get_mon_an(1, 10 ** 6))} món: {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{os.path.getsize(SNAPSHOT_PATH) / 1024:.0f} KB")
+    start = time.perf_counter()
+    snapshot = load()
+    page = snapshot.get_mon_an(1, 64)
+    print(f"Ảnh chụp (kiểm tra phiên bản): {(time.perf_counter() - start) * 1000:.2f} ms")
+    snapshot.close()
+    start = time.perf_counter()
+    snapshot = load(check=False)
+    page = snapshot.get_mon_an(1, 64)
+    print(f"Ảnh chụp (không kiểm tra): {(time.perf_counter() - start) * 1000:.2f} ms")
+    start = time.perf_counter()
+    rows = database.get_mon_an(1, 64)
+    print(f"SQLite: {(time.perf_counter() - start) * 1000:.2f} ms")
+    assert page == rows
+    assert snapshot.find(rows[5][0]).ten_mon == rows[5][1]
+    snapshot.close()
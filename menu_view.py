@@ -0,0 +1,225 @@
+# menu_view.py
+# Menu món ăn dạng model/view thay cho các QLabel/QPushButton đặt tay trong page_1..page_4.
+# Model đọc bảng mon_an theo từng trang (fetchMore) và delegate tự vẽ ảnh, tên, giá
+# và nút "+", nên chỉ các ô đang hiển thị mới được vẽ, không tốn widget cho mỗi món.
+import sys
+
+from qt_compat import QtCore, QtGui, QtWidgets, load_resources
+
+import database
+import lan_api
+import menu_snapshot
+
+load_resources()
+
+TILE_WIDTH = 220
+TILE_HEIGHT = 260
+IMAGE_HEIGHT = 170
+PLUS_SIZE = 36
+PAGE_SIZE = 64
+
+ID_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+PRICE_ROLE = QtCore.Qt.ItemDataRole.UserRole + 2
+IMAGE_ROLE = QtCore.Qt.ItemDataRole.UserRole + 3
+
+
+class MenuModel(QtCore.QAbstractListModel):
+    def __init__(self, parent=None, page_size=PAGE_SIZE):
+        """ Model danh sách món ăn, nạp dần từng trang từ database khi cuộn tới """
+        super().__init__(parent)
+        self.page_size = page_size
+        self._rows = []  # (id, ten_mon, gia, hinh_anh)
+        self._next_page = 1
+        self._exhausted = False
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        mon_id, ten_mon, gia, hinh_anh = self._rows[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return ten_mon
+        if role == ID_ROLE:
+            return mon_id
+        if role == PRICE_ROLE:
+            return gia
+        if role == IMAGE_ROLE:
+            return hinh_anh
+        return None
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        """ Nạp thêm một trang món ăn khi view cần hiển thị thêm """
+        # Chế độ máy trạm mỏng đọc thực đơn qua LAN API (xem lan_api.py), ngược lại đọc từ
+        # ảnh chụp mmap (xem menu_snapshot.py); database chỉ là phương án cuối
+        source = lan_api.get_client() or menu_snapshot.get_snapshot() or database
+        rows = source.get_mon_an(self._next_page, self.page_size)
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            return
+        self._next_page += 1
+        first = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def reload(self):
+        """ Xóa dữ liệu đã nạp để đọc lại từ đầu (sau khi thực đơn thay đổi) """
+        if lan_api.get_client() is None:
+            menu_snapshot.refresh()
+        self.beginResetModel()
+        self._rows = []
+        self._next_page = 1
+        self._exhausted = False
+        self.endResetModel()
+
+
+class MenuDelegate(QtWidgets.QStyledItemDelegate):
+    add_clicked = QtCore.pyqtSignal(int)
+
+    def sizeHint(self, option, index):
+        return QtCore.QSize(TILE_WIDTH, TILE_HEIGHT)
+
+    def _plus_rect(self, rect):
+        return QtCore.QRect(rect.right() - PLUS_SIZE - 8, rect.bottom() - PLUS_SIZE - 8,
+                            PLUS_SIZE, PLUS_SIZE)
+
+    def _pixmap(self, path, size):
+        """ Lấy ảnh đã thu nhỏ từ QPixmapCache, chỉ scale một lần cho mỗi ảnh """
+        key = f"menu:{path}:{size.width()}x{size.height()}"
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QtGui.QPixmap(path)
+            if not pixmap.isNull():
+                pixmap = pixmap.scaled(size, QtCore.Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                       QtCore.Qt.TransformationMode.SmoothTransformation)
+                QtGui.QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        rect = option.rect.adjusted(6, 6, -6, -6)
+
+        # Nền ô
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(QtGui.QColor("#ffe5b4"))
+        painter.drawRoundedRect(rect, 12, 12)
+
+        # Ảnh món ăn
+        image_rect = QtCore.QRect(rect.left(), rect.top(), rect.width(), IMAGE_HEIGHT)
+        pixmap = self._pixmap(index.data(IMAGE_ROLE), image_rect.size())
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(image_rect, pixmap, QtCore.QRect(0, 0, image_rect.width(), image_rect.height()))
+
+        # Tên và giá
+        text_rect = QtCore.QRect(rect.left() + 10, image_rect.bottom() + 6,
+                                 rect.width() - PLUS_SIZE - 26, rect.bottom() - image_rect.bottom() - 12)
+        painter.setPen(QtGui.QColor("#4e342e"))
+        font = QtGui.QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        gia = index.data(PRICE_ROLE) or 0
+        painter.drawText(text_rect, QtCore.Qt.TextFlag.TextWordWrap,
+                         f"{index.data(QtCore.Qt.ItemDataRole.DisplayRole)}\n{gia // 1000}K")
+
+        # Nút "+"
+        plus_rect = self._plus_rect(rect)
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(QtGui.QColor("#C62828"))
+        painter.drawEllipse(plus_rect)
+        painter.setPen(QtGui.QColor("white"))
+        painter.drawText(plus_rect, QtCore.Qt.AlignmentFlag.AlignCenter, "+")
+
+        if option.state & QtWidgets.QStyle.StateFlag.State_MouseOver:
+            painter.setPen(QtGui.QPen(QtGui.QColor("#d2b48c"), 2))
+            painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+            painter.drawRoundedRect(rect, 12, 12)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """ Bắt cú bấm vào vùng nút "+" để phát tín hiệu thêm món vào giỏ """
+        if event.type() == QtCore.QEvent.Type.MouseButtonRelease:
+            if self._plus_rect(option.rect.adjusted(6, 6, -6, -6)).contains(event.pos()):
+                self.add_clicked.emit(index.data(ID_ROLE))
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class MenuView(QtWidgets.QListView):
+    def __init__(self, parent=None):
+        """ Lưới món ăn: ô cùng kích thước, chỉ vẽ những ô nằm trong vùng nhìn thấy """
+        super().__init__(parent)
+        self.setViewMode(QtWidgets.QListView.ViewMode.IconMode)
+        self.setFlow(QtWidgets.QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
+        self.setMovement(QtWidgets.QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QtWidgets.QListView.LayoutMode.Batched)
+        self.setBatchSize(PAGE_SIZE)
+        self.setGridSize(QtCore.QSize(TILE_WIDTH, TILE_HEIGHT))
+        self.setMouseTracking(True)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setStyleSheet("background-color: rgb(255, 245, 225); border: none;")
+
+        self.menu_model = MenuModel(self)
+        self.menu_delegate = MenuDelegate(self)
+        self.setModel(self.menu_model)
+        self.setItemDelegate(self.menu_delegate)
+
+
+class Ui_Dialog(object):
+    """ Màn hình menu dùng MenuView, cùng giao diện setupUi với các màn hình pyuic5 """
+
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1220, 801)
+        layout = QtWidgets.QGridLayout(Dialog)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        header = QtWidgets.QLabel("Chicky", Dialog)
+        header.setFixedHeight(120)
+        header.setStyleSheet("background-color: #D32F2F; color: white; font-size: 37pt;"
+                             " font-weight: bold; padding-left: 130px;")
+        layout.addWidget(header, 0, 0, 1, 2)
+
+        sidebar = QtWidgets.QWidget(Dialog)
+        sidebar.setFixedWidth(221)
+        sidebar.setStyleSheet("background-color: #C62828;")
+        side_layout = QtWidgets.QVBoxLayout(sidebar)
+        side_layout.setContentsMargins(0, 0, 0, 0)
+        self.mon_an = QtWidgets.QPushButton("🍰Menu món ăn ", sidebar)
+        self.mon_an.setObjectName("mon_an")
+        self.mon_an.setMinimumHeight(100)
+        self.gio_hang = QtWidgets.QPushButton("🛒Giỏ hàng", sidebar)
+        self.gio_hang.setObjectName("gio_hang")
+        self.gio_hang.setMinimumHeight(90)
+        self.best_seller = QtWidgets.QPushButton("Best Seller🔥", sidebar)
+        self.best_seller.setObjectName("best_seller")
+        self.best_seller.setMinimumHeight(90)
+        side_layout.addWidget(self.mon_an)
+        side_layout.addWidget(self.gio_hang)
+        side_layout.addWidget(self.best_seller)
+        side_layout.addStretch(1)
+        layout.addWidget(sidebar, 1, 0)
+
+        self.menu_view = MenuView(Dialog)
+        self.menu_view.setObjectName("menu_view")
+        layout.addWidget(self.menu_view, 1, 1)
+
+
+if __name__ == "__main__":
+    app = QtWidgets.QApplication(sys.argv)
+    view = MenuView()
+    view.menu_delegate.add_clicked.connect(lambda mon_id: database.add_to_cart(1, mon_id))
+    view.resize(1000, 680)
+    view.show()
+    sys.exit(app.exec())
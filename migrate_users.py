@@ -0,0 +1,113 @@
+# migrate_users.py
+# Gộp bảng users của users.db (db.py) vào bảng users của foodie.db (database.py) để ứng dụng
+# chỉ mở một file database.
+#   python migrate_users.py [users.db] [--chunk 500] [--report users_conflicts.csv]
+# Người dùng được đọc theo từng lô (fetchmany) nên bộ nhớ không phụ thuộc số người dùng, mỗi
+# lô được ghi trong một transaction. Trùng username: nếu cùng mật khẩu thì coi là một người,
+# khác thì giữ bản trong foodie.db và ghi vào báo cáo xung đột. Dòng thiếu username hoặc mật
+# khẩu (users.db cho phép NULL) cũng được ghi vào báo cáo. Mật khẩu được chép nguyên trạng và
+# băm lại ở lần đăng nhập đúng đầu tiên (xem passwords.py).
+import csv
+import os
+import sqlite3
+import sys
+
+import database
+import passwords
+
+LEGACY_DB = "users.db"
+CHUNK_SIZE = 500
+REPORT_PATH = "users_conflicts.csv"
+
+
+class MigrationReport:
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.conflicts = []  # (id trong users.db, username, lý do)
+
+    def write_csv(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(("legacy_id", "username", "reason"))
+            writer.writerows(self.conflicts)
+
+    def summary(self):
+        return (f"Đọc {self.read}, thêm {self.inserted}, trùng {self.duplicates}, "
+                f"xung đột {len(self.conflicts)}")
+
+
+def _same_user(password, stored):
+    """ Mật khẩu trong users.db khớp với mật khẩu (đã băm hoặc chưa) trong foodie.db """
+    return password == stored or passwords.verify_password(password, stored)
+
+
+def migrate(legacy_path=LEGACY_DB, chunk_size=CHUNK_SIZE):
+    """ Chép users từ legacy_path vào foodie.db theo lô, trả về MigrationReport """
+    report = MigrationReport()
+    database.create_tables()
+    source = sqlite3.connect(legacy_path)
+    target = database.create_connection()
+    try:
+        rows = source.execute("SELECT id, ho, ten, sdt, username, password FROM users ORDER BY id")
+        while True:
+            chunk = rows.fetchmany(chunk_size)
+            if not chunk:
+                break
+            report.read += len(chunk)
+            usernames = [row[4] for row in chunk if row[4]]
+            existing = dict(target.execute(
+                f"SELECT username, password FROM users WHERE username IN ({','.join('?' * len(usernames))})",
+                usernames).fetchall()) if usernames else {}
+            inserts = []
+            for legacy_id, ho, ten, sdt, username, password in chunk:
+                if not username:
+                    report.conflicts.append((legacy_id, username, "thiếu username"))
+                elif not password:
+                    report.conflicts.append((legacy_id, username, "thiếu mật khẩu"))
+                elif username in existing:
+                    if _same_user(password, existing[username]):
+                        report.duplicates += 1
+                    else:
+                        report.conflicts.append((legacy_id, username, "username đã có với mật khẩu khác"))
+                else:
+                    # foodie.db không cho phép NULL ở ho, ten, sdt
+                    inserts.append((username, password, ho or "", ten or "", sdt or ""))
+                    existing[username] = password
+            with target:
+                target.executemany("INSERT INTO users (username, password, ho, ten, sdt) VALUES (?, ?, ?, ?, ?)",
+                                   inserts)
+            report.inserted += len(inserts)
+    finally:
+        source.close()
+        target.close()
+    return report
+
+
+def main(args):
+    legacy_path = LEGACY_DB
+    chunk_size = CHUNK_SIZE
+    report_path = REPORT_PATH
+    rest = list(args)
+    while rest:
+        arg = rest.pop(0)
+        if arg == "--chunk":
+            chunk_size = int(rest.pop(0))
+        elif arg == "--report":
+            report_path = rest.pop(0)
+        else:
+            legacy_path = arg
+    if not os.path.exists(legacy_path):
+        print(f"Không tìm thấy {legacy_path}, không có gì để chuyển")
+        return 0
+    report = migrate(legacy_path, chunk_size)
+    print(report.summary())
+    if report.conflicts:
+        report.write_csv(report_path)
+        print(f"Danh sách xung đột: {report_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
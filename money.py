@@ -0,0 +1,129 @@
+# money.py
+# Tiền được lưu và tính bằng số nguyên đơn vị nhỏ nhất (đồng), giống cột gia INTEGER của database.py.
+# Cộng và nhân với số lượng trên số nguyên luôn chính xác. Chỉ làm tròn một lần, khi đổi số thực
+# sang số nguyên (to_minor, làm tròn nửa lên). Chuỗi người dùng nhập (parse) có phần lẻ nhỏ hơn
+# đơn vị nhỏ nhất thì bị từ chối thay vì làm tròn.
+# SUM trên cột INTEGER của SQLite và phép cộng np.int64 cho kết quả chính xác. Cột REAL và float64
+# thì cộng dồn sai số (xem benchmark ở cuối file).
+import re
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+CURRENCY = "đ"
+MINOR_UNITS = 1  # số đơn vị nhỏ nhất trong một đồng (VND không có hào / xu lẻ)
+
+_GROUPED = re.compile(r"^[+-]?\d{1,3}([.,]\d{3})+$")  # "250.000" / "1,250,000"
+_SYMBOLS = re.compile(r"\s|đ|₫|vnd", re.IGNORECASE)
+
+
+def to_minor(value):
+    """ Số tiền (int, float, str, Decimal) -> số nguyên đơn vị nhỏ nhất; ValueError nếu không hợp lệ """
+    if isinstance(value, bool):
+        raise ValueError(f"Số tiền không hợp lệ: {value!r}")
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    try:
+        # repr(float) là số thập phân ngắn nhất của giá trị đó (0.1 -> "0.1"), tránh đuôi nhị phân
+        amount = Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"Số tiền không hợp lệ: {value!r}") from None
+    if not amount.is_finite():
+        raise ValueError(f"Số tiền không hợp lệ: {value!r}")
+    return int((amount * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def parse(text):
+    """
+    Chuỗi người dùng nhập -> số nguyên đơn vị nhỏ nhất.
+    Chấp nhận "250000", "250.000", "250,000 đ", "250000.0"; dấu chấm / phẩy chia nhóm 3 chữ số là
+    dấu phân cách hàng nghìn. ValueError nếu không đọc được hoặc có phần lẻ nhỏ hơn đơn vị nhỏ nhất
+    (với VND: "250.5").
+    """
+    text = _SYMBOLS.sub("", text)
+    if _GROUPED.match(text):
+        text = text.replace(".", "").replace(",", "")
+    try:
+        amount = Decimal(text) * MINOR_UNITS
+    except InvalidOperation:
+        raise ValueError(f"Số tiền không hợp lệ: {text!r}") from None
+    if amount.is_finite() and amount != amount.to_integral_value():
+        raise ValueError(f"Số tiền lẻ hơn đơn vị nhỏ nhất: {text!r}")
+    return to_minor(text)
+
+
+def to_major(minor):
+    """ Số nguyên đơn vị nhỏ nhất -> Decimal theo đồng (chính xác, để xuất báo cáo) """
+    return Decimal(minor) / MINOR_UNITS
+
+
+def format_vnd(minor):
+    """ 250000 -> "250,000 đ" """
+    return f"{to_major(minor):,} {CURRENCY}"
+
+
+if __name__ == "__main__":
+    # SUM / gộp theo sản phẩm trên tiền REAL-float64 so với INTEGER-int64, cùng một bộ dòng hóa đơn.
+    # Dòng hóa đơn có thuế 8% (giá lẻ đồng khi tính bằng số thực), như hóa đơn mỹ phẩm cũ.
+    import random
+    import sqlite3
+    import time
+
+    import numpy as np
+
+    random.seed(1)
+    n, products = 1_000_000, 2_000
+    product_ids = [random.randint(1, products) for _ in range(n)]
+    real_amounts = [random.randint(10_000, 2_000_000) * 1.08 * random.randint(1, 3) for _ in range(n)]
+    int_amounts = [to_minor(amount) for amount in real_amounts]
+    exact = sum(Decimal(repr(amount)) for amount in real_amounts)
+    print(f"{n} dòng hóa đơn, tổng chính xác (Decimal của các số thực): {exact}")
+    # Cùng các số, cộng theo thứ tự khác: float cho kết quả khác nhau, int thì không
+    print(f"Python float: xuôi {sum(real_amounts)!r}, ngược {sum(reversed(real_amounts))!r}; "
+          f"int: xuôi {sum(int_amounts)}, ngược {sum(reversed(int_amounts))}")
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE real_items (product_id INTEGER, subtotal REAL)")
+    conn.execute("CREATE TABLE int_items (product_id INTEGER, subtotal INTEGER)")
+    conn.executemany("INSERT INTO real_items VALUES (?, ?)", zip(product_ids, real_amounts))
+    conn.executemany("INSERT INTO int_items VALUES (?, ?)", zip(product_ids, int_amounts))
+    for table in ("real_items", "int_items"):
+        start = time.perf_counter()
+        for _ in range(5):
+            total = conn.execute(f"SELECT SUM(subtotal) FROM {table}").fetchone()[0]
+        sum_ms = (time.perf_counter() - start) * 200
+        start = time.perf_counter()
+        rollup = conn.execute(f"SELECT product_id, SUM(subtotal) FROM {table} GROUP BY product_id").fetchall()
+        rollup_ms = (time.perf_counter() - start) * 1000
+        drift = sum(value for _, value in rollup) - total
+        print(f"SQLite {table}: SUM {sum_ms:.1f} ms = {total!r}, GROUP BY {rollup_ms:.1f} ms "
+              f"(tổng các nhóm lệch {drift!r} so với SUM)")
+    conn.close()
+
+    ids = np.array(product_ids, dtype=np.int64)
+    # Thứ tự theo sản phẩm chỉ cần tính một lần (như chỉ mục product_id trên sale_items)
+    order = np.argsort(ids, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(ids[order]) != 0])
+    int_values = np.array(int_amounts, dtype=np.int64)
+    int_by_product = int_values[order]
+    for name, values in (("float64", np.array(real_amounts)), ("int64", int_values)):
+        start = time.perf_counter()
+        for _ in range(20):
+            total = values.sum()
+        sum_ms = (time.perf_counter() - start) * 50
+        start = time.perf_counter()
+        for _ in range(20):
+            if values.dtype == np.int64:
+                # Gộp theo sản phẩm bằng cộng dồn số nguyên (bincount luôn tính bằng float64)
+                rollup = np.add.reduceat(int_by_product, starts)
+            else:
+                rollup = np.bincount(ids, weights=values)
+        rollup_ms = (time.perf_counter() - start) * 50
+        print(f"NumPy {name}: sum {sum_ms:.2f} ms = {total!r}, gộp theo sản phẩm {rollup_ms:.1f} ms "
+              f"(tổng các nhóm lệch {rollup.sum() - total!r})")
+    assert int(rollup.sum()) == int(total) == sum(int_amounts)
+    assert parse("250.000đ") == parse("250,000 đ") == parse("250000.0") == 250000
+    for fractional in ("250.5", "0.4", "1,5"):
+        try:
+            parse(fractional)
+        except ValueError:
+            continue
+        raise AssertionError(f"parse({fractional!r}) phải từ chối phần lẻ")
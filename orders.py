@@ -0,0 +1,215 @@
+# orders.py
+# Nhận đơn từ nhiều bàn cùng lúc.
+# SQLite chỉ cho một tiến trình ghi tại một thời điểm, nên thay vì để mỗi bàn tự mở
+# kết nối rồi tranh khóa, mọi yêu cầu đặt đơn đi qua một hàng đợi có giới hạn và một
+# luồng ghi duy nhất. Màn hình chỉ nhận về Future và không bị chặn.
+# Đơn đã đặt được giữ trong hàng đợi theo từng bàn (chon_ban) để bếp/thu ngân xử lý.
+# Mỗi lần xác nhận mang một request_key: bấm đúp hay thử lại sau khi hết thời gian chờ
+# nhận lại đúng đơn đã tạo (từ bộ nhớ, hoặc từ bảng order_requests) thay vì tạo đơn mới.
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+import cart_service
+import combos
+import database
+
+TABLE_COUNT = 12
+MAX_PENDING = 256
+PAYMENT_METHODS = ("tien_mat", "chuyen_khoan")
+RECENT_REQUESTS = 1024
+SWEEP_INTERVAL = 600  # giây giữa hai lần xóa request_key hết hạn
+
+
+class OrderQueueFull(Exception):
+    """ Có quá nhiều yêu cầu đặt đơn đang chờ ghi """
+
+
+class OrderFailed(Exception):
+    """ Không ghi được đơn xuống database (khác với giỏ trống) """
+
+
+class OrderService:
+    def __init__(self, table_count=TABLE_COUNT, max_pending=MAX_PENDING):
+        """ Khởi tạo hàng đợi theo bàn và luồng ghi đơn hàng """
+        self.table_count = table_count
+        self._requests = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        # table_no -> deque các order (dict) đang mở theo thứ tự đặt
+        self._tables = {table_no: deque() for table_no in range(1, table_count + 1)}
+        self._listeners = []
+        # request_key -> Future của các lần xác nhận gần đây (LRU)
+        self._recent = OrderedDict()
+        self.duplicate_count = 0
+        self.placed_count = 0
+        self.max_latency_ms = 0.0
+        self._load_open_orders()
+
+        self._worker = threading.Thread(target=self._run, name="order-writer", daemon=True)
+        self._worker.start()
+
+    def _load_open_orders(self):
+        """ Nạp lại các đơn chưa xong từ database (khi khởi động lại ứng dụng) """
+        for order_id, user_id, table_no, payment_method, total, status, created_at in database.get_open_orders():
+            self._tables.setdefault(table_no, deque()).append({
+                "id": order_id, "user_id": user_id, "table_no": table_no,
+                "payment_method": payment_method, "total": total, "status": status,
+            })
+
+    def submit(self, user_id, table_no, payment_method, request_key=None):
+        """
+        Gửi yêu cầu chuyển giỏ hàng của user_id thành đơn cho bàn table_no, trả về Future.
+        Gửi lại cùng request_key trả về Future của lần gửi đầu (không ghi gì thêm).
+        """
+        if table_no not in self._tables:
+            raise ValueError(f"Bàn {table_no} không tồn tại")
+        if payment_method not in PAYMENT_METHODS:
+            raise ValueError(f"Phương thức thanh toán không hợp lệ: {payment_method}")
+        with self._lock:
+            future = self._recent.get(request_key) if request_key is not None else None
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._recent.move_to_end(request_key)
+                self.duplicate_count += 1
+                return future
+            future = Future()
+            if request_key is not None:
+                self._recent[request_key] = future
+                while len(self._recent) > RECENT_REQUESTS:
+                    self._recent.popitem(last=False)
+        try:
+            self._requests.put_nowait((user_id, table_no, payment_method, request_key,
+                                       future, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self._recent.pop(request_key, None)
+            raise OrderQueueFull("Hệ thống đang bận, vui lòng thử lại")
+        return future
+
+    def place_order(self, user_id, table_no, payment_method, timeout=None, request_key=None):
+        """ Đặt đơn và chờ kết quả; trả về dict đơn hàng, None nếu giỏ trống, ném OrderFailed nếu lỗi ghi """
+        return self.submit(user_id, table_no, payment_method, request_key).result(timeout)
+
+    def _run(self):
+        last_sweep = time.monotonic()
+        while True:
+            try:
+                request = self._requests.get(timeout=SWEEP_INTERVAL)
+            except queue.Empty:
+                request = ()
+            if time.monotonic() - last_sweep >= SWEEP_INTERVAL:
+                # Dọn request_key hết hạn trên chính luồng ghi để không tranh khóa SQLite
+                database.purge_order_requests()
+                last_sweep = time.monotonic()
+            if request is None:
+                break
+            if not request:
+                continue
+            user_id, table_no, payment_method, request_key, future, submitted = request
+            try:
+                order = self._place(user_id, table_no, payment_method, request_key)
+                latency_ms = (time.perf_counter() - submitted) * 1000
+                self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+                future.set_result(order)
+            except Exception as e:
+                future.set_exception(e)
+
+    def _place(self, user_id, table_no, payment_method, request_key=None):
+        if request_key is not None:
+            # Đã đặt trước đó (ví dụ trước khi khởi động lại): trả về đơn cũ, không phát "placed"
+            order_id = database.get_order_for_request(request_key)
+            if order_id is not None:
+                with self._lock:
+                    self.duplicate_count += 1
+                return self._order_dict(order_id)
+        cart = cart_service.get_cart(user_id)
+        # Giá combo tính trên giỏ đã khóa, ngay trước khi chuyển thành đơn
+        try:
+            order_id = cart.checkout(lambda: database.place_order(
+                user_id, table_no, payment_method, request_key, combos.get_pricer().price(cart.items).savings))
+        except database.Error as e:
+            raise OrderFailed(f"Không ghi được đơn: {e}") from e
+        if order_id is None:
+            return None
+        order = self._order_dict(order_id)
+        with self._lock:
+            self._tables[table_no].append(order)
+            self.placed_count += 1
+        self._notify("placed", order)
+        return order
+
+    def _order_dict(self, order_id):
+        order, _ = database.get_order(order_id)
+        return {
+            "id": order_id, "user_id": order[1], "table_no": order[2],
+            "payment_method": order[3], "total": order[4], "status": order[5],
+        }
+
+    def subscribe(self, listener):
+        """ listener(event, order) được gọi khi có đơn mới hoặc đơn đổi trạng thái """
+        self._listeners.append(listener)
+
+    def _notify(self, event, order):
+        for listener in list(self._listeners):
+            listener(event, order)
+
+    def orders_for_table(self, table_no):
+        """ Các đơn đang mở của một bàn theo thứ tự đặt """
+        with self._lock:
+            return list(self._tables.get(table_no, ()))
+
+    def next_order(self, table_no):
+        """ Đơn cũ nhất chưa xong của bàn (None nếu không có) """
+        with self._lock:
+            orders = self._tables.get(table_no)
+            return orders[0] if orders else None
+
+    def set_status(self, order_id, table_no, status):
+        """ Đổi trạng thái đơn; đơn xong/hủy được bỏ khỏi hàng đợi của bàn """
+        if not database.set_order_status(order_id, status):
+            return False
+        with self._lock:
+            orders = self._tables.get(table_no, deque())
+            for order in orders:
+                if order["id"] == order_id:
+                    order["status"] = status
+                    if status in ("da_xong", "da_huy"):
+                        orders.remove(order)
+                    break
+            else:
+                order = {"id": order_id, "table_no": table_no, "status": status}
+        self._notify("status", order)
+        return True
+
+    def stop(self):
+        self._requests.put(None)
+        self._worker.join()
+
+
+_service = None
+
+
+def get_service():
+    """ OrderService dùng chung trong tiến trình """
+    global _service
+    if _service is None:
+        _service = OrderService()
+    return _service
+
+
+if __name__ == "__main__":
+    # Mô phỏng 12 bàn đặt đơn cùng lúc và đo độ trễ, trên database tạm (không ghi vào foodie.db thật)
+    import os
+    import tempfile
+
+    os.chdir(tempfile.mkdtemp())
+    database.create_tables()
+    service = get_service()
+    for table_no in range(1, TABLE_COUNT + 1):
+        cart_service.get_cart(1000 + table_no).add(1, 2)
+    start = time.perf_counter()
+    futures = [service.submit(1000 + t, t, "tien_mat") for t in range(1, TABLE_COUNT + 1)]
+    placed = [f.result() for f in futures]
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{len(placed)} đơn trong {elapsed:.1f} ms, độ trễ lớn nhất {service.max_latency_ms:.1f} ms")
@@ -6,9 +6,11 @@
 #
 # WARNING: Any manual changes made to this file will be lost when pyuic5 is
 # run again.  Do not edit this file unless you know what you are doing.
+# Post-processed by build_ui.py to run on qt_compat.
 
 
-from PyQt5 import QtCore, QtGui, QtWidgets
+from qt_compat import QtCore, QtGui, QtWidgets, load_resources
+import theme
 
 
 class Ui_Dialog(object):
@@ -17,100 +19,48 @@ class Ui_Dialog(object):
         Dialog.resize(1220, 801)
         self.label_5 = QtWidgets.QLabel(Dialog)
         self.label_5.setGeometry(QtCore.QRect(0, 120, 221, 681))
-        font = QtGui.QFont()
-        font.setPointSize(15)
-        font.setBold(True)
-        font.setWeight(75)
-        self.label_5.setFont(font)
-        self.label_5.setStyleSheet("background-color: #C62828\n"
-"")
+        self.label_5.setFont(theme.font(pointSize=15, bold=True))
+        self.label_5.setProperty("themeRole", "s10229903")
         self.label_5.setText("")
         self.label_5.setObjectName("label_5")
         self.mon_an = QtWidgets.QPushButton(Dialog)
         self.mon_an.setGeometry(QtCore.QRect(-10, 120, 231, 101))
-        font = QtGui.QFont()
-        font.setPointSize(15)
-        font.setBold(True)
-        font.setWeight(75)
-        self.mon_an.setFont(font)
-        self.mon_an.setStyleSheet("")
+        self.mon_an.setFont(theme.font(pointSize=15, bold=True))
         self.mon_an.setObjectName("mon_an")
         self.gio_hang = QtWidgets.QPushButton(Dialog)
         self.gio_hang.setGeometry(QtCore.QRect(-10, 210, 231, 91))
-        font = QtGui.QFont()
-        font.setPointSize(15)
-        font.setBold(True)
-        font.setWeight(75)
-        self.gio_hang.setFont(font)
-        self.gio_hang.setStyleSheet("")
+        self.gio_hang.setFont(theme.font(pointSize=15, bold=True))
         self.gio_hang.setObjectName("gio_hang")
         self.label_4 = QtWidgets.QLabel(Dialog)
         self.label_4.setGeometry(QtCore.QRect(30, 20, 91, 91))
-        self.label_4.setStyleSheet("border-image: url(:/pic/logoss.png);")
+        self.label_4.setProperty("themeRole", "sa0693a71")
         self.label_4.setText("")
         self.label_4.setObjectName("label_4")
         self.tim_kiem = QtWidgets.QLineEdit(Dialog)
         self.tim_kiem.setGeometry(QtCore.QRect(360, 40, 281, 51))
-        font = QtGui.QFont()
-        font.setPointSize(-1)
-        self.tim_kiem.setFont(font)
-        self.tim_kiem.setStyleSheet("QLineEdit {\n"
-"    border: 2px solid white;\n"
-"    border-radius: 20px;\n"
-"    padding: 6px 12px;\n"
-"    background-color: #f9f9f9;\n"
-"    font-size: 14px;\n"
-"    color: #333;\n"
-"}\n"
-"\n"
-"QLineEdit:focus {\n"
-"    border: 2px solid white;  /* vẫn là trắng khi focus */\n"
-"}\n"
-"")
+        self.tim_kiem.setFont(theme.font(pointSize=-1))
+        self.tim_kiem.setProperty("themeRole", "s2ec2a732")
         self.tim_kiem.setText("")
         self.tim_kiem.setObjectName("tim_kiem")
         self.label_3 = QtWidgets.QLabel(Dialog)
         self.label_3.setGeometry(QtCore.QRect(130, 10, 211, 101))
-        font = QtGui.QFont()
-        font.setPointSize(37)
-        font.setBold(True)
-        font.setWeight(75)
-        self.label_3.setFont(font)
-        self.label_3.setStyleSheet("QLabel {\n"
-"    color: white;\n"
-"    background-color: transparent;  /* làm nền trong suốt nếu muốn */            /* tùy chỉnh cỡ chữ nếu cần */\n"
-"    font-weight: bold;              /* chữ đậm */\n"
-"}\n"
-"")
+        self.label_3.setFont(theme.font(pointSize=37, bold=True))
+        self.label_3.setProperty("themeRole", "s28a0c2f6")
         self.label_3.setObjectName("label_3")
         self.label_2 = QtWidgets.QLabel(Dialog)
         self.label_2.setGeometry(QtCore.QRect(0, 0, 1231, 121))
-        font = QtGui.QFont()
-        font.setFamily("Microsoft YaHei UI")
-        font.setPointSize(35)
-        font.setBold(True)
-        font.setWeight(75)
-        self.label_2.setFont(font)
-        self.label_2.setStyleSheet("background-color: #D32F2F")
+        self.label_2.setFont(theme.font(family="Microsoft YaHei UI", pointSize=35, bold=True))
+        self.label_2.setProperty("themeRole", "s82c31d20")
         self.label_2.setText("")
         self.label_2.setObjectName("label_2")
         self.label_6 = QtWidgets.QLabel(Dialog)
         self.label_6.setGeometry(QtCore.QRect(220, 120, 1001, 681))
-        self.label_6.setStyleSheet("background-color: rgb(255, 245, 225);")
+        self.label_6.setProperty("themeRole", "sca96ddb9")
         self.label_6.setText("")
         self.label_6.setObjectName("label_6")
         self.label_55 = QtWidgets.QLabel(Dialog)
         self.label_55.setGeometry(QtCore.QRect(620, 160, 181, 61))
-        self.label_55.setStyleSheet("QLabel {\n"
-"    background-color: #d2b48c;  /* Nâu nhạt (beige) */\n"
-"    color: #4e342e;              /* Nâu đậm cho chữ */\n"
-"    font-size: 20px;\n"
-"    font-weight: bold;\n"
-"    padding: 10px 20px;\n"
-"    border-radius: 12px;\n"
-"    qproperty-alignment: AlignCenter;\n"
-"}\n"
-"")
+        self.label_55.setProperty("themeRole", "s60d1c9d4")
         self.label_55.setObjectName("label_55")
         self.horizontalLayoutWidget_8 = QtWidgets.QWidget(Dialog)
         self.horizontalLayoutWidget_8.setGeometry(QtCore.QRect(630, 720, 175, 43))
@@ -121,115 +71,53 @@ class Ui_Dialog(object):
         self.horizontalLayout_112 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_112.setObjectName("horizontalLayout_112")
         self.page1 = QtWidgets.QPushButton(self.horizontalLayoutWidget_8)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        font.setBold(False)
-        font.setWeight(50)
-        self.page1.setFont(font)
-        self.page1.setStyleSheet("QPushButton {\n"
-"    width: 35px;            /* Chiều rộng của button */\n"
-"    height: 35px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,255,255);\n"
-"    color: black;            /* Màu chữ */\n"
-"\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color:  rgb(220,220,220);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.page1.setFont(theme.font(pointSize=12, bold=False))
+        self.page1.setProperty("themeRole", "s7db604fe")
         self.page1.setObjectName("page1")
         self.horizontalLayout_112.addWidget(self.page1)
         self.horizontalLayout_111.addLayout(self.horizontalLayout_112)
         self.horizontalLayout_113 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_113.setObjectName("horizontalLayout_113")
         self.page2 = QtWidgets.QPushButton(self.horizontalLayoutWidget_8)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.page2.setFont(font)
-        self.page2.setStyleSheet("QPushButton {\n"
-"    width: 35px;            /* Chiều rộng của button */\n"
-"    height: 35px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,255,255);\n"
-"    color: black;            /* Màu chữ */\n"
-"border: 1.5px solid black;   /* Viền đen, dày 2px */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color:   rgb(220,220,220);;; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.page2.setFont(theme.font(pointSize=12))
+        self.page2.setProperty("themeRole", "s3c70eb93")
         self.page2.setObjectName("page2")
         self.horizontalLayout_113.addWidget(self.page2)
         self.horizontalLayout_111.addLayout(self.horizontalLayout_113)
         self.horizontalLayout_114 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_114.setObjectName("horizontalLayout_114")
         self.page3 = QtWidgets.QPushButton(self.horizontalLayoutWidget_8)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.page3.setFont(font)
-        self.page3.setStyleSheet("QPushButton {\n"
-"    width: 35px;            /* Chiều rộng của button */\n"
-"    height: 35px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,255,255);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color:  rgb(220,220,220);;; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.page3.setFont(theme.font(pointSize=12))
+        self.page3.setProperty("themeRole", "sa78fc32b")
         self.page3.setObjectName("page3")
         self.horizontalLayout_114.addWidget(self.page3)
         self.horizontalLayout_111.addLayout(self.horizontalLayout_114)
         self.horizontalLayout_115 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_115.setObjectName("horizontalLayout_115")
         self.page4 = QtWidgets.QPushButton(self.horizontalLayoutWidget_8)
-        font = QtGui.QFont()
-        font.setPointSize(12)
-        self.page4.setFont(font)
-        self.page4.setStyleSheet("QPushButton {\n"
-"    width: 35px;            /* Chiều rộng của button */\n"
-"    height: 35px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,255,255);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color:   rgb(220,220,220);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.page4.setFont(theme.font(pointSize=12))
+        self.page4.setProperty("themeRole", "s7db604fe")
         self.page4.setObjectName("page4")
         self.horizontalLayout_115.addWidget(self.page4)
         self.horizontalLayout_111.addLayout(self.horizontalLayout_115)
         self.label_33 = QtWidgets.QLabel(Dialog)
         self.label_33.setGeometry(QtCore.QRect(510, 480, 170, 170))
-        self.label_33.setStyleSheet("border-image: url(:/pic/khoai_tay_lac.jpg);\n"
-"    border-radius: 20px;  /* bạn có thể chỉnh độ bo tùy ý */\n"
-"\n"
-"\n"
-"")
+        self.label_33.setProperty("themeRole", "s6a737946")
         self.label_33.setText("")
         self.label_33.setObjectName("label_33")
         self.label_56 = QtWidgets.QLabel(Dialog)
         self.label_56.setGeometry(QtCore.QRect(290, 430, 121, 41))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.label_56.setFont(font)
+        self.label_56.setFont(theme.font(pointSize=10))
         self.label_56.setWordWrap(True)
         self.label_56.setObjectName("label_56")
         self.label_57 = QtWidgets.QLabel(Dialog)
         self.label_57.setGeometry(QtCore.QRect(520, 430, 121, 41))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.label_57.setFont(font)
+        self.label_57.setFont(theme.font(pointSize=10))
         self.label_57.setWordWrap(True)
         self.label_57.setObjectName("label_57")
         self.label_66 = QtWidgets.QLabel(Dialog)
         self.label_66.setGeometry(QtCore.QRect(990, 260, 170, 170))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.label_66.setFont(font)
+        self.label_66.setFont(theme.font(pointSize=14))
         self.label_66.setStyleSheet("border-image: url(:/pic/khoai_tay_vua.png);\n"
 "\n"
 "    border-radius: 20px;  /* bạn có thể chỉnh độ bo tùy ý */")
@@ -237,23 +125,11 @@ class Ui_Dialog(object):
         self.label_66.setObjectName("label_66")
         self.khoai_tay_chien_vua_20k = QtWidgets.QPushButton(Dialog)
         self.khoai_tay_chien_vua_20k.setGeometry(QtCore.QRect(1130, 440, 25, 25))
-        self.khoai_tay_chien_vua_20k.setStyleSheet("QPushButton {\n"
-"    width: 25px;            /* Chiều rộng của button */\n"
-"    height: 25px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,140,0);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color: rgb(255, 170, 127);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.khoai_tay_chien_vua_20k.setProperty("themeRole", "s6032560a")
         self.khoai_tay_chien_vua_20k.setObjectName("khoai_tay_chien_vua_20k")
         self.label_64 = QtWidgets.QLabel(Dialog)
         self.label_64.setGeometry(QtCore.QRect(760, 650, 121, 41))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.label_64.setFont(font)
+        self.label_64.setFont(theme.font(pointSize=10))
         self.label_64.setWordWrap(True)
         self.label_64.setObjectName("label_64")
         self.label_34 = QtWidgets.QLabel(Dialog)
@@ -267,136 +143,61 @@ class Ui_Dialog(object):
         self.label_34.setObjectName("label_34")
         self.label_61 = QtWidgets.QLabel(Dialog)
         self.label_61.setGeometry(QtCore.QRect(520, 650, 121, 41))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.label_61.setFont(font)
+        self.label_61.setFont(theme.font(pointSize=10))
         self.label_61.setWordWrap(True)
         self.label_61.setObjectName("label_61")
         self.label_63 = QtWidgets.QLabel(Dialog)
         self.label_63.setGeometry(QtCore.QRect(750, 260, 170, 170))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.label_63.setFont(font)
+        self.label_63.setFont(theme.font(pointSize=14))
         self.label_63.setStyleSheet("border-image: url(:/pic/banh_mi_ga_chien.png);\n"
 "    border-radius: 20px;  /* bạn có thể chỉnh độ bo tùy ý */")
         self.label_63.setText("")
         self.label_63.setObjectName("label_63")
         self.khoai_lac_pho_mai_25k = QtWidgets.QPushButton(Dialog)
         self.khoai_lac_pho_mai_25k.setGeometry(QtCore.QRect(650, 660, 25, 25))
-        self.khoai_lac_pho_mai_25k.setStyleSheet("QPushButton {\n"
-"    width: 25px;            /* Chiều rộng của button */\n"
-"    height: 25px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,140,0);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color: rgb(255, 170, 127);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.khoai_lac_pho_mai_25k.setProperty("themeRole", "s6032560a")
         self.khoai_lac_pho_mai_25k.setObjectName("khoai_lac_pho_mai_25k")
         self.label_65 = QtWidgets.QLabel(Dialog)
         self.label_65.setGeometry(QtCore.QRect(1000, 430, 121, 41))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.label_65.setFont(font)
+        self.label_65.setFont(theme.font(pointSize=10))
         self.label_65.setWordWrap(True)
         self.label_65.setObjectName("label_65")
         self.khoai_chien_trung_muoi_27k = QtWidgets.QPushButton(Dialog)
         self.khoai_chien_trung_muoi_27k.setGeometry(QtCore.QRect(890, 660, 25, 25))
-        self.khoai_chien_trung_muoi_27k.setStyleSheet("QPushButton {\n"
-"    width: 25px;            /* Chiều rộng của button */\n"
-"    height: 25px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,140,0);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color: rgb(255, 170, 127);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.khoai_chien_trung_muoi_27k.setProperty("themeRole", "s6032560a")
         self.khoai_chien_trung_muoi_27k.setObjectName("khoai_chien_trung_muoi_27k")
         self.hamburger_pho_mai_45k = QtWidgets.QPushButton(Dialog)
         self.hamburger_pho_mai_45k.setGeometry(QtCore.QRect(420, 440, 25, 25))
-        self.hamburger_pho_mai_45k.setStyleSheet("QPushButton {\n"
-"    width: 25px;            /* Chiều rộng của button */\n"
-"    height: 25px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,140,0);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color: rgb(255, 170, 127);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.hamburger_pho_mai_45k.setProperty("themeRole", "s6032560a")
         self.hamburger_pho_mai_45k.setObjectName("hamburger_pho_mai_45k")
         self.hamburger_ga_nuong_44k = QtWidgets.QPushButton(Dialog)
         self.hamburger_ga_nuong_44k.setGeometry(QtCore.QRect(650, 440, 25, 25))
-        self.hamburger_ga_nuong_44k.setStyleSheet("QPushButton {\n"
-"    width: 25px;            /* Chiều rộng của button */\n"
-"    height: 25px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,140,0);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color: rgb(255, 170, 127);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.hamburger_ga_nuong_44k.setProperty("themeRole", "s6032560a")
         self.hamburger_ga_nuong_44k.setObjectName("hamburger_ga_nuong_44k")
         self.label_62 = QtWidgets.QLabel(Dialog)
         self.label_62.setGeometry(QtCore.QRect(760, 430, 121, 41))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.label_62.setFont(font)
+        self.label_62.setFont(theme.font(pointSize=10))
         self.label_62.setWordWrap(True)
         self.label_62.setObjectName("label_62")
         self.label_60 = QtWidgets.QLabel(Dialog)
         self.label_60.setGeometry(QtCore.QRect(510, 260, 170, 170))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.label_60.setFont(font)
+        self.label_60.setFont(theme.font(pointSize=14))
         self.label_60.setStyleSheet("border-image: url(:/pic/hamburger_ga_nuong.png);\n"
 "    border-radius: 20px;  /* bạn có thể chỉnh độ bo tùy ý */")
         self.label_60.setText("")
         self.label_60.setObjectName("label_60")
         self.ga_ran_phu_sot_pho_mai_45k = QtWidgets.QPushButton(Dialog)
         self.ga_ran_phu_sot_pho_mai_45k.setGeometry(QtCore.QRect(1130, 660, 25, 25))
-        self.ga_ran_phu_sot_pho_mai_45k.setStyleSheet("QPushButton {\n"
-"    width: 25px;            /* Chiều rộng của button */\n"
-"    height: 25px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,140,0);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color: rgb(255, 170, 127);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.ga_ran_phu_sot_pho_mai_45k.setProperty("themeRole", "s6032560a")
         self.ga_ran_phu_sot_pho_mai_45k.setObjectName("ga_ran_phu_sot_pho_mai_45k")
         self.label_35 = QtWidgets.QLabel(Dialog)
         self.label_35.setGeometry(QtCore.QRect(990, 480, 170, 170))
-        self.label_35.setStyleSheet("border-image: url(:/pic/ga_ran_phu_sot_pho_mai.jpg);\n"
-"\n"
-"    border-radius: 20px;  /* bạn có thể chỉnh độ bo tùy ý */\n"
-"\n"
-"\n"
-"")
+        self.label_35.setProperty("themeRole", "s9772894d")
         self.label_35.setText("")
         self.label_35.setObjectName("label_35")
         self.khoai_tay_chien_lon_28k = QtWidgets.QPushButton(Dialog)
         self.khoai_tay_chien_lon_28k.setGeometry(QtCore.QRect(420, 660, 25, 25))
-        self.khoai_tay_chien_lon_28k.setStyleSheet("QPushButton {\n"
-"    width: 25px;            /* Chiều rộng của button */\n"
-"    height: 25px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,140,0);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color: rgb(255, 170, 127);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.khoai_tay_chien_lon_28k.setProperty("themeRole", "s6032560a")
         self.khoai_tay_chien_lon_28k.setObjectName("khoai_tay_chien_lon_28k")
         self.label_32 = QtWidgets.QLabel(Dialog)
         self.label_32.setGeometry(QtCore.QRect(280, 480, 170, 170))
@@ -410,62 +211,28 @@ class Ui_Dialog(object):
         self.label_32.setObjectName("label_32")
         self.label_59 = QtWidgets.QLabel(Dialog)
         self.label_59.setGeometry(QtCore.QRect(290, 650, 121, 41))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.label_59.setFont(font)
+        self.label_59.setFont(theme.font(pointSize=10))
         self.label_59.setWordWrap(True)
         self.label_59.setObjectName("label_59")
         self.label_58 = QtWidgets.QLabel(Dialog)
         self.label_58.setGeometry(QtCore.QRect(280, 260, 170, 170))
-        font = QtGui.QFont()
-        font.setPointSize(14)
-        self.label_58.setFont(font)
-        self.label_58.setStyleSheet("border-image: url(:/pic/hamburger_ga_pho_mai.jpg);\n"
-"\n"
-"    border-radius: 20px;  /* bạn có thể chỉnh độ bo tùy ý */")
+        self.label_58.setFont(theme.font(pointSize=14))
+        self.label_58.setProperty("themeRole", "sbbedb66a")
         self.label_58.setText("")
         self.label_58.setObjectName("label_58")
         self.label_67 = QtWidgets.QLabel(Dialog)
         self.label_67.setGeometry(QtCore.QRect(1000, 650, 121, 41))
-        font = QtGui.QFont()
-        font.setPointSize(10)
-        self.label_67.setFont(font)
+        self.label_67.setFont(theme.font(pointSize=10))
         self.label_67.setWordWrap(True)
         self.label_67.setObjectName("label_67")
         self.banh_mi_ga_chien_30k = QtWidgets.QPushButton(Dialog)
         self.banh_mi_ga_chien_30k.setGeometry(QtCore.QRect(890, 440, 25, 25))
-        self.banh_mi_ga_chien_30k.setStyleSheet("QPushButton {\n"
-"    width: 25px;            /* Chiều rộng của button */\n"
-"    height: 25px;           /* Chiều cao của button */\n"
-"    border-radius: 5px;      /* Để không bo tròn góc */\n"
-"    background-color: rgb(255,140,0);\n"
-"    color: black;            /* Màu chữ */\n"
-"}\n"
-"QPushButton:hover {\n"
-"    background-color: rgb(255, 170, 127);; /* Màu nền khi hover */\n"
-"}\n"
-"")
+        self.banh_mi_ga_chien_30k.setProperty("themeRole", "s6032560a")
         self.banh_mi_ga_chien_30k.setObjectName("banh_mi_ga_chien_30k")
         self.best_seller = QtWidgets.QPushButton(Dialog)
         self.best_seller.setGeometry(QtCore.QRect(1050, 170, 131, 51))
-        font = QtGui.QFont()
-        font.setPointSize(-1)
-        font.setBold(True)
-        font.setWeight(75)
-        self.best_seller.setFont(font)
-        self.best_seller.setStyleSheet("QPushButton {\n"
-"    background-color: #FF4500;\n"
-"    color: white;\n"
-"    font-size: 15px;\n"
-"    font-weight: bold;\n"
-"    border-radius: 15px;\n"
-"    padding: 10px;\n"
-"}\n"
-"\n"
-"QPushButton:hover {\n"
-"    background-color:  #CC3700\n"
-"}\n"
-"")
+        self.best_seller.setFont(theme.font(pointSize=-1, bold=True))
+        self.best_seller.setProperty("themeRole", "s093a92aa")
         self.best_seller.setObjectName("best_seller")
         self.label_5.raise_()
         self.mon_an.raise_()
@@ -535,14 +302,15 @@ class Ui_Dialog(object):
         self.label_67.setText(_translate("Dialog", "Gà rán phủ sốt phô mai 45K"))
         self.banh_mi_ga_chien_30k.setText(_translate("Dialog", "+"))
         self.best_seller.setText(_translate("Dialog", "Best Seller🔥"))
-import doan_rc
+load_resources()
 
 
 if __name__ == "__main__":
     import sys
     app = QtWidgets.QApplication(sys.argv)
+    theme.apply(app)
     Dialog = QtWidgets.QDialog()
     ui = Ui_Dialog()
     ui.setupUi(Dialog)
     Dialog.show()
-    sys.exit(app.exec_())
+    sys.exit(app.exec())
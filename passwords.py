@@ -0,0 +1,53 @@
+# passwords.py
+# Băm mật khẩu cho bảng users bằng PBKDF2-HMAC-SHA256 có salt riêng mỗi người dùng.
+# Chuỗi lưu trong cột password: "pbkdf2_sha256$<số vòng>$<salt>$<hash>" (base64).
+# Số vòng ITERATIONS chỉnh được (biến môi trường FOODIE_PBKDF2_ITERATIONS); mật khẩu băm
+# với số vòng cũ, hoặc mật khẩu dạng chữ thường còn lại từ trước, được băm lại ở lần
+# đăng nhập đúng tiếp theo (xem needs_rehash).
+import base64
+import hashlib
+import hmac
+import os
+
+ALGORITHM = "pbkdf2_sha256"
+ITERATIONS = int(os.environ.get("FOODIE_PBKDF2_ITERATIONS", 200_000))
+SALT_BYTES = 16
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password, iterations=None):
+    """ Chuỗi băm để lưu vào cột password """
+    iterations = iterations or ITERATIONS
+    salt = os.urandom(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def is_hashed(stored):
+    return stored.startswith(ALGORITHM + "$")
+
+
+def verify_password(password, stored):
+    """ So mật khẩu với giá trị trong cột password (chấp nhận cả mật khẩu chữ thường cũ) """
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    try:
+        _, iterations, salt, expected = stored.split("$")
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"),
+                                     base64.b64decode(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest, base64.b64decode(expected))
+
+
+def needs_rehash(stored):
+    """ Mật khẩu chưa băm hoặc băm với số vòng khác ITERATIONS """
+    if not is_hashed(stored):
+        return True
+    try:
+        return int(stored.split("$")[1]) != ITERATIONS
+    except (IndexError, ValueError):
+        return True
@@ -0,0 +1,113 @@
+# payment_qr.py
+# Mã QR chuyển khoản (chuẩn VietQR / EMVCo) cho màn hình chuyen_khoan.
+# Nội dung QR gồm số tiền và mã đơn hàng, ảnh được vẽ trên luồng phụ và lưu trong
+# bộ nhớ đệm LRU theo (số tiền, mã đơn) để các lần hiển thị sau có ngay.
+# Vẽ ảnh cần thư viện qrcode (pip install qrcode[pil]); nếu không có thì màn hình
+# dùng ảnh qr.jpg tĩnh như trước.
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Tài khoản nhận tiền - thay bằng tài khoản thật của quán
+BANK_BIN = "970436"          # Mã BIN ngân hàng (970436 = Vietcombank)
+ACCOUNT_NO = "0000000000"
+VIETQR_GUID = "A000000727"
+SERVICE_CODE = "QRIBFTTA"     # chuyển nhanh đến tài khoản
+CACHE_SIZE = 128
+
+
+def order_reference(order_id):
+    """ Nội dung chuyển khoản dùng để đối soát đơn hàng """
+    return f"DH{order_id}"
+
+
+def _tlv(tag, value):
+    return f"{tag}{len(value):02d}{value}"
+
+
+def crc16_ccitt(data):
+    """ CRC-16/CCITT-FALSE (đa thức 0x1021, giá trị đầu 0xFFFF) theo chuẩn EMVCo """
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+            crc &= 0xFFFF
+    return crc
+
+
+def build_payload(amount, reference, bank_bin=BANK_BIN, account_no=ACCOUNT_NO):
+    """ Chuỗi VietQR cho một khoản chuyển amount đồng với nội dung reference """
+    beneficiary = _tlv("00", bank_bin) + _tlv("01", account_no)
+    merchant = _tlv("00", VIETQR_GUID) + _tlv("01", beneficiary) + _tlv("02", SERVICE_CODE)
+    payload = (_tlv("00", "01")
+               + _tlv("01", "12")              # QR động: dùng cho một giao dịch
+               + _tlv("38", merchant)
+               + _tlv("53", "704")             # VND
+               + _tlv("54", str(int(amount)))
+               + _tlv("58", "VN")
+               + _tlv("62", _tlv("08", reference)))
+    payload += "6304"
+    return payload + f"{crc16_ccitt(payload.encode('ascii')):04X}"
+
+
+def render_png(payload, box_size=8):
+    """ Vẽ QR thành ảnh PNG (bytes); trả về None nếu chưa cài qrcode """
+    try:
+        import qrcode
+    except ImportError:
+        print("Chưa cài qrcode, dùng ảnh QR tĩnh")
+        return None
+    image = qrcode.make(payload, box_size=box_size, border=2)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class QRRenderer:
+    def __init__(self, cache_size=CACHE_SIZE, workers=2):
+        """ Vẽ QR trên luồng phụ, lưu kết quả theo (số tiền, mã đơn) với LRU """
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (amount, reference) -> Future[bytes | None]
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qr-render")
+        self.hits = 0
+        self.misses = 0
+
+    def request(self, amount, reference):
+        """ Future chứa ảnh PNG; lần gọi trùng (số tiền, mã đơn) dùng lại cùng kết quả """
+        key = (int(amount), reference)
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return future
+            self.misses += 1
+            future = self._pool.submit(render_png, build_payload(*key))
+            self._cache[key] = future
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return future
+
+    def cached(self, amount, reference):
+        """ Ảnh đã vẽ xong trong cache (None nếu chưa có) """
+        with self._lock:
+            future = self._cache.get((int(amount), reference))
+        if future is not None and future.done() and future.exception() is None:
+            return future.result()
+        return None
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+_renderer = None
+
+
+def get_renderer():
+    global _renderer
+    if _renderer is None:
+        _renderer = QRRenderer()
+    return _renderer
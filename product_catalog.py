@@ -0,0 +1,264 @@
+# product_catalog.py
+# Danh mục sản phẩm mỹ phẩm trong bộ nhớ, lưu theo cột thay vì một tuple cho mỗi sản phẩm.
+#   ids        array('q')
+#   prices     array('q')  số nguyên đồng (xem money.py)
+#   quantities array('i')  tồn kho
+#   brands / categories    array('I') mã trỏ vào bảng chuỗi đã intern (mỗi thương hiệu chỉ lưu một lần)
+#   names / skus           list chuỗi
+# Tra theo id hoặc SKU là O(1) qua dict -> số thứ tự dòng. Lọc theo giá / tồn kho / thương hiệu
+# chạy bằng NumPy trực tiếp trên bộ đệm của các array (không chép). DataManager (main.py) cập nhật
+# danh mục sau mỗi lần thêm / sửa / xóa / bán thay vì đọc lại cả bảng.
+import sys
+from array import array
+
+import numpy as np
+
+COLUMNS = ("id", "name", "brand", "category", "price", "sku", "quantity")
+
+
+class ProductCatalog:
+    def __init__(self, rows=()):
+        """ rows: [(id, name, brand, category, price, sku, quantity), ...] như DataManager.get_all_products """
+        self.ids = array("q")
+        self.prices = array("q")
+        self.quantities = array("i")
+        self.brand_codes = array("I")
+        self.category_codes = array("I")
+        self.names = []
+        self.skus = []
+        self._strings = [None]    # mã -> chuỗi (mã 0 là None)
+        self._codes = {None: 0}   # chuỗi -> mã
+        self._row_of = {}         # id -> số thứ tự dòng
+        self._row_of_sku = {}     # sku -> số thứ tự dòng
+        self._listeners = []
+        for row in rows:
+            self._append(*row)
+
+    def _code(self, text):
+        code = self._codes.get(text)
+        if code is None:
+            code = self._codes[text] = len(self._strings)
+            self._strings.append(sys.intern(text))
+        return code
+
+    def _append(self, product_id, name, brand, category, price, sku, quantity):
+        row = len(self.ids)
+        self.ids.append(product_id)
+        self.names.append(name)
+        self.brand_codes.append(self._code(brand or None))
+        self.category_codes.append(self._code(category or None))
+        self.prices.append(price)
+        self.skus.append(sku)
+        self.quantities.append(quantity)
+        self._row_of[product_id] = row
+        if sku is not None:
+            self._row_of_sku[sku] = row
+        return row
+
+    # --- Đọc ---
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, row):
+        """ Dòng thứ row dạng tuple (id, name, brand, category, price, sku, quantity) """
+        return (self.ids[row], self.names[row], self._strings[self.brand_codes[row]],
+                self._strings[self.category_codes[row]], self.prices[row], self.skus[row],
+                self.quantities[row])
+
+    def value(self, row, column):
+        """ Một ô theo thứ tự cột COLUMNS, không dựng cả tuple """
+        if column == 0:
+            return self.ids[row]
+        if column == 1:
+            return self.names[row]
+        if column == 2:
+            return self._strings[self.brand_codes[row]]
+        if column == 3:
+            return self._strings[self.category_codes[row]]
+        if column == 4:
+            return self.prices[row]
+        if column == 5:
+            return self.skus[row]
+        return self.quantities[row]
+
+    def row_of(self, product_id):
+        return self._row_of.get(product_id)
+
+    def row_of_sku(self, sku):
+        return self._row_of_sku.get(sku)
+
+    def get(self, product_id):
+        row = self._row_of.get(product_id)
+        return None if row is None else self.row(row)
+
+    def by_sku(self, sku):
+        row = self._row_of_sku.get(sku)
+        return None if row is None else self.row(row)
+
+    def brands(self):
+        return sorted({self._strings[code] for code in set(self.brand_codes)} - {None})
+
+    def categories(self):
+        return sorted({self._strings[code] for code in set(self.category_codes)} - {None})
+
+    def filter(self, brand=None, category=None, min_price=None, max_price=None, max_quantity=None,
+               in_stock=None):
+        """ Số thứ tự các dòng thỏa mọi điều kiện được cho, tăng dần """
+        count = len(self.ids)
+        mask = np.ones(count, dtype=bool)
+        if brand is not None:
+            mask &= np.frombuffer(self.brand_codes, dtype=np.uint32, count=count) == self._codes.get(brand, -1)
+        if category is not None:
+            mask &= np.frombuffer(self.category_codes, dtype=np.uint32, count=count) == \
+                self._codes.get(category, -1)
+        if min_price is not None or max_price is not None:
+            prices = np.frombuffer(self.prices, dtype=np.int64, count=count)
+            if min_price is not None:
+                mask &= prices >= min_price
+            if max_price is not None:
+                mask &= prices <= max_price
+        if max_quantity is not None or in_stock is not None:
+            quantities = np.frombuffer(self.quantities, dtype=np.int32, count=count)
+            if max_quantity is not None:
+                mask &= quantities <= max_quantity
+            if in_stock is not None:
+                mask &= (quantities > 0) == in_stock
+        # Kết quả là mảng mới, không giữ bộ đệm của các array (để array còn thêm dòng được)
+        return np.flatnonzero(mask).tolist()
+
+    def stock_value(self):
+        """ Tổng giá trị tồn kho (số nguyên đồng, chính xác) """
+        count = len(self.ids)
+        return int(np.dot(np.frombuffer(self.prices, dtype=np.int64, count=count),
+                          np.frombuffer(self.quantities, dtype=np.int32, count=count)))
+
+    # --- Cập nhật theo các thay đổi của DataManager ---
+
+    def subscribe(self, listener):
+        """ listener(event, row) sau mỗi thay đổi: "insert" / "update" / "remove" (dòng cuối đã được
+            chuyển vào chỗ dòng bị xóa) / "reset". Thêm, xóa và nạp lại còn báo trước khi đổi dữ liệu
+            ("before_insert" / "before_remove" / "before_reset") để model Qt gọi begin...() đúng lúc """
+        self._listeners.append(listener)
+
+    def _notify(self, event, row):
+        for listener in list(self._listeners):
+            listener(event, row)
+
+    def add(self, product_id, name, brand, category, price, sku, quantity):
+        self._notify("before_insert", len(self.ids))
+        self._notify("insert", self._append(product_id, name, brand, category, price, sku, quantity))
+
+    def update(self, product_id, name, brand, category, price, sku):
+        row = self._row_of.get(product_id)
+        if row is None:
+            return
+        old_sku = self.skus[row]
+        if old_sku != sku:
+            self._row_of_sku.pop(old_sku, None)
+            if sku is not None:
+                self._row_of_sku[sku] = row
+        self.names[row] = name
+        self.brand_codes[row] = self._code(brand or None)
+        self.category_codes[row] = self._code(category or None)
+        self.prices[row] = price
+        self.skus[row] = sku
+        self._notify("update", row)
+
+    def adjust_quantity(self, product_id, change):
+        row = self._row_of.get(product_id)
+        if row is not None:
+            self.quantities[row] += change
+            self._notify("update", row)
+
+    def remove(self, product_id):
+        """ Xóa trong O(1): dòng cuối được chuyển vào chỗ dòng bị xóa """
+        row = self._row_of.get(product_id)
+        if row is None:
+            return
+        self._notify("before_remove", row)
+        del self._row_of[product_id]
+        self._row_of_sku.pop(self.skus[row], None)
+        last = len(self.ids) - 1
+        if row != last:
+            for column in (self.ids, self.names, self.brand_codes, self.category_codes, self.prices,
+                           self.skus, self.quantities):
+                column[row] = column[last]
+            self._row_of[self.ids[row]] = row
+            if self.skus[row] is not None:
+                self._row_of_sku[self.skus[row]] = row
+        for column in (self.ids, self.names, self.brand_codes, self.category_codes, self.prices,
+                       self.skus, self.quantities):
+            column.pop()
+        self._notify("remove", row)
+
+    def reset(self, rows):
+        """ Nạp lại toàn bộ (ví dụ sau khi đồng bộ từ quầy khác) """
+        listeners = self._listeners
+        self._notify("before_reset", None)
+        ProductCatalog.__init__(self, rows)
+        self._listeners = listeners
+        self._notify("reset", None)
+
+
+def _tuple_bytes(rows):
+    """ Bộ nhớ (byte) của list các tuple cùng mọi giá trị trong đó """
+    seen = set()
+    total = sys.getsizeof(rows)
+    for row in rows:
+        total += sys.getsizeof(row)
+        for value in row:
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    return total
+
+
+def _catalog_bytes(catalog):
+    total = sum(sys.getsizeof(column) for column in (catalog.ids, catalog.prices, catalog.quantities,
+                                                      catalog.brand_codes, catalog.category_codes))
+    total += sys.getsizeof(catalog.names) + sum(sys.getsizeof(name) for name in catalog.names)
+    total += sys.getsizeof(catalog.skus) + sum(sys.getsizeof(sku) for sku in catalog.skus)
+    total += sys.getsizeof(catalog._strings) + sum(sys.getsizeof(s) for s in catalog._strings)
+    return total
+
+
+def _index_bytes(catalog):
+    """ Bộ nhớ của hai chỉ mục id / SKU -> dòng (khóa id và số dòng là object int riêng) """
+    total = sys.getsizeof(catalog._codes) + sys.getsizeof(catalog._row_of) + sys.getsizeof(catalog._row_of_sku)
+    total += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in catalog._row_of.items())
+    return total
+
+
+if __name__ == "__main__":
+    # Bộ nhớ mỗi sản phẩm: list tuple (như get_all_products) so với ProductCatalog
+    import random
+    import time
+
+    random.seed(1)
+    brands = [f"Thương hiệu {i}" for i in range(60)]
+    categories = ["Son môi", "Kem dưỡng", "Sữa rửa mặt", "Nước hoa", "Phấn", "Mặt nạ"]
+    n = 100_000
+    # Giá và tồn kho tạo riêng từng dòng như khi đọc từ sqlite3 (mỗi dòng là object riêng)
+    rows = [(i, f"Sản phẩm {i}", "%s" % random.choice(brands), "%s" % random.choice(categories),
+             random.randint(50, 2000) * 1000, f"SKU{i:07d}", random.randint(0, 500))
+            for i in range(1, n + 1)]
+    start = time.perf_counter()
+    catalog = ProductCatalog(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+    tuple_bytes = _tuple_bytes(rows)
+    catalog_bytes = _catalog_bytes(catalog)
+    index_bytes = _index_bytes(catalog)
+    print(f"{n} sản phẩm: tuple {tuple_bytes / n:.0f} B/sp, catalog {catalog_bytes / n:.0f} B/sp "
+          f"(+ {index_bytes / n:.0f} B/sp chỉ mục id/SKU), dựng {build_ms:.0f} ms")
+    start = time.perf_counter()
+    for _ in range(10):
+        hits = catalog.filter(brand=brands[3], min_price=200_000, max_price=800_000, in_stock=True)
+    print(f"Lọc (NumPy): {(time.perf_counter() - start) * 100:.2f} ms, {len(hits)} dòng")
+    start = time.perf_counter()
+    for _ in range(10):
+        slow = [i for i, r in enumerate(rows) if r[2] == brands[3] and 200_000 <= r[4] <= 800_000 and r[6] > 0]
+    print(f"Lọc (tuple): {(time.perf_counter() - start) * 100:.2f} ms")
+    assert hits == slow
+    catalog.remove(5)
+    assert catalog.get(n)[0] == n and catalog.by_sku(f"SKU{n:07d}")[0] == n and catalog.get(5) is None
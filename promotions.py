@@ -0,0 +1,264 @@
+# promotions.py
+# Khuyến mãi theo luật cho giỏ đồ ăn (gio_hang / get_cart_items) và hóa đơn mỹ phẩm (sale_items):
+#   - giảm theo giờ trong ngày (ví dụ 14h-17h giảm 20% đồ uống)
+#   - giảm phần trăm theo danh mục hoặc theo món / sản phẩm
+#   - mua X tặng Y cùng món
+# Luật được biên dịch một lần thành mảng NumPy theo danh mục hàng (Catalog): với mỗi giờ trong
+# ngày có sẵn mức giảm tốt nhất của từng món, nên tính giá một giỏ hay hàng nghìn giỏ
+# (phân tích "nếu áp dụng bộ khuyến mãi khác thì sao") chỉ là vài phép tính trên mảng.
+# Mỗi món chỉ hưởng một khuyến mãi có lợi nhất, không cộng dồn.
+# Hiện module chỉ dùng để phân tích (what_if, benchmark): giá tính tiền ở gio_hang, đặt đơn
+# và hóa đơn mỹ phẩm chưa áp dụng khuyến mãi.
+import sqlite3
+import time
+
+import numpy as np
+
+import database
+import kitchen
+
+COSMETICS_DB = "cosmetics.db"  # main.DATABASE_NAME
+HOURS = 24
+
+
+class Promotion:
+    __slots__ = ("code", "label", "percent", "items", "categories", "buy", "free", "hours")
+
+    def __init__(self, code, label, percent=0, items=(), categories=(), buy=0, free=0, hours=None):
+        """
+        percent > 0: giảm percent% cho các món trong items / categories (rỗng cả hai = mọi món).
+        buy, free > 0: mua buy tặng free cùng món. hours = (giờ bắt đầu, giờ kết thúc) hoặc None.
+        """
+        if percent <= 0 and not (buy > 0 and free > 0):
+            raise ValueError(f"Khuyến mãi {code} không có mức giảm")
+        self.code = code
+        self.label = label
+        self.percent = percent
+        self.items = tuple(items)
+        self.categories = tuple(categories)
+        self.buy = buy
+        self.free = free
+        self.hours = hours
+
+    def active_hours(self):
+        """ Mảng bool 24 phần tử: khuyến mãi có hiệu lực trong giờ đó không """
+        if self.hours is None:
+            return np.ones(HOURS, dtype=bool)
+        start, end = self.hours
+        hours = np.arange(HOURS)
+        if start <= end:
+            return (hours >= start) & (hours < end)
+        return (hours >= start) | (hours < end)  # qua nửa đêm
+
+
+# Khuyến mãi mặc định; items dùng tên món / tên sản phẩm, categories dùng danh mục của Catalog
+FOOD_PROMOTIONS = (
+    Promotion("gio_vang_nuoc", "Giờ vàng đồ uống -20%", percent=20, categories=("nuoc",), hours=(14, 17)),
+    Promotion("ga_nuong_toi", "Gà nướng buổi tối -10%", percent=10, categories=("nuong",), hours=(20, 23)),
+    Promotion("pepsi_2_tang_1", "Pepsi mua 2 tặng 1", items=("Pepsi",), buy=2, free=1),
+)
+COSMETICS_PROMOTIONS = (
+    Promotion("cham_soc_da", "Chăm sóc da -15%", percent=15, categories=("Chăm sóc da",)),
+    Promotion("mat_na_3_tang_1", "Mặt nạ mua 3 tặng 1", items=("Mặt nạ J",), buy=3, free=1),
+    Promotion("trang_diem_sang", "Trang điểm buổi sáng -10%", percent=10, categories=("Trang điểm",),
+              hours=(8, 11)),
+)
+
+
+class Catalog:
+    def __init__(self, rows):
+        """ rows: [(id, tên, giá, danh mục), ...]; mỗi món có một vị trí cố định trong các mảng """
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.names = [row[1] for row in rows]
+        self.prices = np.array([row[2] for row in rows], dtype=np.float64)
+        self.categories = [row[3] for row in rows]
+        self.position = {item_id: i for i, item_id in enumerate(self.ids.tolist())}
+        self.by_name = {}
+        self.by_category = {}
+        for i, row in enumerate(rows):
+            self.by_name.setdefault(row[1], []).append(i)
+            self.by_category.setdefault(row[3], []).append(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def vector(self, items):
+        """ Vector số lượng từ [(id, số lượng), ...]; bỏ qua id không có trong danh mục """
+        quantities = np.zeros(len(self), dtype=np.float64)
+        for item_id, quantity in items:
+            i = self.position.get(item_id)
+            if i is not None:
+                quantities[i] += quantity
+        return quantities
+
+    @classmethod
+    def from_food(cls):
+        """ Món ăn trong mon_an; danh mục là trạm bếp của món (kitchen.station_for) """
+        menu = database.get_mon_an_by_name()
+        return cls([(mon_an_id, name, gia, kitchen.station_for(name))
+                    for name, (mon_an_id, gia) in sorted(menu.items(), key=lambda item: item[1][0])])
+
+    @classmethod
+    def from_cosmetics(cls, path=COSMETICS_DB):
+        """ Sản phẩm trong bảng products của ứng dụng mỹ phẩm """
+        conn = sqlite3.connect(path)
+        try:
+            rows = conn.execute("SELECT id, name, price, category FROM products ORDER BY id").fetchall()
+        finally:
+            conn.close()
+        return cls(rows)
+
+
+class PriceResult:
+    def __init__(self, subtotal, discount, lines):
+        """ lines: [(id, tên, mã khuyến mãi, tiền giảm), ...] """
+        self.subtotal = subtotal
+        self.discount = discount
+        self.total = subtotal - discount
+        self.lines = lines
+
+
+class PromotionEngine:
+    def __init__(self, catalog, promotions):
+        """ Biên dịch các khuyến mãi thành mảng theo giờ x món """
+        self.catalog = catalog
+        self.promotions = list(promotions)
+        n = len(catalog)
+        # Giảm phần trăm tốt nhất của từng món trong từng giờ, và khuyến mãi tạo ra mức đó
+        self.percent = np.zeros((HOURS, n), dtype=np.float64)
+        self.percent_rule = np.full((HOURS, n), -1, dtype=np.int64)
+        # Mua X tặng Y: kích thước nhóm (X + Y) và số món tặng mỗi nhóm, theo giờ x món
+        self.group = np.ones((HOURS, n), dtype=np.int64)
+        self.free = np.zeros((HOURS, n), dtype=np.int64)
+        self.free_rule = np.full((HOURS, n), -1, dtype=np.int64)
+        # Chỉ mục: món / danh mục -> các khuyến mãi nhắc tới nó
+        self.by_item = {}
+        self.by_category = {}
+        for r, promotion in enumerate(self.promotions):
+            targets = self._targets(promotion)
+            for i in targets.tolist():
+                self.by_item.setdefault(int(catalog.ids[i]), []).append(promotion.code)
+            for category in promotion.categories:
+                self.by_category.setdefault(category, []).append(promotion.code)
+            hours = promotion.active_hours()
+            cells = np.ix_(hours, targets)
+            if promotion.percent > 0:
+                better = self.percent[cells] < promotion.percent
+                self.percent[cells] = np.where(better, promotion.percent, self.percent[cells])
+                self.percent_rule[cells] = np.where(better, r, self.percent_rule[cells])
+            else:
+                size = promotion.buy + promotion.free
+                # Giữ khuyến mãi tặng nhiều hơn trên mỗi món mua
+                better = self.free[cells] * size < promotion.free * self.group[cells]
+                self.group[cells] = np.where(better, size, self.group[cells])
+                self.free[cells] = np.where(better, promotion.free, self.free[cells])
+                self.free_rule[cells] = np.where(better, r, self.free_rule[cells])
+
+    def _targets(self, promotion):
+        """ Vị trí các món khuyến mãi áp dụng """
+        catalog = self.catalog
+        if not promotion.items and not promotion.categories:
+            return np.arange(len(catalog))
+        targets = set()
+        for name in promotion.items:
+            targets.update(catalog.by_name.get(name, ()))
+        for category in promotion.categories:
+            targets.update(catalog.by_category.get(category, ()))
+        return np.array(sorted(targets), dtype=np.int64)
+
+    def _discounts(self, quantities, hour):
+        """ Tiền giảm theo món (cùng hình dạng quantities) và món nào dùng luật mua X tặng Y """
+        prices = self.catalog.prices
+        by_percent = quantities * prices * (self.percent[hour] / 100.0)
+        by_free = np.floor_divide(quantities, self.group[hour]) * self.free[hour] * prices
+        use_free = by_free > by_percent
+        return np.where(use_free, by_free, by_percent), use_free
+
+    def price(self, items, hour=None):
+        """ Giá một giỏ [(id, số lượng), ...] vào giờ hour (mặc định: giờ hiện tại) """
+        hour = time.localtime().tm_hour if hour is None else hour
+        quantities = self.catalog.vector(items)
+        discounts, use_free = self._discounts(quantities, hour)
+        lines = []
+        for i in np.flatnonzero(discounts > 0).tolist():
+            rule = self.free_rule[hour, i] if use_free[i] else self.percent_rule[hour, i]
+            lines.append((int(self.catalog.ids[i]), self.catalog.names[i],
+                          self.promotions[rule].code, int(round(discounts[i]))))
+        subtotal = int(round(float(quantities @ self.catalog.prices)))
+        return PriceResult(subtotal, sum(line[3] for line in lines), lines)
+
+    def price_batch(self, quantities, hours):
+        """
+        Giá hàng loạt: quantities là ma trận (số giỏ x số món), hours là giờ của từng giỏ.
+        Trả về (tạm tính, tiền giảm) dạng mảng, mỗi phần tử một giỏ; cùng kết quả với price() từng giỏ.
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        hours = np.asarray(hours, dtype=np.int64)
+        prices = self.catalog.prices
+        by_percent = quantities * prices * (self.percent[hours] / 100.0)
+        by_free = np.floor_divide(quantities, self.group[hours]) * self.free[hours] * prices
+        # Làm tròn tiền giảm theo từng dòng rồi mới cộng, giống price() và các dòng in trên hóa đơn
+        discounts = np.round(np.maximum(by_percent, by_free)).sum(axis=1)
+        return np.round(quantities @ prices), discounts
+
+
+def food_cart(engine, user_id, hour=None):
+    """ Giá giỏ hàng đồ ăn trong gio_hang sau khuyến mãi """
+    rows = database.get_cart_items(user_id)  # (id, ten_mon, gia, so_luong, thanh_tien)
+    return engine.price([(row[0], row[3]) for row in rows], hour)
+
+
+def cosmetics_sales(catalog, path=COSMETICS_DB):
+    """ Các hóa đơn mỹ phẩm đã bán dạng (ma trận số lượng, giờ bán) để phân tích lại """
+    conn = sqlite3.connect(path)
+    try:
+        # sale_date là CURRENT_TIMESTAMP (giờ UTC); khuyến mãi theo giờ tính theo giờ địa phương
+        sales = conn.execute("SELECT id, CAST(strftime('%H', sale_date, 'localtime') AS INTEGER) "
+                             "FROM sales ORDER BY id").fetchall()
+        rows = conn.execute("SELECT sale_id, product_id, quantity FROM sale_items").fetchall()
+    finally:
+        conn.close()
+    index = {sale_id: n for n, (sale_id, _) in enumerate(sales)}
+    quantities = np.zeros((len(sales), len(catalog)), dtype=np.float64)
+    for sale_id, product_id, quantity in rows:
+        i = catalog.position.get(product_id)
+        if sale_id in index and i is not None:
+            quantities[index[sale_id], i] += quantity
+    return quantities, np.array([hour or 0 for _, hour in sales], dtype=np.int64)
+
+
+def what_if(catalog, quantities, hours, scenarios):
+    """ So sánh doanh thu của cùng các giỏ dưới nhiều bộ khuyến mãi {tên: [Promotion]} """
+    results = {}
+    for name, promotions in scenarios.items():
+        subtotal, discount = PromotionEngine(catalog, promotions).price_batch(quantities, hours)
+        results[name] = (float(subtotal.sum()), float(discount.sum()))
+    return results
+
+
+def benchmark(carts=5000, items_per_cart=8, seed=1):
+    """ Phân tích "nếu thì sao" trên carts giỏ đồ ăn ngẫu nhiên với vài bộ khuyến mãi """
+    rng = np.random.default_rng(seed)
+    rows = [(n, f"Món {n}", int(rng.integers(10, 50)) * 1000, kitchen.STATIONS[n % 4]) for n in range(1, 201)]
+    rows[0] = (1, "Pepsi", 12000, "nuoc")
+    catalog = Catalog(rows)
+    quantities = np.zeros((carts, len(catalog)))
+    picks = rng.integers(0, len(catalog), size=(carts, items_per_cart))
+    np.add.at(quantities, (np.arange(carts)[:, None], picks), 1)
+    hours = rng.integers(8, 23, size=carts)
+    scenarios = {
+        "hiện tại": FOOD_PROMOTIONS,
+        "không khuyến mãi": (),
+        "giờ vàng -30%": FOOD_PROMOTIONS[1:] + (
+            Promotion("gio_vang_nuoc", "Giờ vàng đồ uống -30%", percent=30, categories=("nuoc",), hours=(14, 17)),),
+    }
+    start = time.perf_counter()
+    results = what_if(catalog, quantities, hours, scenarios)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{len(scenarios)} bộ khuyến mãi x {carts} giỏ: {elapsed:.1f} ms")
+    for name, (subtotal, discount) in results.items():
+        print(f"  {name}: doanh thu {subtotal - discount:,.0f} đ, giảm {discount:,.0f} đ")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,54 @@
+# qt_compat.py
+# Lớp tương thích để cả ứng dụng chỉ nạp một Qt binding trong một tiến trình.
+# Mặc định dùng PyQt6 (giống main.py), nếu không có thì dùng PyQt5.
+# Có thể ép binding bằng biến môi trường QT_API=pyqt5 hoặc QT_API=pyqt6.
+# Các màn hình chỉ dùng tên enum đầy đủ (Qt.AlignmentFlag.AlignCenter, ...)
+# vì cách viết này chạy được trên cả PyQt5 (>= 5.11) và PyQt6.
+import os
+import sys
+
+QT_API = os.environ.get("QT_API", "").lower()
+
+# Không bao giờ nạp binding thứ hai nếu tiến trình đã có sẵn một binding
+if "PyQt6" in sys.modules:
+    QT_API = "pyqt6"
+elif "PyQt5" in sys.modules:
+    QT_API = "pyqt5"
+
+if QT_API == "pyqt5":
+    from PyQt5 import QtCore, QtGui, QtWidgets
+    from PyQt5.uic import loadUi
+else:
+    try:
+        from PyQt6 import QtCore, QtGui, QtWidgets
+        from PyQt6.uic import loadUi
+        QT_API = "pyqt6"
+    except ImportError:
+        from PyQt5 import QtCore, QtGui, QtWidgets
+        from PyQt5.uic import loadUi
+        QT_API = "pyqt5"
+
+# File tài nguyên nhị phân, tạo bằng: rcc -binary doan.qrc -o doan.rcc
+RESOURCE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "doan.rcc")
+
+_resources_loaded = False
+
+
+def load_resources():
+    """ Nạp ảnh trong doan.qrc (prefix :/pic) một lần cho cả tiến trình """
+    global _resources_loaded
+    if _resources_loaded:
+        return True
+    if os.path.exists(RESOURCE_FILE):
+        # File .rcc nhị phân không phụ thuộc binding nên dùng được cho cả PyQt5 và PyQt6
+        _resources_loaded = QtCore.QResource.registerResource(RESOURCE_FILE)
+    elif QT_API == "pyqt5":
+        # doan_rc.py do pyrcc5 sinh ra chỉ dùng được với PyQt5
+        try:
+            import doan_rc  # noqa: F401
+            _resources_loaded = True
+        except ImportError:
+            print(f"Không tìm thấy {RESOURCE_FILE} hoặc doan_rc.py")
+    else:
+        print(f"Không tìm thấy {RESOURCE_FILE}. Hãy chạy: rcc -binary doan.qrc -o doan.rcc")
+    return _resources_loaded
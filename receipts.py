@@ -0,0 +1,251 @@
+# receipts.py
+# In hóa đơn khi đơn được xác nhận (tiền mặt trên gio_hang, chuyển khoản sau khi đối soát).
+# Hóa đơn được dựng (văn bản, ESC/POS hoặc PDF) trên nhóm luồng phụ nên kiosk không phải
+# chờ; mỗi máy (terminal) có một hàng đợi in riêng để hóa đơn ra đúng thứ tự đã gửi,
+# kể cả khi hóa đơn sau dựng xong trước. Máy in lỗi thì thử lại với thời gian chờ tăng dần.
+# FileSinkPrinter ghi hóa đơn ra thư mục receipts/ thay cho máy in thật.
+import io
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import database
+
+SHOP_NAME = "CHICKY"
+LINE_WIDTH = 32              # số ký tự một dòng trên giấy in nhiệt 58 mm
+MAX_RETRIES = 3
+RETRY_DELAY = 0.2            # giây, nhân đôi sau mỗi lần lỗi
+FORMATS = ("text", "escpos", "pdf")
+
+ESC_INIT = b"\x1b@"
+ESC_BOLD_ON = b"\x1bE\x01"
+ESC_BOLD_OFF = b"\x1bE\x00"
+ESC_CENTER = b"\x1ba\x01"
+ESC_LEFT = b"\x1ba\x00"
+GS_CUT = b"\x1dV\x42\x00"
+
+
+class PrinterError(Exception):
+    """ Máy in không nhận được hóa đơn (hết giấy, mất kết nối, ...) """
+
+
+def _line(left, right, width=LINE_WIDTH):
+    left = left[:width - len(right) - 1]
+    return left + " " * (width - len(left) - len(right)) + right
+
+
+def render_text(order, items, width=LINE_WIDTH):
+    """ Hóa đơn dạng văn bản từ một dòng orders và các dòng order_items (xem database.get_order) """
+    order_id, _, table_no, payment_method, total, _, created_at = order
+    lines = [SHOP_NAME.center(width), f"Đơn #{order_id} - Bàn {table_no}".center(width),
+             str(created_at).center(width), "-" * width]
+    for _, ten_mon, gia, so_luong, thanh_tien in items:
+        lines.append(ten_mon[:width])
+        lines.append(_line(f"  {so_luong} x {gia:,}", f"{thanh_tien:,}", width))
+    lines.append("-" * width)
+    discount = sum(item[4] for item in items) - total
+    if discount > 0:
+        lines.append(_line("Giảm giá combo", f"-{discount:,}", width))
+    lines += [_line("TỔNG", f"{total:,} đ", width),
+              _line("Thanh toán", "Chuyển khoản" if payment_method == "chuyen_khoan" else "Tiền mặt", width),
+              "", "Cảm ơn quý khách!".center(width)]
+    return "\n".join(lines) + "\n"
+
+
+def render_escpos(order, items, width=LINE_WIDTH):
+    """ Hóa đơn dạng lệnh ESC/POS cho máy in nhiệt """
+    text = render_text(order, items, width).splitlines()
+    header, body = text[:2], text[2:]
+    data = ESC_INIT + ESC_CENTER + ESC_BOLD_ON
+    data += "\n".join(h.strip() for h in header).encode("utf-8") + b"\n"
+    data += ESC_BOLD_OFF + ESC_LEFT
+    data += "\n".join(body).encode("utf-8") + b"\n\n\n"
+    return data + GS_CUT
+
+
+def render_pdf(order, items):
+    """ Hóa đơn PDF (bytes); trả về None nếu chưa cài reportlab """
+    try:
+        from reportlab.lib.pagesizes import A6
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        print("Chưa cài reportlab, không thể tạo hóa đơn PDF")
+        return None
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A6)
+    width, height = A6
+    y = height - 30
+    for line in render_text(order, items, width=40).splitlines():
+        pdf.setFont("Courier", 8)
+        pdf.drawString(15, y, line)
+        y -= 11
+        if y < 20:
+            pdf.showPage()
+            y = height - 30
+    pdf.save()
+    return buffer.getvalue()
+
+
+def render_receipt(order_id, fmt="escpos"):
+    """ Đọc đơn từ database và dựng hóa đơn theo định dạng fmt """
+    order, items = database.get_order(order_id)
+    if order is None:
+        raise ValueError(f"Không tìm thấy đơn #{order_id}")
+    if fmt == "text":
+        return render_text(order, items).encode("utf-8")
+    if fmt == "escpos":
+        return render_escpos(order, items)
+    return render_pdf(order, items)
+
+
+class FileSinkPrinter:
+    def __init__(self, directory="receipts", fail_every=0):
+        """ "Máy in" ghi mỗi hóa đơn thành một file; fail_every > 0 giả lập lỗi khi thử """
+        self.directory = directory
+        self.fail_every = fail_every
+        self._calls = 0
+        self.printed = []  # (terminal, job_id) theo thứ tự đã in
+
+    def print_receipt(self, terminal, job_id, data, fmt):
+        self._calls += 1
+        if self.fail_every and self._calls % self.fail_every == 0:
+            raise PrinterError("Máy in không phản hồi")
+        folder = os.path.join(self.directory, terminal)
+        os.makedirs(folder, exist_ok=True)
+        extension = {"text": "txt", "escpos": "bin", "pdf": "pdf"}[fmt]
+        with open(os.path.join(folder, f"{job_id:06d}.{extension}"), "wb") as f:
+            f.write(data)
+        self.printed.append((terminal, job_id))
+
+
+class ReceiptSpooler:
+    def __init__(self, printer=None, workers=2, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY):
+        """ Dựng hóa đơn trên nhóm luồng phụ, in theo thứ tự riêng của từng terminal """
+        self.printer = printer or FileSinkPrinter()
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="receipt-render")
+        self._lock = threading.Lock()
+        self._terminals = {}  # terminal -> queue.Queue các job chờ in
+        self._next_job = 0
+        self.printed = 0
+        self.retries = 0
+        self.failed = []  # (terminal, job_id, order_id, lỗi) đã bỏ sau khi hết lượt thử
+
+    def submit(self, order_id, terminal="kiosk", fmt="escpos"):
+        """ Đưa hóa đơn của order_id vào hàng đợi in; Future xong khi đã in (hoặc bỏ) """
+        if fmt not in FORMATS:
+            raise ValueError(f"Định dạng hóa đơn không hợp lệ: {fmt}")
+        done = Future()
+        with self._lock:
+            self._next_job += 1
+            job_id = self._next_job
+            jobs = self._terminals.get(terminal)
+            if jobs is None:
+                jobs = self._terminals[terminal] = queue.Queue()
+                threading.Thread(target=self._print_loop, args=(terminal, jobs),
+                                 name=f"receipt-print-{terminal}", daemon=True).start()
+        rendered = self._pool.submit(render_receipt, order_id, fmt)
+        jobs.put((job_id, order_id, fmt, rendered, done))
+        return done
+
+    def attach(self, order_service, reconciler=None, terminal="kiosk"):
+        """ In hóa đơn khi có đơn tiền mặt mới, và khi đơn chuyển khoản được đối soát """
+        def on_order(event, order):
+            if event == "placed" and order.get("payment_method") != "chuyen_khoan":
+                self.submit(order["id"], terminal)
+        order_service.subscribe(on_order)
+        if reconciler is not None:
+            reconciler.subscribe(lambda order_id: self.submit(order_id, terminal))
+
+    def _print_loop(self, terminal, jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            job_id, order_id, fmt, rendered, done = job
+            try:
+                data = rendered.result()
+                if data is None:
+                    raise PrinterError(f"Không dựng được hóa đơn {fmt}")
+                self._send(terminal, job_id, data, fmt)
+            except Exception as e:
+                with self._lock:
+                    self.failed.append((terminal, job_id, order_id, str(e)))
+                done.set_exception(e)
+            else:
+                with self._lock:
+                    self.printed += 1
+                done.set_result(job_id)
+
+    def _send(self, terminal, job_id, data, fmt):
+        """ Gửi tới máy in, thử lại với thời gian chờ tăng dần """
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.printer.print_receipt(terminal, job_id, data, fmt)
+                return
+            except PrinterError:
+                if attempt == self.max_retries:
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(delay)
+                delay *= 2
+
+    def metrics(self):
+        """ Độ sâu hàng đợi theo terminal và số hóa đơn đã in / thử lại / bỏ """
+        with self._lock:
+            return {
+                "queue_depth": {terminal: jobs.qsize() for terminal, jobs in self._terminals.items()},
+                "printed": self.printed,
+                "retries": self.retries,
+                "failed": len(self.failed),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            terminals = list(self._terminals.values())
+        for jobs in terminals:
+            jobs.put(None)
+        self._pool.shutdown(wait=False)
+
+
+_spooler = None
+
+
+def get_spooler():
+    global _spooler
+    if _spooler is None:
+        _spooler = ReceiptSpooler()
+    return _spooler
+
+
+if __name__ == "__main__":
+    # Gửi một loạt hóa đơn cho ba máy, máy in lỗi mỗi lần thứ 7, kiểm tra thứ tự in
+    import tempfile
+
+    os.chdir(tempfile.mkdtemp())
+    database.create_tables()
+    order_ids = []
+    for n in range(120):
+        database.add_to_cart(1, 1 + n % 15)
+        order_ids.append(database.place_order(1, 1 + n % 12, "tien_mat"))
+
+    printer = FileSinkPrinter(fail_every=7)
+    spooler = ReceiptSpooler(printer, workers=4, retry_delay=0.001)
+    terminals = ("kiosk", "quay", "bep")
+    start = time.perf_counter()
+    futures = [spooler.submit(order_id, terminals[n % 3]) for n, order_id in enumerate(order_ids)]
+    submit_ms = (time.perf_counter() - start) * 1000
+    print(f"Gửi {len(futures)} hóa đơn mất {submit_ms:.1f} ms, hàng đợi: {spooler.metrics()['queue_depth']}")
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    in_order = all(
+        [job for t, job in printer.printed if t == terminal] ==
+        sorted(job for t, job in printer.printed if t == terminal) for terminal in terminals)
+    print(f"In xong sau {elapsed:.2f} s, đúng thứ tự theo máy: {in_order}, {spooler.metrics()}")
+    spooler.shutdown()
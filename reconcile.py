@@ -0,0 +1,220 @@
+# reconcile.py
+# Đối soát chuyển khoản tự động thay cho việc bấm xac_nhan_thanh_toan bằng tay.
+# Ngân hàng (hoặc FakeBank khi thử) gửi thông báo giao dịch tới một endpoint HTTP nội bộ:
+#   POST /bank/notify  {"transaction_id": "...", "amount": 150000, "description": "DH12 ..."}
+# Endpoint chỉ đưa thông báo vào hàng đợi rồi trả 202; luồng đối soát khớp thông báo với
+# đơn đang chờ qua chỉ mục (mã đơn, số tiền) -> order_id (O(1) mỗi thông báo) và ghi
+# các đơn đã thanh toán xuống database theo lô.
+import json
+import queue
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import database
+import payment_qr
+
+HOST = "127.0.0.1"
+PORT = 8765
+NOTIFY_PATH = "/bank/notify"
+MAX_BATCH = 500
+RETRY_SECONDS = 1.0  # chờ trước khi ghi lại lô không ghi được
+
+REFERENCE_PATTERN = re.compile(r"DH\d+", re.IGNORECASE)
+
+
+class Reconciler:
+    def __init__(self):
+        """ Chỉ mục đơn chờ chuyển khoản và luồng đối soát """
+        self._lock = threading.Lock()
+        self._pending = {}  # (reference, amount) -> order_id
+        self._notifications = queue.Queue()
+        self._listeners = []
+        self.matched = 0
+        self.unmatched = deque(maxlen=1000)  # thông báo không khớp đơn nào, để thu ngân kiểm tra
+        for order_id, _, total in database.get_unpaid_orders("chuyen_khoan"):
+            self.expect(order_id, total)
+        self._worker = threading.Thread(target=self._run, name="reconcile", daemon=True)
+        self._worker.start()
+
+    def expect(self, order_id, amount):
+        """ Thêm đơn vào danh sách chờ chuyển khoản """
+        with self._lock:
+            self._pending[(payment_qr.order_reference(order_id), int(amount))] = order_id
+
+    def attach(self, order_service):
+        """ Tự thêm các đơn chuyển khoản mới từ orders.OrderService """
+        def listener(event, order):
+            if event == "placed" and order.get("payment_method") == "chuyen_khoan":
+                self.expect(order["id"], order["total"])
+        order_service.subscribe(listener)
+
+    def subscribe(self, listener):
+        """ listener(order_id) được gọi (trên luồng đối soát) khi đơn được xác nhận đã trả """
+        self._listeners.append(listener)
+
+    def notify(self, notification):
+        """ Nhận một thông báo giao dịch (dict), xử lý bất đồng bộ """
+        self._notifications.put(notification)
+
+    def _match(self, notification, claimed):
+        """
+        Tìm đơn khớp với thông báo; trả về (key, (transaction_id, order_id, amount)) hoặc None.
+        Đơn chỉ rời _pending sau khi ghi xong; claimed giữ các key đã khớp trong cùng lô.
+        """
+        try:
+            amount = int(notification["amount"])
+            transaction_id = str(notification["transaction_id"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        found = REFERENCE_PATTERN.search(str(notification.get("description", "")))
+        if not found:
+            return None
+        key = (found.group(0).upper(), amount)
+        if key in claimed:
+            return None
+        with self._lock:
+            order_id = self._pending.get(key)
+        if order_id is None:
+            return None
+        claimed.add(key)
+        return key, (transaction_id, order_id, amount)
+
+    def _run(self):
+        while True:
+            batch = [self._notifications.get()]
+            # Gom các thông báo đang chờ để ghi một lần
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._notifications.get_nowait())
+                except queue.Empty:
+                    break
+            matches, keys, matched_notifications = [], [], []
+            claimed = set()
+            for notification in batch:
+                match = self._match(notification, claimed)
+                if match is None:
+                    self.unmatched.append(notification)
+                else:
+                    keys.append(match[0])
+                    matches.append(match[1])
+                    matched_notifications.append(notification)
+            if not matches:
+                continue
+            paid = database.mark_orders_paid(matches)
+            if paid is None:
+                # Chưa ghi được: các đơn vẫn nằm trong _pending, đưa thông báo lại hàng đợi
+                for notification in matched_notifications:
+                    self._notifications.put(notification)
+                time.sleep(RETRY_SECONDS)
+                continue
+            with self._lock:
+                for key, (_, order_id, _) in zip(keys, matches):
+                    if self._pending.get(key) == order_id:
+                        del self._pending[key]
+            self.matched += len(paid)
+            for order_id in paid:
+                for listener in list(self._listeners):
+                    try:
+                        listener(order_id)
+                    except Exception as e:
+                        # Một listener lỗi không được làm dừng luồng đối soát
+                        print(f"Lỗi listener đối soát đơn #{order_id}: {e}")
+
+    def wait_idle(self, timeout=5.0):
+        """ Chờ đến khi hàng đợi thông báo rỗng (dùng khi thử) """
+        deadline = time.time() + timeout
+        while not self._notifications.empty() and time.time() < deadline:
+            time.sleep(0.01)
+
+
+class _NotifyHandler(BaseHTTPRequestHandler):
+    reconciler = None
+
+    def do_POST(self):
+        if self.path != NOTIFY_PATH:
+            self.send_error(404)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_error(400, "Invalid JSON")
+            return
+        # Ngân hàng có thể gửi một giao dịch hoặc một danh sách
+        for notification in payload if isinstance(payload, list) else [payload]:
+            self.reconciler.notify(notification)
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass  # không in mỗi request ra console
+
+
+def start_server(reconciler, host=HOST, port=PORT):
+    """ Chạy endpoint nhận thông báo trên luồng nền, trả về server (gọi shutdown() để dừng) """
+    handler = type("NotifyHandler", (_NotifyHandler,), {"reconciler": reconciler})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="bank-webhook", daemon=True).start()
+    return server
+
+
+class FakeBank:
+    def __init__(self, url=f"http://{HOST}:{PORT}{NOTIFY_PATH}"):
+        """ Giả lập ngân hàng gửi thông báo chuyển khoản tới endpoint nội bộ """
+        self.url = url
+        self._next_id = 0
+
+    def transfer(self, amount, description):
+        self._next_id += 1
+        return {"transaction_id": f"FAKE{self._next_id:08d}", "amount": int(amount),
+                "description": description}
+
+    def send(self, notifications):
+        body = json.dumps(notifications).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+
+
+_reconciler = None
+
+
+def get_reconciler():
+    global _reconciler
+    if _reconciler is None:
+        _reconciler = Reconciler()
+    return _reconciler
+
+
+if __name__ == "__main__":
+    # Mô phỏng một đợt vài trăm thông báo chuyển khoản trên database tạm và đo thời gian đối soát
+    import os
+    import tempfile
+
+    os.chdir(tempfile.mkdtemp())
+    database.create_tables()
+    burst = 500
+    orders = []
+    for n in range(burst):
+        database.add_to_cart(1, 1 + n % 15)
+        order_id = database.place_order(1, 1 + n % 12, "chuyen_khoan")
+        orders.append((order_id, database.get_order(order_id)[0][4]))
+
+    reconciler = get_reconciler()
+    server = start_server(reconciler)
+    bank = FakeBank()
+    start = time.perf_counter()
+    for order_id, total in orders:
+        bank.send(bank.transfer(total, f"Thanh toan {payment_qr.order_reference(order_id)}"))
+    reconciler.wait_idle()
+    time.sleep(0.1)
+    elapsed = time.perf_counter() - start
+    print(f"{burst} thông báo trong {elapsed:.2f} s ({burst / elapsed:,.0f}/s), "
+          f"đã khớp {reconciler.matched}/{burst}")
+    server.shutdown()
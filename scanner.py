@@ -0,0 +1,201 @@
+# scanner.py
+# Quét mã vạch / SKU ở quầy mỹ phẩm.
+# Mỗi lần quét chỉ tra bảng băm SKU -> dòng của ProductCatalog (giá, tồn kho) trong bộ nhớ, không
+# truy vấn database; hóa đơn được dựng trong bộ nhớ và chỉ ghi một lần khi thanh toán
+# (DataManager.checkout, một transaction, có request_key để bấm lại không trừ kho hai lần).
+# Danh mục được DataManager cập nhật sau mỗi thay đổi nên giá / tồn kho khi quét luôn khớp database.
+# Mỗi dòng hóa đơn có một giá: quét thêm khi giá đã đổi thì tính lại cả dòng theo giá mới. Khi thanh toán,
+# giá của từng dòng được so với giá trong database; khác thì không ghi, danh mục được nạp lại và hóa đơn
+# được tính lại theo giá mới để thu ngân báo lại khách (xem commit / price_changes).
+# ScanMetrics đo thời gian từ lúc nhận mã đến lúc giao diện hiển thị xong dòng vừa quét.
+import time
+import uuid
+
+SCAN_LATENCY_SAMPLES = 1024
+
+
+class ScanMetrics:
+    def __init__(self, samples=SCAN_LATENCY_SAMPLES):
+        """ Giữ samples độ trễ quét -> hiển thị gần nhất (ms) """
+        self.samples = samples
+        self.scans = 0
+        self.unknown = 0
+        self.out_of_stock = 0
+        self._latencies = []
+
+    def record_display(self, scanned_at):
+        """ Gọi sau khi giao diện vẽ xong kết quả của lần quét lúc scanned_at (perf_counter) """
+        self._latencies.append((time.perf_counter() - scanned_at) * 1000)
+        if len(self._latencies) > self.samples:
+            del self._latencies[:len(self._latencies) - self.samples]
+
+    def summary(self):
+        latencies = sorted(self._latencies)
+        if not latencies:
+            return {"scans": self.scans, "unknown": self.unknown, "out_of_stock": self.out_of_stock}
+        return {"scans": self.scans, "unknown": self.unknown, "out_of_stock": self.out_of_stock,
+                "p50_ms": latencies[len(latencies) // 2],
+                "p95_ms": latencies[int(len(latencies) * 0.95)],
+                "max_ms": latencies[-1]}
+
+
+class ScanResult:
+    __slots__ = ("code", "product_id", "name", "price", "quantity", "total", "error", "scanned_at")
+
+    def __init__(self, code, scanned_at, product_id=None, name=None, price=0, quantity=0, total=0,
+                 error=None):
+        self.code = code
+        self.scanned_at = scanned_at
+        self.product_id = product_id
+        self.name = name
+        self.price = price
+        self.quantity = quantity  # số lượng của sản phẩm này trong hóa đơn sau lần quét
+        self.total = total        # tổng hóa đơn sau lần quét
+        self.error = error
+
+
+class ScanSession:
+    def __init__(self, data_manager):
+        """ Một hóa đơn đang quét trên danh mục của data_manager (DataManager trong main.py) """
+        self.data_manager = data_manager
+        self.catalog = data_manager.get_catalog()
+        self.metrics = ScanMetrics()
+        self.items = {}  # product_id -> số lượng, theo thứ tự quét
+        self._prices = {}  # product_id -> giá của cả dòng (giá trong danh mục ở lần quét gần nhất)
+        self.total = 0  # luôn bằng tổng giá dòng x số lượng
+        self.price_changes = []  # [(product_id, giá cũ, giá mới)] của lần thanh toán bị từ chối gần nhất
+        self.request_key = uuid.uuid4().hex
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """ listener(ScanResult) sau mỗi lần quét / bớt """
+        self._listeners.append(listener)
+
+    def _notify(self, result):
+        for listener in list(self._listeners):
+            listener(result)
+        return result
+
+    def scan(self, code, quantity=1):
+        """ Thêm quantity sản phẩm có mã code vào hóa đơn; O(1), không truy vấn database """
+        scanned_at = time.perf_counter()
+        code = code.strip()
+        self.metrics.scans += 1
+        catalog = self.catalog
+        row = catalog.row_of_sku(code)
+        if row is None:
+            self.metrics.unknown += 1
+            return self._notify(ScanResult(code, scanned_at, total=self.total, error="Không tìm thấy mã"))
+        product_id = catalog.ids[row]
+        price = catalog.prices[row]
+        in_sale = self.items.get(product_id, 0)
+        if in_sale + quantity > catalog.quantities[row]:
+            self.metrics.out_of_stock += 1
+            return self._notify(ScanResult(code, scanned_at, product_id, catalog.names[row], price, in_sale,
+                                           self.total, error="Không đủ hàng"))
+        # Giá đổi từ lần quét trước thì tính lại cả dòng, không để hai mức giá trong một dòng
+        old_price = self._prices.get(product_id, price)
+        self.items[product_id] = in_sale + quantity
+        self._prices[product_id] = price
+        self.total += price * quantity + (price - old_price) * in_sale
+        self.request_key = uuid.uuid4().hex  # hóa đơn đã đổi
+        return self._notify(ScanResult(code, scanned_at, product_id, catalog.names[row], price,
+                                       in_sale + quantity, self.total))
+
+    def remove(self, product_id, quantity=1):
+        """ Bớt sản phẩm khỏi hóa đơn (quét nhầm) """
+        scanned_at = time.perf_counter()
+        in_sale = self.items.get(product_id, 0)
+        quantity = min(quantity, in_sale)
+        if quantity == 0:
+            return None
+        price = self._prices[product_id]
+        if in_sale == quantity:
+            del self.items[product_id]
+            del self._prices[product_id]
+        else:
+            self.items[product_id] = in_sale - quantity
+        self.total -= price * quantity
+        self.request_key = uuid.uuid4().hex
+        row = self.catalog.row_of(product_id)
+        return self._notify(ScanResult(None, scanned_at, product_id,
+                                       self.catalog.names[row] if row is not None else None,
+                                       price, in_sale - quantity, self.total))
+
+    def lines(self):
+        """ [(product_id, tên, giá, số lượng, thành tiền)] theo thứ tự quét """
+        result = []
+        for product_id, quantity in self.items.items():
+            row = self.catalog.row_of(product_id)
+            price = self._prices[product_id]
+            name = self.catalog.names[row] if row is not None else None
+            result.append((product_id, name, price, quantity, price * quantity))
+        return result
+
+    def reprice(self):
+        """ Tính lại các dòng theo giá hiện tại trong danh mục; trả về [(product_id, giá cũ, giá mới)] """
+        changes = []
+        for product_id, quantity in self.items.items():
+            row = self.catalog.row_of(product_id)
+            if row is None:
+                continue  # sản phẩm đã bị xóa: checkout báo thiếu hàng
+            price, old_price = self.catalog.prices[row], self._prices[product_id]
+            if price != old_price:
+                self._prices[product_id] = price
+                self.total += (price - old_price) * quantity
+                changes.append((product_id, old_price, price))
+        if changes:
+            self.request_key = uuid.uuid4().hex
+        return changes
+
+    def commit(self, customer_id=None):
+        """
+        Ghi hóa đơn một lần; trả về sale_id và bắt đầu hóa đơn mới, None nếu lỗi / thiếu hàng / giá đã đổi.
+        Giá đã đổi: hóa đơn được tính lại theo giá mới và price_changes cho biết các dòng bị đổi.
+        """
+        self.price_changes = []
+        if not self.items:
+            return None
+        lines = [(product_id, quantity, self._prices[product_id]) for product_id, quantity in self.items.items()]
+        sale_id = self.data_manager.checkout(lines, customer_id, self.request_key)
+        if sale_id is not None:
+            self.clear()
+            return sale_id
+        # Có thể giá đã đổi ngoài danh mục (ví dụ đồng bộ từ quầy khác): đọc lại rồi tính lại hóa đơn
+        self.catalog = self.data_manager.get_catalog(reload=True)
+        self.price_changes = self.reprice()
+        return None
+
+    def clear(self):
+        self.items = {}
+        self._prices = {}
+        self.total = 0
+        self.request_key = uuid.uuid4().hex
+
+
+if __name__ == "__main__":
+    # Loạt quét liên tục trên danh mục 20.000 sản phẩm, đo từ lúc nhận mã đến lúc "hiển thị"
+    import random
+    from types import SimpleNamespace
+
+    from product_catalog import ProductCatalog
+
+    random.seed(1)
+    n = 20_000
+    catalog = ProductCatalog((i, f"Sản phẩm {i}", "Brand", "Loại", 1000 * (i % 500 + 1), f"893{i:010d}", 50)
+                             for i in range(1, n + 1))
+    session = ScanSession(SimpleNamespace(get_catalog=lambda reload=False: catalog,
+                                          checkout=lambda items, customer_id, key: 1))
+    shown = []
+    session.subscribe(lambda result: shown.append(result.total))
+    codes = [f"893{random.randint(1, n):010d}" for _ in range(10_000)] + ["khong-co"]
+    start = time.perf_counter()
+    for code in codes:
+        result = session.scan(code)
+        session.metrics.record_display(result.scanned_at)
+    elapsed = time.perf_counter() - start
+    summary = session.metrics.summary()
+    print(f"{len(codes)} lần quét trong {elapsed * 1000:.1f} ms ({elapsed / len(codes) * 1e6:.1f} µs/lần), "
+          f"p95 {summary['p95_ms'] * 1000:.1f} µs, {len(session.items)} dòng, "
+          f"{summary['unknown']} mã lạ, {summary['out_of_stock']} hết hàng")
+    assert session.commit() == 1 and not session.items
@@ -0,0 +1,46 @@
+# sign_in_view.py
+# Hộp đăng nhập của kiosk. AppShell mở hộp này khi thao tác cần phiên đăng nhập (thêm món, đặt đơn,
+# màn hình bếp, xác nhận thanh toán bằng tay); kiểm tra mật khẩu chạy trên luồng phụ (auth.py).
+from qt_compat import QtWidgets
+
+
+class SignInDialog(QtWidgets.QDialog):
+    def __init__(self, parent=None):
+        """ Hai ô tên đăng nhập / mật khẩu; accepted khi bấm Đăng nhập với đủ hai ô """
+        super().__init__(parent)
+        self.setWindowTitle("Đăng nhập")
+        self.setModal(True)
+        layout = QtWidgets.QFormLayout(self)
+        self.username = QtWidgets.QLineEdit(self)
+        self.username.setObjectName("username")
+        self.password = QtWidgets.QLineEdit(self)
+        self.password.setObjectName("password")
+        self.password.setEchoMode(QtWidgets.QLineEdit.EchoMode.Password)
+        self.message = QtWidgets.QLabel("", self)
+        self.message.setStyleSheet("color: #C62828;")
+        layout.addRow("Tên đăng nhập", self.username)
+        layout.addRow("Mật khẩu", self.password)
+        layout.addRow(self.message)
+        buttons = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.StandardButton.Ok | QtWidgets.QDialogButtonBox.StandardButton.Cancel, self)
+        buttons.button(QtWidgets.QDialogButtonBox.StandardButton.Ok).setText("Đăng nhập")
+        buttons.button(QtWidgets.QDialogButtonBox.StandardButton.Cancel).setText("Hủy")
+        buttons.accepted.connect(self._submit)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def reset(self, message=""):
+        """ Xóa mật khẩu (giữ tên đăng nhập) để dùng lại hộp cho lần đăng nhập sau """
+        self.password.clear()
+        self.message.setText(message)
+        (self.password if self.username.text() else self.username).setFocus()
+
+    def credentials(self):
+        return self.username.text().strip(), self.password.text()
+
+    def _submit(self):
+        username, password = self.credentials()
+        if not username or not password:
+            self.message.setText("Vui lòng nhập tên đăng nhập và mật khẩu.")
+            return
+        self.accept()
@@ -0,0 +1,303 @@
+# storage.py
+# Lớp lưu trữ dùng chung cho SQLite (foodie.db, cosmetics.db) và SQL Server qua ODBC (db_helper.py).
+#   Backend:        query / execute / executemany / transaction, giữ kết nối thay vì mở mỗi lần gọi
+#     SQLiteBackend: một kết nối cho mỗi luồng
+#     ODBCBackend:   nhóm kết nối pyodbc dùng lại, executemany với fast_executemany
+#     FakeBackend:   SQLite trong bộ nhớ của tiến trình, dùng khi thử
+#   Store:          các truy vấn menu, tìm kiếm, giỏ hàng, bán hàng viết một lần cho mọi backend;
+#                   khác biệt cú pháp / tên bảng nằm trong Dialect. database.py (món ăn, giỏ hàng) và
+#                   main.DataManager (dòng hóa đơn) gọi qua Store.
+# Chọn backend bằng biến môi trường FOODIE_STORAGE=sqlite|odbc (mặc định sqlite) và
+# FOODIE_ODBC (chuỗi kết nối ODBC).
+# Trên SQL Server của đồ án mới chỉ biết chắc bảng MonAn và cột TenMonAn (truy vấn cũ của db_helper.py).
+# Cột mã / giá món và các bảng khác phải khai báo qua FOODIE_ODBC_NAMES, ví dụ
+# "id=MaMonAn,gia=DonGia,gio_hang=GioHang"; tên chưa khai báo báo StorageError thay vì đoán.
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+ODBC_CONNECTION = (
+    "Driver={SQL Server};"
+    "Server=DESKTOP-XXXXXXX\\SQLEXPRESS;"
+    "Database=DOAN;"
+    "Trusted_Connection=yes;"
+)
+ODBC_POOL_SIZE = 4
+
+
+class StorageError(Exception):
+    """ Lỗi truy vấn từ backend bất kỳ (sqlite3.Error, pyodbc.Error) """
+
+
+class Dialect:
+    # Tên bảng / cột logic -> tên thật trong database
+    names = {}
+
+    def name(self, logical):
+        return self.names.get(logical, logical)
+
+    def page(self, sql, order_by, limit, offset):
+        """ Thêm phân trang vào câu SELECT; trả về (sql, tham số thêm) """
+        return f"{sql} ORDER BY {order_by} LIMIT ? OFFSET ?", (limit, offset)
+
+
+class SQLServerDialect(Dialect):
+    # Bảng món ăn trên SQL Server của đồ án (xem db_helper.py); chỉ gồm các tên đã kiểm chứng
+    names = {"mon_an": "MonAn", "ten_mon": "TenMonAn"}
+
+    def __init__(self, names=None):
+        """ names: ánh xạ thêm tên logic -> tên thật (FOODIE_ODBC_NAMES) """
+        self.names = dict(self.names, **(names or {}))
+
+    def name(self, logical):
+        try:
+            return self.names[logical]
+        except KeyError:
+            raise StorageError(f"Chưa khai báo tên '{logical}' trên SQL Server (FOODIE_ODBC_NAMES)") from None
+
+    def page(self, sql, order_by, limit, offset):
+        return f"{sql} ORDER BY {order_by} OFFSET ? ROWS FETCH NEXT ? ROWS ONLY", (offset, limit)
+
+
+class Backend:
+    dialect = Dialect()
+    errors = (sqlite3.Error,)
+
+    def _acquire(self):
+        raise NotImplementedError
+
+    def _release(self, conn):
+        pass
+
+    @contextmanager
+    def transaction(self):
+        """ Một kết nối và một transaction cho nhiều câu lệnh; commit khi thoát, rollback khi lỗi """
+        conn = self._acquire()
+        try:
+            cursor = conn.cursor()
+            yield cursor
+            conn.commit()
+        except self.errors as e:
+            conn.rollback()
+            raise StorageError(str(e)) from e
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def query(self, sql, params=()):
+        with self.transaction() as cursor:
+            cursor.execute(sql, params)
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def execute(self, sql, params=()):
+        """ Chạy một câu lệnh ghi, trả về số dòng bị ảnh hưởng """
+        with self.transaction() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def executemany(self, sql, rows):
+        with self.transaction() as cursor:
+            cursor.executemany(sql, rows)
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend(Backend):
+    def __init__(self, path):
+        """ Mỗi luồng giữ một kết nối tới path cho tới khi close() """
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def create_schema(conn):
+    """ Các bảng của foodie.db (database.py) và cosmetics.db (main.py) trên cùng một kết nối """
+    import database
+    import main
+
+    database.create_tables(conn)
+    main.create_tables(conn)
+
+
+class FakeBackend(SQLiteBackend):
+    def __init__(self, schema=create_schema):
+        """ Database SQLite trong bộ nhớ, dùng chung một kết nối cho mọi luồng; schema(conn) tạo bảng """
+        super().__init__(":memory:")
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn_lock = threading.RLock()
+        schema(self._conn)
+
+    def _acquire(self):
+        self._conn_lock.acquire()
+        return self._conn
+
+    def _release(self, conn):
+        self._conn_lock.release()
+
+    def close(self):
+        self._conn.close()
+
+
+class ODBCBackend(Backend):
+    def __init__(self, connection_string=ODBC_CONNECTION, pool_size=ODBC_POOL_SIZE, names=None):
+        """
+        Nhóm tối đa pool_size kết nối pyodbc, mở dần khi cần và được dùng lại.
+        names: tên bảng / cột thật trên SQL Server ngoài MonAn / TenMonAn (xem SQLServerDialect)
+        """
+        try:
+            import pyodbc
+        except ImportError:
+            raise StorageError("Chưa cài pyodbc (pip install pyodbc)")
+        self.dialect = SQLServerDialect(names)
+        self._pyodbc = pyodbc
+        self.errors = (pyodbc.Error,)
+        self.connection_string = connection_string
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._pyodbc.connect(self.connection_string, autocommit=False)
+        except self._pyodbc.Error as e:
+            self._slots.release()
+            raise StorageError(str(e)) from e
+
+    def _release(self, conn):
+        self._idle.put(conn)
+        self._slots.release()
+
+    def executemany(self, sql, rows):
+        """ Ghi hàng loạt: fast_executemany gửi cả lô tham số trong một lần thay vì từng dòng """
+        with self.transaction() as cursor:
+            cursor.fast_executemany = True
+            cursor.executemany(sql, rows)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class Store:
+    def __init__(self, backend):
+        """ Truy vấn nghiệp vụ trên một backend bất kỳ """
+        self.backend = backend
+        self.dialect = backend.dialect
+
+    def get_mon_an(self, page=1, items_per_page=8):
+        """ Một trang món ăn (id, ten_mon, gia, hinh_anh) theo id """
+        name = self.dialect.name
+        sql, extra = self.dialect.page(f"SELECT * FROM {name('mon_an')}", name("id"),
+                                       items_per_page, (page - 1) * items_per_page)
+        return self.backend.query(sql, extra)
+
+    def search_food_names(self, keyword):
+        mon_an, ten_mon = self.dialect.name("mon_an"), self.dialect.name("ten_mon")
+        rows = self.backend.query(f"SELECT {ten_mon} FROM {mon_an} WHERE {ten_mon} LIKE ?",
+                                  (f"%{keyword}%",))
+        return [row[0] for row in rows]
+
+    def add_to_cart(self, user_id, mon_an_id, quantity=1):
+        """ Thêm quantity món vào gio_hang trong một transaction """
+        gio_hang = self.dialect.name("gio_hang")
+        with self.backend.transaction() as cursor:
+            cursor.execute(f"UPDATE {gio_hang} SET so_luong = so_luong + ? WHERE user_id=? AND mon_an_id=?",
+                           (quantity, user_id, mon_an_id))
+            if cursor.rowcount == 0:
+                cursor.execute(f"INSERT INTO {gio_hang} (user_id, mon_an_id, so_luong) VALUES (?, ?, ?)",
+                               (user_id, mon_an_id, quantity))
+        return True
+
+    def get_cart_items(self, user_id):
+        """ [(id, ten_mon, gia, so_luong, thanh_tien), ...] trong giỏ của user_id """
+        name = self.dialect.name
+        mon_an_id, gia = name("id"), name("gia")
+        return self.backend.query(
+            f"""SELECT m.{mon_an_id}, m.{name('ten_mon')}, m.{gia}, g.so_luong, m.{gia} * g.so_luong
+                FROM {name('gio_hang')} g JOIN {name('mon_an')} m ON g.mon_an_id = m.{mon_an_id}
+                WHERE g.user_id=?""", (user_id,))
+
+    def add_sale_items(self, sale_id, items, cursor=None):
+        """
+        Ghi hàng loạt dòng hóa đơn mỹ phẩm [(product_id, quantity, unit_price), ...].
+        cursor: ghi trong transaction đang mở của nơi gọi (ví dụ main.DataManager.checkout).
+        """
+        sql = f"""INSERT INTO {self.dialect.name('sale_items')} (sale_id, product_id, quantity, unit_price, subtotal)
+                  VALUES (?, ?, ?, ?, ?)"""
+        rows = [(sale_id, product_id, quantity, unit_price, quantity * unit_price)
+                for product_id, quantity, unit_price in items]
+        if cursor is None:
+            self.backend.executemany(sql, rows)
+        else:
+            cursor.executemany(sql, rows)
+
+    def get_sale_items(self, sale_id):
+        return self.backend.query(
+            f"SELECT product_id, quantity, unit_price, subtotal FROM {self.dialect.name('sale_items')} "
+            f"WHERE sale_id=? ORDER BY id", (sale_id,))
+
+
+def create_backend(kind=None, path="foodie.db"):
+    """ Backend theo kind ("sqlite", "odbc", "fake") hoặc biến môi trường FOODIE_STORAGE """
+    kind = kind or os.environ.get("FOODIE_STORAGE", "sqlite")
+    if kind == "odbc":
+        return ODBCBackend(os.environ.get("FOODIE_ODBC", ODBC_CONNECTION), names=odbc_names())
+    if kind == "fake":
+        return FakeBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(path)
+    raise ValueError(f"Backend không hợp lệ: {kind}")
+
+
+def odbc_names(text=None):
+    """ "id=MaMonAn,gia=DonGia" (mặc định: FOODIE_ODBC_NAMES) -> {"id": "MaMonAn", "gia": "DonGia"} """
+    text = os.environ.get("FOODIE_ODBC_NAMES", "") if text is None else text
+    names = {}
+    for pair in filter(None, (part.strip() for part in text.split(","))):
+        logical, _, actual = pair.partition("=")
+        if not actual.strip():
+            raise ValueError(f"FOODIE_ODBC_NAMES không hợp lệ: {pair}")
+        names[logical.strip()] = actual.strip()
+    return names
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(kind=None, path="foodie.db"):
+    """ Store dùng chung theo loại backend và file SQLite (kết nối được giữ lại giữa các lần gọi) """
+    kind = kind or os.environ.get("FOODIE_STORAGE", "sqlite")
+    with _stores_lock:
+        store = _stores.get((kind, path))
+        if store is None:
+            store = _stores[(kind, path)] = Store(create_backend(kind, path))
+        return store
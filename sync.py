@@ -0,0 +1,359 @@
+# sync.py
+# Đồng bộ nhiều quầy (kiosk) chạy offline, mỗi quầy có foodie.db và cosmetics.db riêng.
+#   - Trigger ghi mỗi thay đổi (bảng, khóa) vào bảng sync_log (chỉ thêm) và phiên bản của dòng
+#     (thời điểm, quầy) vào sync_rows.
+#   - push: đọc sync_log sau mốc đã gửi, gộp theo dòng, nén (zlib) thành changeset và gửi lên kho
+#     trung tâm (CentralStore) qua transport; chỉ đọc các dòng có thay đổi nên chi phí tỉ lệ với
+#     số thay đổi chứ không với kích thước database.
+#   - pull: nhận changeset của quầy khác sau mốc đã nhận và áp dụng trong một transaction.
+#     Xung đột giải theo "ghi sau thắng" (thời điểm, rồi tên quầy); cột đếm (tồn kho) được cộng
+#     phần chênh lệch thay vì ghi đè để hai quầy cùng bán không làm mất lượt trừ kho.
+#     Dòng vi phạm UNIQUE (trùng username, sku, ...) được ghi vào sync_conflicts.
+#   - Mỗi quầy có một khoảng id riêng (number * ID_BLOCK) cho bảng AUTOINCREMENT nên đơn / hóa đơn
+#     tạo ở hai quầy không trùng id.
+# Dữ liệu có trước khi cài đồng bộ không được gửi (ví dụ thực đơn mẫu giống nhau ở mọi quầy).
+import json
+import sqlite3
+import threading
+import zlib
+
+BATCH_SIZE = 500          # số mục sync_log mỗi changeset
+ID_BLOCK = 1_000_000_000  # khoảng id của mỗi quầy
+
+# Bảng được đồng bộ -> cột khóa chính
+FOODIE_TABLES = {"users": "id", "mon_an": "id", "orders": "id", "order_items": "id",
+                 "payments": "transaction_id"}
+COSMETICS_TABLES = {"products": "id", "customers": "id", "sales": "id", "sale_items": "id",
+                    "inventory": "id"}
+# Cột đếm được gộp bằng cách cộng chênh lệch
+COSMETICS_COUNTERS = {"inventory": "quantity"}
+
+# Thời điểm hiện tại (giây unix) trong SQL, dùng trong trigger
+_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+
+
+class CentralStore:
+    def __init__(self, path="sync_central.db"):
+        """ Kho changeset trung tâm; id tăng dần là mốc để các quầy kéo về """
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS changesets
+                                  (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                   db TEXT NOT NULL,
+                                   origin TEXT NOT NULL,
+                                   upto INTEGER NOT NULL,
+                                   payload BLOB NOT NULL,
+                                   UNIQUE (db, origin, upto))''')
+
+    def push(self, db, origin, upto, payload):
+        """ Lưu changeset; gửi lại cùng (db, origin, upto) trả về id cũ, không lưu hai lần """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO changesets (db, origin, upto, payload) VALUES (?, ?, ?, ?)",
+                               (db, origin, upto, payload))
+            return self._conn.execute("SELECT id FROM changesets WHERE db=? AND origin=? AND upto=?",
+                                      (db, origin, upto)).fetchone()[0]
+
+    def pull(self, db, after, exclude, limit=50):
+        """ [(id, payload)] của quầy khác exclude, sau mốc after """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, payload FROM changesets WHERE db=? AND id>? AND origin<>? ORDER BY id LIMIT ?",
+                (db, after, exclude, limit)).fetchall()
+
+    def close(self):
+        self._conn.close()
+
+
+class LocalTransport:
+    def __init__(self, central):
+        """ Transport trong máy / mạng nội bộ: gọi thẳng CentralStore, dữ liệu đi qua là bytes đã nén """
+        self.central = central
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def push(self, db, origin, upto, payload):
+        self.bytes_sent += len(payload)
+        return self.central.push(db, origin, upto, payload)
+
+    def pull(self, db, after, exclude):
+        changesets = self.central.pull(db, after, exclude)
+        self.bytes_received += sum(len(payload) for _, payload in changesets)
+        return changesets
+
+
+class SyncStats:
+    def __init__(self):
+        self.pushed = 0      # dòng đã gửi
+        self.pulled = 0      # dòng đã nhận
+        self.applied = 0     # dòng nhận được áp dụng
+        self.skipped = 0     # dòng nhận được cũ hơn bản đang có
+        self.conflicts = 0   # dòng nhận được vi phạm ràng buộc
+
+    def __repr__(self):
+        return (f"SyncStats(pushed={self.pushed}, pulled={self.pulled}, applied={self.applied}, "
+                f"skipped={self.skipped}, conflicts={self.conflicts})")
+
+
+class Terminal:
+    def __init__(self, path, db, name, number, tables, counters=None):
+        """ Một database của một quầy: path là file SQLite, db là tên chung trên kho trung tâm
+            ("foodie", "cosmetics"), name / number là tên và số thứ tự (>= 1) của quầy """
+        self.path = path
+        self.db = db
+        self.name = name
+        self.number = number
+        self.tables = tables
+        self.counters = counters or {}
+        self._columns = {}
+
+    def connect(self):
+        conn = sqlite3.connect(self.path)
+        if not self._columns:
+            for table in self.tables:
+                self._columns[table] = [col[1] for col in conn.execute(f"PRAGMA table_info({table})")]
+        return conn
+
+    def install(self):
+        """ Tạo bảng, trigger đồng bộ và khoảng id của quầy; gọi lại nhiều lần không sao """
+        conn = self.connect()
+        try:
+            with conn:
+                c = conn.cursor()
+                c.execute('''CREATE TABLE IF NOT EXISTS sync_meta
+                             (id INTEGER PRIMARY KEY CHECK (id = 1),
+                              terminal TEXT NOT NULL,
+                              applying INTEGER NOT NULL DEFAULT 0,
+                              last_pushed INTEGER NOT NULL DEFAULT 0,
+                              last_pulled INTEGER NOT NULL DEFAULT 0)''')
+                c.execute("INSERT OR IGNORE INTO sync_meta (id, terminal) VALUES (1, ?)", (self.name,))
+                c.execute('''CREATE TABLE IF NOT EXISTS sync_log
+                             (seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                              tbl TEXT NOT NULL,
+                              pk NOT NULL,
+                              delta REAL NOT NULL DEFAULT 0)''')
+                c.execute('''CREATE TABLE IF NOT EXISTS sync_rows
+                             (tbl TEXT NOT NULL,
+                              pk NOT NULL,
+                              changed_at REAL NOT NULL,
+                              origin TEXT NOT NULL,
+                              deleted INTEGER NOT NULL DEFAULT 0,
+                              PRIMARY KEY (tbl, pk))''')
+                c.execute('''CREATE TABLE IF NOT EXISTS sync_conflicts
+                             (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                              tbl TEXT NOT NULL,
+                              pk NOT NULL,
+                              origin TEXT NOT NULL,
+                              row TEXT,
+                              reason TEXT NOT NULL)''')
+                for table, pk in self.tables.items():
+                    self._create_triggers(c, table, pk)
+                    self._reserve_ids(c, table)
+        finally:
+            conn.close()
+
+    def _create_triggers(self, c, table, pk):
+        counter = self.counters.get(table)
+        applying = "(SELECT applying FROM sync_meta WHERE id = 1) = 0"
+        # Phiên bản mới luôn lớn hơn phiên bản đang có, kể cả khi đồng hồ quầy khác chạy nhanh
+        version = (f"INSERT OR REPLACE INTO sync_rows (tbl, pk, changed_at, origin, deleted) "
+                   f"VALUES ('{table}', {{row}}.{pk}, MAX({_NOW}, COALESCE((SELECT changed_at + 0.000001 "
+                   f"FROM sync_rows WHERE tbl = '{table}' AND pk = {{row}}.{pk}), 0)), "
+                   f"(SELECT terminal FROM sync_meta WHERE id = 1), {{deleted}});")
+        for event, row, delta, deleted in (
+                ("INSERT", "NEW", f"NEW.{counter}" if counter else "0", 0),
+                ("UPDATE", "NEW", f"NEW.{counter} - OLD.{counter}" if counter else "0", 0),
+                ("DELETE", "OLD", f"-OLD.{counter}" if counter else "0", 1)):
+            c.execute(f'''CREATE TRIGGER IF NOT EXISTS sync_{table}_{event.lower()} AFTER {event} ON {table}
+                          WHEN {applying}
+                          BEGIN
+                              INSERT INTO sync_log (tbl, pk, delta) VALUES ('{table}', {row}.{pk}, {delta});
+                              {version.format(row=row, deleted=deleted)}
+                          END''')
+
+    def _reserve_ids(self, c, table):
+        """ Đưa AUTOINCREMENT của bảng vào khoảng id của quầy """
+        c.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,))
+        if "AUTOINCREMENT" not in c.fetchone()[0].upper():
+            return
+        start = self.number * ID_BLOCK
+        c.execute("SELECT seq FROM sqlite_sequence WHERE name=?", (table,))
+        row = c.fetchone()
+        if row is None:
+            c.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, start))
+        elif row[0] < start:
+            c.execute("UPDATE sqlite_sequence SET seq=? WHERE name=?", (start, table))
+
+    def push(self, transport, stats=None):
+        """ Gửi các thay đổi chưa gửi theo lô BATCH_SIZE; trả về SyncStats """
+        stats = stats or SyncStats()
+        conn = self.connect()
+        try:
+            while True:
+                last_pushed = conn.execute("SELECT last_pushed FROM sync_meta WHERE id = 1").fetchone()[0]
+                log = conn.execute("SELECT seq, tbl, pk, delta FROM sync_log WHERE seq > ? ORDER BY seq LIMIT ?",
+                                   (last_pushed, BATCH_SIZE)).fetchall()
+                if not log:
+                    break
+                upto = log[-1][0]
+                # Nhiều thay đổi của cùng một dòng chỉ gửi bản hiện tại một lần, chênh lệch được cộng dồn
+                deltas = {}
+                for _, table, pk, delta in log:
+                    deltas[(table, pk)] = deltas.get((table, pk), 0) + delta
+                changes = [self._read_change(conn, table, pk, delta) for (table, pk), delta in deltas.items()]
+                payload = zlib.compress(json.dumps({"origin": self.name, "changes": changes},
+                                                   ensure_ascii=False).encode("utf-8"))
+                transport.push(self.db, self.name, upto, payload)
+                # Kho trung tâm đã nhận: dời mốc và bỏ phần log đã gửi
+                with conn:
+                    conn.execute("UPDATE sync_meta SET last_pushed=? WHERE id = 1", (upto,))
+                    conn.execute("DELETE FROM sync_log WHERE seq <= ?", (upto,))
+                stats.pushed += len(changes)
+        finally:
+            conn.close()
+        return stats
+
+    def _read_change(self, conn, table, pk, delta):
+        changed_at, origin, deleted = conn.execute(
+            "SELECT changed_at, origin, deleted FROM sync_rows WHERE tbl=? AND pk=?", (table, pk)).fetchone()
+        row = None
+        if not deleted:
+            values = conn.execute(f"SELECT * FROM {table} WHERE {self.tables[table]}=?", (pk,)).fetchone()
+            if values is not None:
+                row = dict(zip(self._columns[table], values))
+        return [table, pk, changed_at, origin, row, delta]
+
+    def pull(self, transport, stats=None):
+        """ Nhận và áp dụng changeset của các quầy khác; trả về SyncStats """
+        stats = stats or SyncStats()
+        conn = self.connect()
+        try:
+            while True:
+                last_pulled = conn.execute("SELECT last_pulled FROM sync_meta WHERE id = 1").fetchone()[0]
+                changesets = transport.pull(self.db, last_pulled, self.name)
+                if not changesets:
+                    break
+                for changeset_id, payload in changesets:
+                    changeset = json.loads(zlib.decompress(payload).decode("utf-8"))
+                    # Áp dụng và dời mốc trong cùng transaction; trigger bỏ qua khi applying = 1
+                    with conn:
+                        conn.execute("UPDATE sync_meta SET applying = 1 WHERE id = 1")
+                        for change in changeset["changes"]:
+                            self._apply(conn, changeset["origin"], change, stats)
+                        conn.execute("UPDATE sync_meta SET applying = 0, last_pulled=? WHERE id = 1",
+                                     (changeset_id,))
+                    stats.pulled += len(changeset["changes"])
+        finally:
+            conn.close()
+        return stats
+
+    def _apply(self, conn, sender, change, stats):
+        table, pk, changed_at, origin, row, delta = change
+        if table not in self.tables:
+            return
+        key = self.tables[table]
+        counter = self.counters.get(table)
+        local = conn.execute("SELECT changed_at, origin FROM sync_rows WHERE tbl=? AND pk=?",
+                             (table, pk)).fetchone()
+        newer = local is None or (changed_at, origin) > tuple(local)
+        exists = conn.execute(f"SELECT 1 FROM {table} WHERE {key}=?", (pk,)).fetchone() is not None
+        try:
+            if row is None:
+                if not newer:
+                    stats.skipped += 1
+                    return
+                conn.execute(f"DELETE FROM {table} WHERE {key}=?", (pk,))
+            elif not exists:
+                if local is not None and not newer:
+                    # Dòng đã bị xóa ở đây sau thay đổi này
+                    stats.skipped += 1
+                    return
+                if counter:
+                    row = dict(row, **{counter: delta})
+                columns = [col for col in row if col in self._columns[table]]
+                conn.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                             [row[col] for col in columns])
+            else:
+                columns = [col for col in row if col in self._columns[table] and col not in (key, counter)]
+                if counter and delta:
+                    conn.execute(f"UPDATE {table} SET {counter} = {counter} + ? WHERE {key}=?", (delta, pk))
+                if not newer:
+                    stats.skipped += 1
+                    return
+                if columns:
+                    conn.execute(f"UPDATE {table} SET {', '.join(col + '=?' for col in columns)} WHERE {key}=?",
+                                 [row[col] for col in columns] + [pk])
+        except sqlite3.IntegrityError as e:
+            conn.execute("INSERT INTO sync_conflicts (tbl, pk, origin, row, reason) VALUES (?, ?, ?, ?, ?)",
+                         (table, pk, sender, json.dumps(row, ensure_ascii=False), str(e)))
+            stats.conflicts += 1
+            return
+        conn.execute("INSERT OR REPLACE INTO sync_rows (tbl, pk, changed_at, origin, deleted) VALUES (?, ?, ?, ?, ?)",
+                     (table, pk, changed_at, origin, int(row is None)))
+        stats.applied += 1
+
+    def sync(self, transport):
+        """ Gửi rồi nhận; trả về SyncStats """
+        stats = self.push(transport)
+        return self.pull(transport, stats)
+
+
+def foodie_terminal(name, number, path="foodie.db"):
+    return Terminal(path, "foodie", name, number, FOODIE_TABLES)
+
+
+def cosmetics_terminal(name, number, path="cosmetics.db"):
+    return Terminal(path, "cosmetics", name, number, COSMETICS_TABLES, COSMETICS_COUNTERS)
+
+
+if __name__ == "__main__":
+    # Hai quầy với hai database riêng cùng bán và đồng bộ qua một kho trung tâm
+    import os
+    import tempfile
+    import time
+
+    import database
+
+    os.chdir(tempfile.mkdtemp())
+    terminals = []
+    for number in (1, 2):
+        os.makedirs(f"kiosk{number}")
+        os.chdir(f"kiosk{number}")
+        database.create_tables()
+        os.chdir("..")
+        terminal = foodie_terminal(f"kiosk{number}", number, f"kiosk{number}/foodie.db")
+        terminal.install()
+        terminals.append(terminal)
+    transport = LocalTransport(CentralStore("central.db"))
+    a, b = terminals
+
+    conn = sqlite3.connect(a.path)
+    with conn:
+        for i in range(2000):
+            cur = conn.execute("INSERT INTO orders (user_id, table_no, payment_method, total) VALUES (1, ?, 'tien_mat', ?)",
+                               (i % 20 + 1, 40000))
+            conn.execute("INSERT INTO order_items (order_id, mon_an_id, so_luong, gia) VALUES (?, 1, 1, 40000)",
+                         (cur.lastrowid,))
+        conn.execute("UPDATE mon_an SET gia = 45000 WHERE id = 1")
+    conn.close()
+    conn = sqlite3.connect(b.path)
+    with conn:
+        conn.execute("UPDATE mon_an SET gia = 50000 WHERE id = 1")  # ghi sau nên thắng
+        conn.execute("INSERT INTO orders (user_id, table_no, payment_method, total) VALUES (2, 3, 'chuyen_khoan', 50000)")
+    conn.close()
+
+    start = time.perf_counter()
+    print("kiosk1", a.sync(transport))
+    print("kiosk2", b.sync(transport))
+    print("kiosk1", a.sync(transport))
+    elapsed = (time.perf_counter() - start) * 1000
+    for terminal in terminals:
+        conn = sqlite3.connect(terminal.path)
+        print(terminal.name, "đơn:", conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0],
+              "giá món 1:", conn.execute("SELECT gia FROM mon_an WHERE id = 1").fetchone()[0])
+        conn.close()
+    print(f"Đồng bộ {elapsed:.0f} ms, gửi {transport.bytes_sent} byte, nhận {transport.bytes_received} byte")
+    # Không có thay đổi mới: không đọc bảng dữ liệu nào
+    start = time.perf_counter()
+    a.sync(transport)
+    print(f"Đồng bộ khi không có thay đổi: {(time.perf_counter() - start) * 1000:.2f} ms")
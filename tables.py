@@ -0,0 +1,144 @@
+# tables.py
+# Trạng thái bàn trong sảnh: bàn nào đang có khách, đơn đang mở và thời điểm khách ngồi.
+# Dữ liệu được giữ gọn trong bộ nhớ (bitset cho bàn có khách, mảng cho đơn và thời gian),
+# cập nhật theo sự kiện từ orders.OrderService thay vì hỏi lại database, và phát tín hiệu
+# Qt để mọi màn hình đang mở (ví dụ combo chon_ban) cập nhật ngay.
+import threading
+import time
+from array import array
+
+from qt_compat import QtCore
+
+import database
+import orders
+
+CLOSED_STATUSES = ("da_xong", "da_huy")
+
+
+class TableMap(QtCore.QObject):
+    # table_no, occupied
+    table_changed = QtCore.pyqtSignal(int, bool)
+
+    def __init__(self, table_count=orders.TABLE_COUNT, parent=None):
+        """ Sơ đồ bàn 1..table_count, nạp các đơn đang mở từ database một lần """
+        super().__init__(parent)
+        self.table_count = table_count
+        self._lock = threading.Lock()
+        self._occupied = bytearray((table_count + 8) // 8)  # bit i = bàn i có khách
+        self._open_order = array("q", [0]) * (table_count + 1)  # 0 = không có đơn
+        self._seated_at = array("d", [0.0]) * (table_count + 1)
+        self._free = table_count
+        for order_id, _, table_no, _, _, _, _ in database.get_open_orders():
+            if 1 <= table_no <= table_count and not self.is_occupied(table_no):
+                self._set(table_no, True, order_id)
+
+    def is_occupied(self, table_no):
+        return bool(self._occupied[table_no >> 3] & (1 << (table_no & 7)))
+
+    def _set(self, table_no, occupied, order_id=0):
+        mask = 1 << (table_no & 7)
+        if occupied:
+            if not self._occupied[table_no >> 3] & mask:
+                self._free -= 1
+                self._seated_at[table_no] = time.time()
+            self._occupied[table_no >> 3] |= mask
+            self._open_order[table_no] = order_id
+        else:
+            if self._occupied[table_no >> 3] & mask:
+                self._free += 1
+            self._occupied[table_no >> 3] &= ~mask & 0xFF
+            self._open_order[table_no] = 0
+            self._seated_at[table_no] = 0.0
+
+    def seat(self, table_no, order_id=0):
+        """ Đánh dấu bàn có khách (và đơn đang mở nếu có) """
+        with self._lock:
+            was_occupied = self.is_occupied(table_no)
+            self._set(table_no, True, order_id or self._open_order[table_no])
+        if not was_occupied:
+            self.table_changed.emit(table_no, True)
+
+    def release(self, table_no):
+        """ Trả bàn khi khách rời đi hoặc mọi đơn của bàn đã xong """
+        with self._lock:
+            was_occupied = self.is_occupied(table_no)
+            self._set(table_no, False)
+        if was_occupied:
+            self.table_changed.emit(table_no, False)
+
+    def free_count(self):
+        return self._free
+
+    def free_tables(self):
+        """ Danh sách bàn trống, duyệt theo từng byte của bitset """
+        result = []
+        with self._lock:
+            for index, byte in enumerate(self._occupied):
+                if byte == 0xFF:
+                    continue
+                base = index << 3
+                for bit in range(8):
+                    table_no = base + bit
+                    if 1 <= table_no <= self.table_count and not byte & (1 << bit):
+                        result.append(table_no)
+        return result
+
+    def info(self, table_no):
+        """ (có khách, id đơn đang mở, số giây đã ngồi) của một bàn """
+        with self._lock:
+            occupied = self.is_occupied(table_no)
+            seated = time.time() - self._seated_at[table_no] if occupied else 0.0
+            return occupied, self._open_order[table_no], seated
+
+    def attach(self, order_service):
+        """ Cập nhật theo sự kiện của orders.OrderService """
+        def listener(event, order):
+            table_no = order.get("table_no")
+            if table_no is None or not 1 <= table_no <= self.table_count:
+                return
+            if event == "placed":
+                self.seat(table_no, order["id"])
+            elif event == "status" and order.get("status") in CLOSED_STATUSES:
+                # "da_xong" do bếp phát khi mẻ cuối của đơn xong (kitchen.KitchenService.complete)
+                next_order = order_service.next_order(table_no)
+                if next_order is None:
+                    self.release(table_no)
+                else:
+                    with self._lock:
+                        self._open_order[table_no] = next_order["id"]
+        order_service.subscribe(listener)
+
+
+_table_map = None
+
+
+def get_table_map():
+    """ TableMap dùng chung, gắn với OrderService dùng chung """
+    global _table_map
+    if _table_map is None:
+        _table_map = TableMap()
+        _table_map.attach(orders.get_service())
+    return _table_map
+
+
+class TableComboBinder(QtCore.QObject):
+    def __init__(self, combo, table_map):
+        """ Giữ combo chon_ban khớp với danh sách bàn trống; tự ngắt khi combo bị hủy """
+        super().__init__(combo)
+        self.combo = combo
+        self.table_map = table_map
+        table_map.table_changed.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self, *args):
+        """ Đổ lại danh sách bàn trống, giữ bàn đang chọn nếu vẫn còn trống """
+        combo = self.combo
+        current = combo.currentData()
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem("Bàn", 0)
+        for table_no in self.table_map.free_tables():
+            combo.addItem(f"Bàn {table_no}", table_no)
+        index = combo.findData(current) if current else -1
+        combo.setCurrentIndex(max(index, 0))
+        combo.blockSignals(False)
@@ -0,0 +1,53 @@
+# conftest.py
+# Chạy test từ thư mục gốc của repo; database.py tạo foodie.db trong thư mục hiện tại ngay khi import,
+# nên mọi test chạy trong một thư mục tạm (giống benchmark trong __main__ của các module).
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+# Các test giao diện chạy không cần màn hình
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import cart_service  # noqa: E402  (sau khi sys.path đã có thư mục gốc)
+import database  # noqa: E402
+import kitchen  # noqa: E402
+import orders  # noqa: E402
+
+
+async def _cancel(task):
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.fixture
+def kitchen_services(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cart_service, "_carts", {})
+    database.create_tables()
+    order_service = orders.OrderService()
+    service = kitchen.KitchenService()
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(service.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+    service.attach(order_service)
+    yield order_service, service
+    asyncio.run_coroutine_threadsafe(_cancel(service._task), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+    order_service.stop()
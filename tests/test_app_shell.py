@@ -0,0 +1,80 @@
+# test_app_shell.py
+import pytest
+
+from qt_compat import QtWidgets
+
+
+@pytest.fixture
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_new_screen_is_not_evicted_over_budget(app):
+    import app_shell
+
+    shell = app_shell.AppShell(start_screen="page_1", widget_budget=60)
+    shell.show_screen("page_2")
+    assert shell.current == "page_2"
+    assert "page_2" in shell._cache
+    assert shell.stack.currentWidget() is shell._cache["page_2"][0]
+
+
+def test_prewarm_never_evicts_visited_screens(app):
+    import app_shell
+
+    shell = app_shell.AppShell(start_screen="page_1")
+    shell.show_screen("page_2")
+    visited = dict(shell._cache)
+    shell.widget_budget = sum(entry[2] for entry in visited.values())
+    shell._warm_queue = ["page_3", "page_4"]
+    shell._warm_one()
+    assert shell._cache.keys() == visited.keys()
+    assert shell._warm_queue == []
+
+
+def test_cart_label_updates_on_ui_thread(app, monkeypatch):
+    import threading
+
+    import app_shell
+    import cart_service
+
+    shell = app_shell.AppShell(start_screen="page_1")
+    slots = []
+    real = shell._show_cart_total
+    monkeypatch.setattr(shell, "_show_cart_total", lambda *args: slots.append(threading.current_thread()))
+    shell._signals.cart_changed.disconnect()
+    shell._signals.cart_changed.connect(shell._show_cart_total)
+    shell.user_id = 4242
+    shell.show_screen("gio_hang")
+    cart = cart_service.get_cart(4242)
+    worker = threading.Thread(target=cart.add, args=(1,))
+    worker.start()
+    worker.join()
+    app.processEvents()
+    assert slots and all(thread is threading.main_thread() for thread in slots)
+    real(cart, shell.screen("gio_hang")[1], cart.count)
+    assert "1 món" in shell.screen("gio_hang")[1].label_9.text()
+
+
+def test_kitchen_screen_needs_admin_session(app, monkeypatch, tmp_path):
+    import app_shell
+    import auth
+    import database
+
+    monkeypatch.chdir(tmp_path)
+    database.create_tables()
+    database.register_user("thu_ngan", "mat-khau", "Nguyễn", "An", "0900000000")
+    warnings = []
+    monkeypatch.setattr(app_shell.QtWidgets.QMessageBox, "warning", lambda *args: warnings.append(args[1]))
+    shell = app_shell.AppShell(start_screen="page_1")
+    session = auth.login_async("thu_ngan", "mat-khau").result(10)
+    shell.user_id, shell.session_token = session.user_id, session.token
+    shell.show_screen("bep")
+    assert shell.current == "page_1"
+    assert warnings == ["Không có quyền"]
+    assert shell.session_token == session.token  # phiên thu ngân vẫn giữ nguyên
+
+    database.set_admin("thu_ngan")
+    session = auth.login_async("thu_ngan", "mat-khau").result(10)
+    shell.user_id, shell.session_token = session.user_id, session.token
+    assert shell._require_session(lambda: None, admin=True)
@@ -0,0 +1,32 @@
+# test_auth.py
+import auth
+import database
+
+
+def test_only_flagged_users_get_admin_sessions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database.create_tables()
+    database.register_user("thu_ngan", "mat-khau", "Nguyễn", "An", "0900000000")
+    authenticator = auth.Authenticator()
+    try:
+        session = authenticator.login_async("thu_ngan", "mat-khau").result(10)
+        assert not session.is_admin
+        assert authenticator.authorize(session.token) == session.user_id
+        assert authenticator.authorize_admin(session.token) is None
+
+        assert database.set_admin("thu_ngan")
+        admin = authenticator.login_async("thu_ngan", "mat-khau").result(10)
+        assert authenticator.authorize_admin(admin.token) == admin.user_id
+    finally:
+        authenticator.shutdown()
+
+
+def test_is_admin_column_is_added_to_existing_users_table(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = database.create_connection()
+    conn.execute("""CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+                    password TEXT NOT NULL, ho TEXT NOT NULL, ten TEXT NOT NULL, sdt TEXT NOT NULL)""")
+    conn.close()
+    database.create_tables()
+    database.register_user("cu", "mat-khau", "Trần", "Bình", "0911111111")
+    assert database.login_user("cu", "mat-khau")[3] is False
@@ -0,0 +1,44 @@
+# test_cart_service.py
+import threading
+
+import cart_service
+import database
+
+
+def test_unknown_dish_reloads_prices_once_per_menu_version(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database.create_tables()
+    monkeypatch.setattr(cart_service, "_prices_version", None)
+    monkeypatch.setattr(cart_service, "_prices_checked_at", 0.0)
+    monkeypatch.setattr(cart_service, "MENU_CHECK_INTERVAL", 0)
+    loads = []
+    real = database.get_mon_an_prices
+    monkeypatch.setattr(database, "get_mon_an_prices", lambda: loads.append(1) or real())
+
+    cart_service.prices()
+    assert len(loads) == 1
+    for _ in range(5):
+        assert cart_service.price_of(999999) == 0
+    assert len(loads) == 2  # một lần nạp lại cho món lạ, sau đó nhớ là không có
+
+    # Thực đơn đổi: bảng giá và danh sách món không có được nạp lại
+    conn = database.create_connection()
+    with conn:
+        conn.execute("INSERT INTO mon_an (id, ten_mon, gia, hinh_anh) VALUES (999999, 'Món mới', 30000, '')")
+    conn.close()
+    assert cart_service.price_of(999999) == 30000
+    assert len(loads) == 3
+
+
+def test_summary_from_another_thread_keeps_listener_on_caller_thread(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database.create_tables()
+    cart = cart_service.Cart(1, journal_dir=str(tmp_path / "journal"))
+    threads = []
+    cart.subscribe(lambda count, total: threads.append(threading.current_thread()))
+    worker = threading.Thread(target=cart.add, args=(1,))
+    worker.start()
+    worker.join()
+    # Listener chạy trên luồng đổi giỏ: giao diện phải chuyển qua tín hiệu Qt (xem app_shell)
+    assert threads == [threading.main_thread(), worker]
+    cart.close()
@@ -0,0 +1,26 @@
+# test_combos.py
+import threading
+
+import combos
+
+
+def test_shared_cache_survives_concurrent_pricing():
+    prices = {1: 30000, 2: 20000, 3: 10000}
+    rules = [combos.ComboRule("c1", "Combo 1", {1: 1, 2: 1, 3: 1}, 50000)]
+    pricer = combos.ComboPricer(rules, prices, cache_size=4)
+    errors = []
+
+    def worker(offset):
+        try:
+            for n in range(2000):
+                quote = pricer.price({1: 1 + (n + offset) % 7, 2: 1, 3: 1})
+                assert quote.savings == 10000
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(pricer._cache) <= 4
@@ -0,0 +1,35 @@
+# test_kitchen.py
+import queue
+import threading
+
+import cart_service
+import database
+
+
+def test_order_goes_through_every_batch_to_da_xong(kitchen_services):
+    order_service, service = kitchen_services
+    statuses = queue.Queue()
+    order_service.subscribe(lambda event, order: event == "status" and statuses.put(order["status"]))
+    cart = cart_service.get_cart(1)
+    cart.add(1)      # Phở bò -> bếp chính
+    cart.add(25, 2)  # Pepsi -> nước
+    order = order_service.place_order(1, 3, "tien_mat", timeout=5)
+    assert order["status"] == "cho_xu_ly"
+
+    batches = []
+    for station in ("bep", "nuoc"):
+        batch = None
+        for _ in range(100):
+            batch = service.take_batch_threadsafe(station).result(5)
+            if batch is not None:
+                break
+            threading.Event().wait(0.01)
+        assert batch is not None
+        batches.append(batch)
+    assert statuses.get(timeout=5) == "dang_lam"
+
+    service.complete_threadsafe(batches[0])
+    service.complete_threadsafe(batches[1])
+    assert statuses.get(timeout=5) == "da_xong"
+    assert order_service.orders_for_table(3) == []
+    assert database.get_order(order["id"])[0][5] == "da_xong"
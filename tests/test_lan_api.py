@@ -0,0 +1,66 @@
+# test_lan_api.py
+import http.client
+
+import pytest
+
+import cart_service
+import database
+import lan_api
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cart_service, "_carts", {})
+    database.create_tables()
+    database.register_user("thu_ngan", "mat-khau", "Nguyễn", "An", "0900000000")
+    server = lan_api.ApiServer(port=0, foodie_path=str(tmp_path / "foodie.db"))
+    assert server.host == "127.0.0.1"
+    return lan_api.ApiClient(f"http://127.0.0.1:{server.start_in_thread()}")
+
+
+def test_mutating_routes_need_a_session_token(client):
+    assert client.get_mon_an(1, 2)  # đọc thực đơn không cần đăng nhập
+    with pytest.raises(lan_api.ApiError) as error:
+        client.add_to_cart(1, 1)
+    assert error.value.status == 401
+    assert client.login("thu_ngan", "sai") is None
+
+    user_id, _, _, is_admin = client.login("thu_ngan", "mat-khau")
+    assert not is_admin
+    assert client.add_to_cart(user_id, 1)["count"] == 1
+    with pytest.raises(lan_api.ApiError) as error:
+        client.add_to_cart(user_id + 1, 1)  # giỏ của người khác
+    assert error.value.status == 403
+    # Yêu cầu con trong /batch cũng bị kiểm tra theo token của lượt gộp
+    client.token = None
+    responses = client.batch([{"method": "POST", "path": "/cart",
+                               "body": {"user_id": user_id, "mon_an_id": 1}}])
+    assert responses[0]["status"] == 401
+
+
+class _DroppedConnection:
+    requests = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def request(self, method, target, data, headers):
+        self.requests.append(method)
+        raise http.client.RemoteDisconnected("máy chủ đóng kết nối")
+
+    def close(self):
+        pass
+
+
+def test_only_safe_requests_are_retried(monkeypatch):
+    monkeypatch.setattr(lan_api.http.client, "HTTPConnection", _DroppedConnection)
+    monkeypatch.setattr(_DroppedConnection, "requests", [])
+    client = lan_api.ApiClient("http://127.0.0.1:1")
+    for call in (lambda: client.add_to_cart(1, 1),
+                 lambda: client.orders_for_table(1),
+                 lambda: client.place_order(1, 1, "tien_mat", request_key="k1")):
+        with pytest.raises(http.client.RemoteDisconnected):
+            call()
+    # POST /cart không có request_key: gửi một lần; GET và POST có request_key: gửi lại một lần
+    assert _DroppedConnection.requests == ["POST", "GET", "GET", "POST", "POST"]
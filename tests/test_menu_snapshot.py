@@ -0,0 +1,31 @@
+# test_menu_snapshot.py
+import database
+import menu_snapshot
+
+
+def test_ids_above_int32(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database.create_tables()
+    conn = database.create_connection()
+    with conn:
+        conn.execute("INSERT INTO mon_an (id, ten_mon, gia, hinh_anh) VALUES (?, ?, ?, ?)",
+                     (3_000_000_001, "Gà quay máy 3", 5_000_000_000, ":/pic/ga.jpg"))
+    conn.close()
+    snapshot = menu_snapshot.load()
+    try:
+        assert snapshot.find(3_000_000_001).as_tuple() == (3_000_000_001, "Gà quay máy 3", 5_000_000_000,
+                                                           ":/pic/ga.jpg")
+        assert snapshot.get_mon_an(1, 10 ** 6) == database.get_mon_an(1, 10 ** 6)
+    finally:
+        snapshot.close()
+
+
+def test_load_falls_back_when_export_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    database.create_tables()
+
+    def export(path):
+        raise OverflowError("signed integer is greater than maximum")
+
+    monkeypatch.setattr(menu_snapshot, "export", export)
+    assert menu_snapshot.load() is None
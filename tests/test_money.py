@@ -0,0 +1,13 @@
+# test_money.py
+import pytest
+
+import money
+
+
+def test_parse_rejects_fractional_dong_but_accepts_zero_fraction():
+    assert money.parse("250000.0") == money.parse("250.000 đ") == 250000
+    for text in ("250.5", "0.4", "99999.99"):
+        with pytest.raises(ValueError):
+            money.parse(text)
+    # Số thực tính ra (ví dụ thuế) vẫn được làm tròn
+    assert money.to_minor(250.5) == 251
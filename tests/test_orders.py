@@ -0,0 +1,38 @@
+# test_orders.py
+import sqlite3
+
+import pytest
+
+import cart_service
+import database
+import orders
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cart_service, "_carts", {})
+    database.create_tables()
+    service = orders.OrderService()
+    yield service
+    service.stop()
+
+
+def test_empty_cart_returns_none(service):
+    assert service.place_order(1, 1, "tien_mat", timeout=5) is None
+
+
+def test_database_error_is_not_reported_as_empty_cart(service, monkeypatch):
+    cart_service.get_cart(1).add(1, 2)
+    real = database.place_order
+
+    def locked(*args):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(database, "place_order", locked)
+    with pytest.raises(orders.OrderFailed):
+        service.place_order(1, 1, "tien_mat", timeout=5, request_key="k1")
+    # Giỏ hàng còn nguyên, thử lại với cùng request_key đặt được đơn
+    assert cart_service.get_cart(1).count == 2
+    monkeypatch.setattr(database, "place_order", real)
+    order = service.place_order(1, 1, "tien_mat", timeout=5, request_key="k1")
+    assert order is not None and order["table_no"] == 1
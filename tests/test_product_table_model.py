@@ -0,0 +1,25 @@
+# test_product_table_model.py
+from product_catalog import ProductCatalog
+import main
+
+ROWS = [(n, f"Sản phẩm {n}", "Brand X", "Chăm sóc da", n * 1000, f"SKU{n:03d}", 10) for n in range(1, 6)]
+
+
+def test_model_is_notified_before_catalog_changes():
+    catalog = ProductCatalog(ROWS)
+    model = main.ProductTableModel(catalog)
+    seen = []
+    # Lúc view nhận "about to", danh mục phải còn nguyên như model đang báo
+    model.rowsAboutToBeInserted.connect(lambda parent, first, last: seen.append(("insert", len(catalog), first)))
+    model.rowsAboutToBeRemoved.connect(
+        lambda parent, first, last: seen.append(("remove", len(catalog), catalog.value(first, 0))))
+    model.modelAboutToBeReset.connect(lambda: seen.append(("reset", len(catalog), None)))
+
+    catalog.add(6, "Sản phẩm 6", "Brand Y", "Trang điểm", 6000, "SKU006", 1)
+    assert model.rowCount() == 6 and model.data(model.index(5, 0)) == "6"
+    catalog.remove(2)
+    assert model.rowCount() == 5
+    assert [model.data(model.index(row, 0)) for row in range(5)] == ["1", "6", "3", "4", "5"]
+    catalog.reset(ROWS[:2])
+    assert model.rowCount() == 2
+    assert seen == [("insert", 5, 5), ("remove", 6, 6), ("reset", 5, None)]
@@ -0,0 +1,55 @@
+# test_promotions.py
+import sqlite3
+import time
+
+import numpy as np
+
+import kitchen
+import promotions
+
+
+def test_price_and_price_batch_round_the_same_way():
+    rng = np.random.default_rng(7)
+    # Giá lẻ đồng để tiền giảm theo phần trăm có phần thập phân ở nhiều dòng
+    rows = [(n, f"Món {n}", int(rng.integers(10, 50)) * 1000 + int(rng.integers(1, 999)),
+             kitchen.STATIONS[n % 4]) for n in range(1, 41)]
+    rows[0] = (1, "Pepsi", 12345, "nuoc")
+    catalog = promotions.Catalog(rows)
+    engine = promotions.PromotionEngine(catalog, promotions.FOOD_PROMOTIONS + (
+        promotions.Promotion("nuong_7", "Nướng -7%", percent=7, categories=("nuong",)),
+        promotions.Promotion("bep_3", "Bếp -3%", percent=3, categories=("bep",)),
+    ))
+    carts = 300
+    quantities = np.zeros((carts, len(catalog)))
+    picks = rng.integers(0, len(catalog), size=(carts, 6))
+    np.add.at(quantities, (np.arange(carts)[:, None], picks), 1)
+    hours = rng.integers(0, 24, size=carts)
+
+    subtotals, discounts = engine.price_batch(quantities, hours)
+    for n in range(carts):
+        items = [(int(catalog.ids[i]), int(quantities[n, i])) for i in np.flatnonzero(quantities[n])]
+        result = engine.price(items, int(hours[n]))
+        assert result.subtotal == subtotals[n]
+        assert result.discount == discounts[n]
+        assert result.discount == sum(line[3] for line in result.lines)
+
+
+def test_cosmetics_sales_uses_local_hour(tmp_path, monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Ho_Chi_Minh")  # UTC+7, không đổi giờ mùa hè
+    time.tzset()
+    try:
+        path = str(tmp_path / "cosmetics.db")
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute("CREATE TABLE sales (id INTEGER PRIMARY KEY, sale_date DATETIME)")
+            conn.execute("CREATE TABLE sale_items (sale_id INTEGER, product_id INTEGER, quantity INTEGER)")
+            conn.execute("INSERT INTO sales VALUES (1, '2024-05-01 08:30:00')")  # 15h30 giờ Việt Nam
+            conn.execute("INSERT INTO sale_items VALUES (1, 1, 2)")
+        conn.close()
+        catalog = promotions.Catalog([(1, "Son", 100000, "son")])
+        quantities, hours = promotions.cosmetics_sales(catalog, path)
+        assert quantities.tolist() == [[2.0]]
+        assert hours.tolist() == [15]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
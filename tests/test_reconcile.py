@@ -0,0 +1,48 @@
+# test_reconcile.py
+import queue
+
+import database
+import payment_qr
+import reconcile
+
+
+def test_locked_database_keeps_payment_pending_and_retries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(reconcile, "RETRY_SECONDS", 0)
+    database.create_tables()
+    database.add_to_cart(1, 1)
+    order_id = database.place_order(1, 1, "chuyen_khoan")
+    total = database.get_order(order_id)[0][4]
+
+    real = database.mark_orders_paid
+    calls = []
+
+    def flaky(payments):
+        calls.append(payments)
+        return None if len(calls) == 1 else real(payments)  # lần đầu: database is locked
+    monkeypatch.setattr(database, "mark_orders_paid", flaky)
+
+    reconciler = reconcile.Reconciler()
+    paid = queue.Queue()
+
+    def broken(order_id):
+        raise RuntimeError("màn hình đã đóng")
+    reconciler.subscribe(broken)
+    reconciler.subscribe(paid.put)
+    reference = payment_qr.order_reference(order_id)
+    reconciler.notify({"transaction_id": "T1", "amount": total, "description": f"CK {reference}"})
+
+    # Lần ghi lỗi không làm mất đơn; listener lỗi không chặn listener sau
+    assert paid.get(timeout=5) == order_id
+    assert len(calls) == 2
+    assert reconciler.matched == 1
+    assert (reference, total) not in reconciler._pending
+
+    # Luồng đối soát vẫn sống sau khi listener ném lỗi
+    database.add_to_cart(1, 2)
+    second = database.place_order(1, 2, "chuyen_khoan")
+    second_total = database.get_order(second)[0][4]
+    reconciler.expect(second, second_total)
+    reconciler.notify({"transaction_id": "T2", "amount": second_total,
+                       "description": payment_qr.order_reference(second)})
+    assert paid.get(timeout=5) == second
@@ -0,0 +1,47 @@
+# test_scanner.py
+import sqlite3
+
+import main
+from scanner import ScanSession
+
+
+def _manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    main.create_tables()
+    main.add_initial_data()
+    return main.DataManager()
+
+
+def test_rescan_after_price_change_reprices_the_line(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    session = ScanSession(manager)
+    session.scan("SKU001")
+    manager.update_product(1, "Kem chống nắng A", "Brand X", "Chăm sóc da", 260000, "SKU001")
+    session.scan("SKU001")
+    assert session.lines() == [(1, "Kem chống nắng A", 260000, 2, 520000)]
+    assert session.total == 520000
+    session.remove(1)
+    assert session.total == 260000
+    session.remove(1)
+    assert session.total == 0 and not session.items
+
+
+def test_checkout_rejects_and_reprices_when_database_price_differs(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    session = ScanSession(manager)
+    session.scan("SKU001")
+    session.scan("SKU010", 2)
+    # Giá đổi thẳng trong database (ví dụ đồng bộ từ quầy khác), danh mục chưa biết
+    conn = sqlite3.connect(main.DATABASE_NAME)
+    with conn:
+        conn.execute("UPDATE products SET price = 55000 WHERE sku = 'SKU010'")
+    conn.close()
+
+    assert session.commit() is None
+    assert session.price_changes == [(10, 50000, 55000)]
+    assert session.total == 250000 + 2 * 55000
+    assert manager.get_all_products()[0][6] == 100  # chưa trừ kho
+
+    sale_id = session.commit()
+    assert sale_id is not None
+    assert manager.get_sale_items(sale_id) == [(1, 1, 250000, 250000), (10, 2, 55000, 110000)]
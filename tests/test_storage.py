@@ -0,0 +1,66 @@
+# test_storage.py
+import sqlite3
+
+import pytest
+
+import main
+import storage
+
+
+@pytest.fixture(params=["sqlite", "fake"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        path = str(tmp_path / "store.db")
+        conn = sqlite3.connect(path)
+        storage.create_schema(conn)
+        conn.close()
+        backend = storage.SQLiteBackend(path)
+    else:
+        backend = storage.FakeBackend()
+    yield storage.Store(backend)
+    backend.close()
+
+
+def test_sales_flow(store):
+    backend = store.backend
+    backend.executemany("INSERT INTO products (name, price, sku) VALUES (?, ?, ?)",
+                        [("Kem chống nắng A", 250000, "SKU001"), ("Mặt nạ J", 50000, "SKU010")])
+    backend.execute("INSERT INTO sales (customer_id, total_amount) VALUES (NULL, 0)")
+    sale_id = backend.query("SELECT MAX(id) FROM sales")[0][0]
+
+    store.add_sale_items(sale_id, [(1, 2, 250000), (2, 3, 50000)])
+    with backend.transaction() as cursor:
+        store.add_sale_items(sale_id, [(2, 1, 50000)], cursor)
+
+    assert store.get_sale_items(sale_id) == [(1, 2, 250000, 500000), (2, 3, 50000, 150000), (2, 1, 50000, 50000)]
+    assert store.get_sale_items(sale_id + 1) == []
+
+
+def test_cart_flow(store):
+    menu = store.get_mon_an(1, 100)
+    assert [row[0] for row in menu] == sorted(row[0] for row in menu)
+    mon_an_id, ten_mon, gia = menu[0][:3]
+    store.add_to_cart(7, mon_an_id)
+    store.add_to_cart(7, mon_an_id, 2)
+    assert store.get_cart_items(7) == [(mon_an_id, ten_mon, gia, 3, gia * 3)]
+    assert ten_mon in store.search_food_names(ten_mon[:3])
+
+
+def test_checkout_writes_sale_items_through_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    main.create_tables()
+    main.add_initial_data()
+    manager = main.DataManager(storage.Store(storage.SQLiteBackend(str(tmp_path / main.DATABASE_NAME))))
+    sale_id = manager.checkout([(1, 2), (10, 1)])
+    assert manager.get_sale_items(sale_id) == [(1, 2, 250000, 500000), (10, 1, 50000, 50000)]
+
+
+def test_sql_server_names_must_be_declared():
+    dialect = storage.SQLServerDialect()
+    assert dialect.name("mon_an") == "MonAn"
+    with pytest.raises(storage.StorageError):
+        dialect.name("gia")
+    dialect = storage.SQLServerDialect(storage.odbc_names("id=MaMonAn, gia=DonGia"))
+    assert (dialect.name("id"), dialect.name("gia"), dialect.name("ten_mon")) == ("MaMonAn", "DonGia", "TenMonAn")
+    assert dialect.page("SELECT * FROM MonAn", "MaMonAn", 8, 16) == (
+        "SELECT * FROM MonAn ORDER BY MaMonAn OFFSET ? ROWS FETCH NEXT ? ROWS ONLY", (16, 8))
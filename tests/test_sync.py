@@ -0,0 +1,77 @@
+# test_sync.py
+import sqlite3
+import time
+
+import database
+import menu_snapshot
+import sync
+
+
+def _terminal(tmp_path, monkeypatch, name, number):
+    directory = tmp_path / name
+    directory.mkdir()
+    monkeypatch.chdir(directory)
+    database.create_tables()
+    terminal = sync.foodie_terminal(name, number, str(directory / "foodie.db"))
+    terminal.install()
+    return terminal
+
+
+def _query(terminal, sql, params=()):
+    conn = sqlite3.connect(terminal.path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def test_two_terminals_exchange_changes(tmp_path, monkeypatch):
+    # Quầy số 3: id bắt đầu từ 3 * ID_BLOCK, vượt int32
+    a = _terminal(tmp_path, monkeypatch, "kiosk1", 1)
+    b = _terminal(tmp_path, monkeypatch, "kiosk3", 3)
+    transport = sync.LocalTransport(sync.CentralStore(str(tmp_path / "central.db")))
+
+    conn = sqlite3.connect(a.path)
+    with conn:
+        for i in range(20):
+            cur = conn.execute("INSERT INTO orders (user_id, table_no, payment_method, total) "
+                               "VALUES (1, ?, 'tien_mat', 40000)", (i % 5 + 1,))
+            conn.execute("INSERT INTO order_items (order_id, mon_an_id, so_luong, gia) VALUES (?, 1, 1, 40000)",
+                         (cur.lastrowid,))
+        conn.execute("UPDATE mon_an SET gia = 45000 WHERE id = 1")
+    conn.close()
+    time.sleep(0.01)
+    conn = sqlite3.connect(b.path)
+    with conn:
+        conn.execute("UPDATE mon_an SET gia = 50000 WHERE id = 1")  # ghi sau nên thắng
+        conn.execute("INSERT INTO orders (user_id, table_no, payment_method, total) "
+                     "VALUES (2, 3, 'chuyen_khoan', 50000)")
+        conn.execute("INSERT INTO mon_an (ten_mon, gia, hinh_anh) VALUES ('Gà quay kiosk3', 65000, ':/pic/ga.jpg')")
+    conn.close()
+
+    a.sync(transport)
+    b.sync(transport)
+    a.sync(transport)
+
+    for terminal in (a, b):
+        assert _query(terminal, "SELECT COUNT(*) FROM orders") == [(21,)]
+        assert _query(terminal, "SELECT gia FROM mon_an WHERE id = 1") == [(50000,)]
+    assert _query(a, "SELECT id FROM orders ORDER BY id") == _query(b, "SELECT id FROM orders ORDER BY id")
+
+    # Khoảng id của hai quầy không chồng lên nhau
+    ids = [row[0] for row in _query(a, "SELECT id FROM orders")]
+    from_a = [i for i in ids if sync.ID_BLOCK <= i < 2 * sync.ID_BLOCK]
+    from_b = [i for i in ids if 3 * sync.ID_BLOCK <= i < 4 * sync.ID_BLOCK]
+    assert (len(from_a), len(from_b)) == (20, 1)
+    dish_id = _query(a, "SELECT id FROM mon_an WHERE ten_mon = 'Gà quay kiosk3'")[0][0]
+    assert dish_id > 2 ** 31
+
+    # Món có id của quầy 3 đọc được qua ảnh chụp thực đơn của quầy 1
+    monkeypatch.chdir(tmp_path / "kiosk1")
+    snapshot = menu_snapshot.load()
+    try:
+        assert snapshot.find(dish_id).as_tuple() == (dish_id, "Gà quay kiosk3", 65000, ":/pic/ga.jpg")
+        assert snapshot.find(1).gia == 50000
+    finally:
+        snapshot.close()
+    transport.central.close()
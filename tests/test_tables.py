@@ -0,0 +1,35 @@
+# test_tables.py
+import queue
+import threading
+
+import cart_service
+import tables
+from qt_compat import QtCore
+
+
+def test_table_is_released_when_kitchen_completes_its_order(kitchen_services):
+    order_service, service = kitchen_services
+    table_map = tables.TableMap()
+    table_map.attach(order_service)
+    changes = queue.Queue()
+    # Sự kiện đến từ luồng ghi đơn và luồng bếp; test không có vòng lặp Qt nên nhận trực tiếp
+    table_map.table_changed.connect(lambda table_no, occupied: changes.put((table_no, occupied)),
+                                    QtCore.Qt.ConnectionType.DirectConnection)
+
+    cart_service.get_cart(1).add(16)  # Gà rán truyền thống -> trạm chiên
+    order = order_service.place_order(1, 5, "tien_mat", timeout=5)
+    assert changes.get(timeout=5) == (5, True)
+    assert table_map.info(5)[:2] == (True, order["id"])
+    assert 5 not in table_map.free_tables()
+
+    batch = None
+    for _ in range(100):
+        batch = service.take_batch_threadsafe("chien").result(5)
+        if batch is not None:
+            break
+        threading.Event().wait(0.01)
+    assert batch is not None
+    assert table_map.is_occupied(5)
+    service.complete_threadsafe(batch)
+    assert changes.get(timeout=5) == (5, False)
+    assert 5 in table_map.free_tables()
@@ -0,0 +1,72 @@
+# theme.py
+# Giao diện dùng chung cho các màn hình bán đồ ăn:
+#   - font(): trả về QFont dùng chung thay vì tạo QFont() mới cho mỗi widget
+#   - apply(): đặt một stylesheet cấp ứng dụng duy nhất (theme.qss do build_ui.py sinh ra),
+#     widget chỉ mang thuộc tính themeRole nên không phải tính lại style cho từng widget
+import os
+import sys
+import time
+
+from qt_compat import QtGui, QtWidgets
+
+THEME_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "theme.qss")
+
+# (thuộc tính font đã sắp xếp) -> QFont
+_fonts = {}
+_applied = False
+
+
+def font(**props):
+    """ QFont dùng chung, ví dụ font(pointSize=15, bold=True) """
+    key = tuple(sorted(props.items()))
+    cached = _fonts.get(key)
+    if cached is None:
+        cached = QtGui.QFont()
+        for name, value in key:
+            getattr(cached, "set" + name[0].upper() + name[1:])(value)
+        _fonts[key] = cached
+    return cached
+
+
+def stylesheet():
+    """ Nội dung stylesheet cấp ứng dụng """
+    try:
+        with open(THEME_FILE, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        print(f"Không tìm thấy {THEME_FILE}. Hãy chạy: python build_ui.py")
+        return ""
+
+
+def apply(app):
+    """ Đặt stylesheet của theme cho cả ứng dụng (chỉ một lần) """
+    global _applied
+    if not _applied:
+        app.setStyleSheet(app.styleSheet() + stylesheet())
+        _applied = True
+
+
+def benchmark(rounds=20):
+    """ Đo thời gian dựng (setupUi + polish) từng màn hình khi không có màn hình thật """
+    import importlib
+    import app_shell
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    apply(app)
+    for name, module_name in app_shell.SCREENS.items():
+        module = importlib.import_module(module_name)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            widget = QtWidgets.QWidget()
+            module.Ui_Dialog().setupUi(widget)
+            widget.ensurePolished()
+            for child in widget.findChildren(QtWidgets.QWidget):
+                child.ensurePolished()
+            widget.deleteLater()
+        app.processEvents()
+        print(f"{name}: {(time.perf_counter() - start) * 1000 / rounds:.2f} ms")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    benchmark()
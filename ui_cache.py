@@ -0,0 +1,101 @@
+# ui_cache.py
+# Biên dịch file .ui thành module Python một lần rồi dùng lại, thay cho loadUi
+# (parse XML và dựng widget bằng reflection mỗi lần khởi tạo).
+# Module biên dịch được lưu trong __uicache__/ và tự biên dịch lại khi nội dung
+# file .ui (hoặc Qt binding) thay đổi.
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+import time
+
+from qt_compat import QT_API, QtWidgets, loadUi
+
+if QT_API == "pyqt6":
+    from PyQt6.uic import compileUi
+else:
+    from PyQt5.uic import compileUi
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__uicache__")
+
+# (đường dẫn .ui, hash) -> class Ui_* đã import
+_classes = {}
+
+
+def _ui_hash(ui_path):
+    with open(ui_path, "rb") as f:
+        content = f.read()
+    return hashlib.sha1(content + QT_API.encode()).hexdigest()[:16]
+
+
+def load_ui_class(ui_path):
+    """ Trả về class Ui_* của file .ui, biên dịch và ghi cache nếu cần """
+    digest = _ui_hash(ui_path)  # FileNotFoundError nếu không có file .ui
+    key = (os.path.abspath(ui_path), digest)
+    if key in _classes:
+        return _classes[key]
+
+    stem = os.path.splitext(os.path.basename(ui_path))[0]
+    module_name = f"{stem}_{digest}"
+    module_path = os.path.join(CACHE_DIR, module_name + ".py")
+    if not os.path.exists(module_path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Xóa bản biên dịch cũ của cùng file .ui
+        for old in os.listdir(CACHE_DIR):
+            if old.startswith(stem + "_") and old.endswith(".py") and len(old) == len(module_name) + 3:
+                os.remove(os.path.join(CACHE_DIR, old))
+        source = io.StringIO()
+        with open(ui_path, encoding="utf-8") as f:
+            compileUi(f, source)
+        # Ghi ra file tạm rồi đổi tên để tiến trình khác không đọc phải file dở dang
+        tmp_path = module_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(source.getvalue())
+        os.replace(tmp_path, module_path)
+
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    ui_class = next(getattr(module, name) for name in dir(module) if name.startswith("Ui_"))
+    _classes[key] = ui_class
+    return ui_class
+
+
+def setup_ui(ui_path, widget):
+    """ Dựng giao diện lên widget như loadUi: các widget con trở thành thuộc tính của widget """
+    ui = load_ui_class(ui_path)()
+    ui.setupUi(widget)
+    for name, value in vars(ui).items():
+        setattr(widget, name, value)
+    return ui
+
+
+def benchmark(ui_path, rounds=50):
+    """ So sánh thời gian dựng dialog: loadUi, class đã biên dịch, và dùng lại một instance """
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        dialog = QtWidgets.QDialog()
+        loadUi(ui_path, dialog)
+        dialog.deleteLater()
+    load_ui_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    load_ui_class(ui_path)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        dialog = QtWidgets.QDialog()
+        setup_ui(ui_path, dialog)
+        dialog.deleteLater()
+    compiled_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    print(f"{ui_path}: loadUi {load_ui_ms:.2f} ms, compiled class {compiled_ms:.2f} ms per dialog")
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    # Chạy không cần màn hình: QT_QPA_PLATFORM=offscreen python ui_cache.py ui/product_dialog.ui
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    for path in sys.argv[1:] or ["ui/product_dialog.ui", "ui/main_window.ui"]:
+        benchmark(path)